@@ -0,0 +1,95 @@
+"""
+Throughput benchmark of the running web server.
+
+Compare ASGI and WSGI deployments by starting the server in each mode
+and running the benchmark against the same pages:
+
+    gunicorn -c gunicorn.conf.py
+    python benchmarks/throughput.py http://127.0.0.1:8000/ --label asgi
+
+    export GUNICORN_APP=config.wsgi:application GUNICORN_WORKER_CLASS=sync
+    gunicorn -c gunicorn.conf.py
+    python benchmarks/throughput.py http://127.0.0.1:8000/ --label wsgi
+
+Keep the number of workers the same for both runs and warm the caches
+with a few requests (--warm-up) before measuring.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_requests(
+    urls: list[str], total: int, concurrency: int
+) -> tuple[list[float], int, float]:
+    """
+    Request urls in round robin with the fixed number of concurrent clients.
+
+    :param urls: list Requested urls.
+    :param total: int Total number of requests.
+    :param concurrency: int Number of concurrent requests.
+
+    Returns latencies of the successful requests, number of errors and elapsed time.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal errors
+        for index in counter:
+            started_at = time.perf_counter()
+            try:
+                response = await client.get(urls[index % len(urls)])
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response.status_code >= 400:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started_at)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started_at
+    return latencies, errors, elapsed
+
+
+def report(label: str, latencies: list[float], errors: int, elapsed: float) -> str:
+    """Format results of the run."""
+    if not latencies:
+        return f"{label}: all {errors} requests failed"
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return (
+        f"{label}: {len(latencies) / elapsed:.1f} req/s, "
+        f"p50 {quantiles[49] * 1000:.0f} ms, p95 {quantiles[94] * 1000:.0f} ms, "
+        f"p99 {quantiles[98] * 1000:.0f} ms, errors {errors}"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("urls", nargs="+", help="Requested urls.")
+    parser.add_argument("--requests", type=int, default=1000, help="Total number of requests.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent requests.")
+    parser.add_argument("--warm-up", type=int, default=20, help="Requests before measuring.")
+    parser.add_argument("--label", default="server", help="Label of the results line.")
+    args = parser.parse_args()
+
+    if args.warm_up:
+        asyncio.run(run_requests(args.urls, args.warm_up, min(args.warm_up, args.concurrency)))
+    print(
+        report(
+            args.label, *asyncio.run(run_requests(args.urls, args.requests, args.concurrency))
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Represents the customer cart stored in the session."""
+import hashlib
+from typing import Any, Iterable, Iterator, Optional
+
+CART_FORMAT_VERSION = 2
+
+
+class Cart:
+    """
+    Customer cart keyed by product id and bouquet size.
+
+    Cart is stored in the session as
+    {"v": 2, "lines": {"<product_id>:<size>": amount}, "quantity": int},
+    where size is empty for products without sizes. Lookups by product and size
+    are O(1), total quantity and per-product subtotals are maintained on every change.
+    Carts of the previous format ({"products": [{"id", "size", "amount"}], "quantity"})
+    are converted when loaded.
+    """
+
+    def __init__(self, lines: Optional[dict[str, int]] = None) -> None:
+        """
+        Initialize cart.
+
+        :param lines: dict line key/amount as key/value.
+        """
+        self.lines: dict[str, int] = {}
+        self.quantity: int = 0
+        self.subtotals: dict[str, int] = {}
+        self._lines_counts: dict[str, int] = {}
+        for key, amount in (lines or {}).items():
+            product_id, size = self.parse_line_key(key)
+            self.set_amount(product_id, amount, size)
+
+    @staticmethod
+    def get_line_key(product_id: str, size: Optional[int] = None) -> str:
+        """Get key of the cart line."""
+        return f"{product_id}:{size or ''}"
+
+    @staticmethod
+    def parse_line_key(key: str) -> tuple[str, Optional[int]]:
+        """Get product id and size from the cart line key."""
+        product_id, _, size = key.rpartition(":")
+        return product_id, int(size) if size else None
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict[str, Any]]) -> "Cart":
+        """
+        Create cart from its session data of any format version.
+
+        :param data: dict Cart session data, may be empty.
+        """
+        if not data:
+            return cls()
+        if data.get("v") == CART_FORMAT_VERSION:
+            return cls(data["lines"])
+        cart = cls()
+        for product in data.get("products", []):
+            product_id, size = product["id"], product.get("size")
+            amount = (cart.get_amount(product_id, size) or 0) + product["amount"]
+            cart.set_amount(product_id, amount, size)
+        return cart
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get cart session data."""
+        return {"v": CART_FORMAT_VERSION, "lines": dict(self.lines), "quantity": self.quantity}
+
+    def __contains__(self, product_id: str) -> bool:
+        """Check that cart has the product of any size."""
+        return product_id in self.subtotals
+
+    def __len__(self) -> int:
+        """Get number of the cart lines."""
+        return len(self.lines)
+
+    def __iter__(self) -> Iterator[tuple[str, Optional[int], int]]:
+        """Iterate over product id, size and amount of the cart lines."""
+        for key, amount in self.lines.items():
+            yield *self.parse_line_key(key), amount
+
+    def get_amount(self, product_id: str, size: Optional[int] = None) -> Optional[int]:
+        """Get amount of the product of the given size, None if it isn't in the cart."""
+        return self.lines.get(self.get_line_key(product_id, size))
+
+    def set_amount(self, product_id: str, amount: int, size: Optional[int] = None) -> None:
+        """Set amount of the product of the given size, adding it if needed."""
+        key = self.get_line_key(product_id, size)
+        if key not in self.lines:
+            self._lines_counts[product_id] = self._lines_counts.get(product_id, 0) + 1
+        difference = amount - self.lines.get(key, 0)
+        self.lines[key] = amount
+        self.quantity += difference
+        self.subtotals[product_id] = self.subtotals.get(product_id, 0) + difference
+
+    def remove(self, product_id: str, size: Optional[int] = None) -> Optional[int]:
+        """Remove the product of the given size, return its amount if it was in the cart."""
+        amount = self.lines.pop(self.get_line_key(product_id, size), None)
+        if amount is not None:
+            self.quantity -= amount
+            self.subtotals[product_id] -= amount
+            self._lines_counts[product_id] -= 1
+            if not self._lines_counts[product_id]:
+                del self.subtotals[product_id], self._lines_counts[product_id]
+        return amount
+
+    def remove_products(self, products_ids: Iterable[str]) -> None:
+        """Remove products of all sizes."""
+        products_ids = set(products_ids) & self.subtotals.keys()
+        if not products_ids:
+            return
+        self.lines = {
+            key: amount
+            for key, amount in self.lines.items()
+            if self.parse_line_key(key)[0] not in products_ids
+        }
+        for product_id in products_ids:
+            self.quantity -= self.subtotals.pop(product_id)
+            del self._lines_counts[product_id]
+
+    @property
+    def products_ids(self) -> set[str]:
+        """Get ids of the products in the cart."""
+        return set(self.subtotals)
+
+    @property
+    def products(self) -> list[dict[str, Any]]:
+        """Get cart lines as list of dicts with 'id', 'size' and 'amount'."""
+        return [
+            {"id": product_id, "size": size, "amount": amount}
+            for product_id, size, amount in self
+        ]
+
+    @property
+    def digest(self) -> str:
+        """Get digest of the cart content, the same for the carts with the same lines."""
+        content = ",".join(f"{key}={amount}" for key, amount in sorted(self.lines.items()))
+        return hashlib.sha1(content.encode()).hexdigest()
@@ -0,0 +1,211 @@
+"""Represents pricing of the cart, shared by cart, checkout and order creation."""
+import asyncio
+import time
+from collections import OrderedDict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, NamedTuple, Optional
+
+from products.app_services.data_getters import crm_data as products_crm_data
+from services.data_getters import crm_data
+from services.utils import get_data_version
+
+from .cart import Cart
+
+CENT = Decimal("0.01")
+
+
+def to_money(value: Any) -> Decimal:
+    """Get decimal money amount rounded to cents from the catalog price."""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class PricedLine(NamedTuple):
+    """Priced cart line."""
+
+    product_id: str
+    size: Optional[int]
+    amount: int
+    unit_price: Decimal
+    price: Decimal
+    discount: Decimal
+    total: Decimal
+
+
+class CartPricing(NamedTuple):
+    """
+    Cart prices and totals.
+
+    'discount' is the sum saved because of the products discounts, 'missing' are
+    ids of the products absent in the catalog, 'deprecated' are (id, size) of the
+    bouquets with the sizes, that aren't sold anymore. Such lines aren't priced.
+    """
+
+    lines: tuple[PricedLine, ...]
+    subtotal: Decimal
+    discount: Decimal
+    grand_total: Decimal
+    missing: tuple[str, ...]
+    deprecated: tuple[tuple[str, int], ...]
+
+
+class PricingEngine:
+    """
+    Prices carts against region products catalog.
+
+    Results are memoized per cart content digest, region catalog version and
+    currency, for 'ttl' seconds, as bouquet sizes prices are cached that long.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 3600) -> None:
+        """
+        Initialize engine with empty memo.
+
+        :param max_entries: int Number of remembered results.
+        :param ttl: int Seconds the result is valid for.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memo: OrderedDict[tuple, tuple[float, CartPricing]] = OrderedDict()
+
+    @staticmethod
+    def compute(
+        cart: Cart,
+        region_products: list[dict[str, Any]],
+        bouquets_data: dict[str, dict[str, Any]],
+    ) -> CartPricing:
+        """
+        Price cart lines and sum the totals in one pass.
+
+        :param cart: Cart Priced cart.
+        :param region_products: list Region products with prices in the currency.
+        :param bouquets_data: dict Product id/bouquet data with sizes prices in the currency
+            as key/value, for bouquets ordered with size.
+        """
+        products = {
+            product["id"]: product for product in region_products if product["id"] in cart
+        }
+        lines, missing, deprecated = [], [], []
+        subtotal = discount = Decimal("0.00")
+        for product_id, size, amount in cart:
+            if (product := products.get(product_id)) is None:
+                missing.append(product_id)
+                continue
+            price_record, price_key = product, "unit_price"
+            if size and product["category_slug"] == "bouquets":
+                price_record = next(
+                    (
+                        size_record
+                        for size_record in bouquets_data[product_id]["bouquet_sizes"]
+                        if size_record["value"] == size
+                    ),
+                    None,
+                )
+                if price_record is None:
+                    deprecated.append((product_id, size))
+                    continue
+                price_key = "price"
+            unit_price = to_money(price_record[price_key])
+            price = unit_price
+            if product.get("discount") and price_record.get("new_price") is not None:
+                price = to_money(price_record["new_price"])
+            line = PricedLine(
+                product_id,
+                size,
+                amount,
+                unit_price,
+                price,
+                (unit_price - price) * amount,
+                price * amount,
+            )
+            lines.append(line)
+            subtotal += unit_price * amount
+            discount += line.discount
+        return CartPricing(
+            tuple(lines),
+            subtotal,
+            discount,
+            subtotal - discount,
+            tuple(missing),
+            tuple(deprecated),
+        )
+
+    async def price_cart(
+        self,
+        cart: Cart,
+        region_slug: str,
+        currency: dict[str, Any],
+        region_products: Optional[list[dict[str, Any]]] = None,
+    ) -> CartPricing:
+        """
+        Price cart with the current region catalog.
+
+        :param cart: Cart Priced cart.
+        :param region_slug: str Region slug.
+        :param currency: dict Currency to price in.
+        :param region_products: list | None Region products in the currency, if they are
+            already got, they are got from the cache otherwise.
+        """
+        catalog_version = await crm_data.get_catalog_version(region_slug)
+        key = self.get_memo_key(cart, region_slug, catalog_version, currency)
+        if catalog_version and (pricing := self.get_memoized(key)):
+            return pricing
+        if region_products is None:
+            region_products = await crm_data.get_region_products(region_slug, currency=currency)
+            catalog_version = await crm_data.get_catalog_version(region_slug)
+            key = self.get_memo_key(cart, region_slug, catalog_version, currency)
+        sized_ids = {product_id for product_id, size, _ in cart if size}
+        bouquets = [
+            product
+            for product in region_products
+            if product["id"] in sized_ids and product["category_slug"] == "bouquets"
+        ]
+        bouquets_data = dict(
+            zip(
+                (product["id"] for product in bouquets),
+                await asyncio.gather(
+                    *(
+                        products_crm_data.get_product_bouquet_data(
+                            product["id"], currency=currency, discount=product["discount"]
+                        )
+                        for product in bouquets
+                    )
+                ),
+            )
+        )
+        pricing = self.compute(cart, region_products, bouquets_data)
+        if catalog_version:
+            self.memoize(key, pricing)
+        return pricing
+
+    @staticmethod
+    def get_memo_key(
+        cart: Cart, region_slug: str, catalog_version: Optional[str], currency: dict[str, Any]
+    ) -> tuple:
+        """
+        Get key of the memoized pricing.
+
+        Catalog version covers the base currency prices only, so the currency is a part
+        of the key with its exchange rate.
+        """
+        return (cart.digest, region_slug, catalog_version, get_data_version(currency))
+
+    def get_memoized(self, key: tuple) -> Optional[CartPricing]:
+        """Get memoized pricing, if it's still valid."""
+        if (entry := self._memo.get(key)) is None:
+            return None
+        created_at, pricing = entry
+        if time.monotonic() - created_at > self.ttl:
+            del self._memo[key]
+            return None
+        self._memo.move_to_end(key)
+        return pricing
+
+    def memoize(self, key: tuple, pricing: CartPricing) -> None:
+        """Remember pricing, forgetting the least recently used one if there are too many."""
+        self._memo[key] = (time.monotonic(), pricing)
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+
+
+pricing_engine = PricingEngine()
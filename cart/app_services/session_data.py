@@ -1,51 +1,86 @@
 """Represents processing of the session data for the cart."""
+import asyncio
 from typing import Any, Iterable
 
-from asgiref.sync import sync_to_async
 from django.contrib.sessions.backends.base import SessionBase
 from django.http import HttpRequest, JsonResponse
 
+from orders.models import OrderOutbox
 from products.app_services.data_getters import crm_data as products_crm_data
 from services.data_getters import crm_data
+from services.db import db_pool
 from services.utils import utilities
 
+from .cart import Cart
+from .pricing import pricing_engine
+
 
 class SessionData:
     """Represents processing of the session data for the cart."""
 
     @staticmethod
-    async def get_or_create_cart(session: SessionBase) -> dict[str, list | int]:
+    async def get_or_create_cart(session: SessionBase) -> Cart:
         """
         Get or create the cart from the request's session data.
 
+        Carts stored in the previous format are converted.
+
         Args:
             session (SessionBase): The session to work with.
 
         Returns:
-            dict: The cart data containing products and their quantity.
+            Cart: The cart with products and their quantity.
         """
-        if cart := (await sync_to_async(session.get)("cart", {})):
-            return cart
-        return {"products": [], "quantity": 0}
+        return Cart.from_dict(session.get("cart"))
 
-    @classmethod
-    def get_ordered_product(
-        cls, cart: dict[str, Any], product_id: str, bouquet_size: int | None
-    ) -> dict[str, Any] | None:
+    @staticmethod
+    def save_cart(session: SessionBase, cart: Cart) -> None:
+        """
+        Put the cart into the session data.
+
+        Args:
+            session (SessionBase): The session to work with.
+            cart (Cart): The cart to save.
+        """
+        session["cart"] = cart.to_dict()
+
+    @staticmethod
+    async def get_bouquet_sizes(
+        product: dict[str, Any], currency: dict[str, str | float]
+    ) -> set[int]:
         """
-        Refresh customer cart.
+        Get available sizes of the bouquet.
 
-        Product, if doesn't exist in cart, will be returned.
-        :param session: session object.
+        :param product: dict Region product.
+        :param currency: dict Currency the bouquet data is cached for.
+        """
+        bouquet_data = await products_crm_data.get_product_bouquet_data(
+            product["id"], currency=currency, discount=product["discount"]
+        )
+        return {size_record["value"] for size_record in bouquet_data["bouquet_sizes"]}
+
+    @staticmethod
+    async def get_region_product(
+        request: HttpRequest, product_id: str, region: dict[str, Any]
+    ) -> tuple[dict[str, Any] | None, dict[str, str | float]]:
+        """
+        Get region product by its id and region default currency.
+
+        :param request: HttpRequest.
         :param product_id: str, product id in Zoho CRM module.
+        :param region: dict Region data.
         """
-        for product in cart["products"]:
-            if bouquet_size:
-                if product["id"] == product_id and product["size"] == bouquet_size:
-                    return product
-            else:
-                if product["id"] == product_id and not product.get("size"):
-                    return product
+        default_currency = utilities.get_selected_currency(
+            await crm_data.get_currency_list(request), region["default_currency"]
+        )
+        region_products = await crm_data.get_region_products(
+            region["slug"],
+            currency=default_currency,
+        )
+        product = next(
+            (product for product in region_products if product["id"] == product_id), None
+        )
+        return product, default_currency
 
     @classmethod
     async def create_ordered_product(
@@ -56,7 +91,7 @@ class SessionData:
         amount: int,
         region: dict[str, Any],
         bouquet_size: int | None = None,
-    ) -> bool:
+    ) -> JsonResponse:
         """
         Create an ordered product in the session's cart.
 
@@ -66,45 +101,26 @@ class SessionData:
             amount (int): The quantity of the product to add.
 
         Returns:
-            bool: True if the product was successfully added, False if it already exists.
+            JsonResponse: A JSON response indicating success or failure.
 
         This method adds a product to the cart in the provided session. If the product
         already exists in the cart, it won't be added again.
         """
         cart = await cls.get_or_create_cart(session)
-        default_currency = utilities.get_selected_currency(
-            await crm_data.get_currency_list(request), region["default_currency"]
-        )
-        region_products = await crm_data.get_region_products(
-            region["slug"],
-            currency=default_currency,
-        )
-        if cls.get_ordered_product(cart, product_id, bouquet_size):
+        if cart.get_amount(product_id, bouquet_size) is not None:
             return JsonResponse({"msg": "Already created"}, status=409)
-        for product in region_products:
-            if product["id"] == product_id and product["category_slug"] == "bouquets":
-                if bouquet_size is not None and bouquet_size not in (
-                    size_record["value"]
-                    for size_record in (
-                        await products_crm_data.get_product_bouquet_data(
-                            product_id,
-                            currency=default_currency,
-                            discount=product["discount"],
-                        )
-                    )["bouquet_sizes"]
-                ):
-                    return JsonResponse(
-                        {"msg": 'Not existing "size" parameter was provided'}, status=404
-                    )
-                cart["products"].append(
-                    {"id": product_id, "size": bouquet_size, "amount": amount}
+        product, default_currency = await cls.get_region_product(request, product_id, region)
+        if product and product["category_slug"] == "bouquets":
+            if bouquet_size is not None and bouquet_size not in await cls.get_bouquet_sizes(
+                product, default_currency
+            ):
+                return JsonResponse(
+                    {"msg": 'Not existing "size" parameter was provided'}, status=404
                 )
-                break
         else:
-            cart["products"].append({"id": product_id, "amount": amount})
-        cart["quantity"] += amount
-        session["cart"] = cart
-        await sync_to_async(session.save)()
+            bouquet_size = None
+        cart.set_amount(product_id, amount, bouquet_size)
+        cls.save_cart(session, cart)
         return JsonResponse({"msg": "Succesfully created ordered product"}, status=201)
 
     @classmethod
@@ -132,40 +148,27 @@ class SessionData:
         If the product doesn't exist, it won't be updated.
         """
         cart = await cls.get_or_create_cart(session)
-        if ordered_product := cls.get_ordered_product(cart, product_id, bouquet_size):
-            default_currency = utilities.get_selected_currency(
-                await crm_data.get_currency_list(request), region["default_currency"]
+        if cart.get_amount(product_id, bouquet_size) is None:
+            return JsonResponse(
+                {"msg": "Ordered product doesn't present in the cart."}, status=404
             )
-            region_products = await crm_data.get_region_products(
-                region["slug"],
-                currency=default_currency,
+        if bouquet_size is not None:
+            product, default_currency = await cls.get_region_product(
+                request, product_id, region
             )
-
-            if bouquet_size is not None:
-                for product in region_products:
-                    if product["id"] == product_id and product["category_slug"] == "bouquets":
-                        if bouquet_size not in (
-                            size_record["value"]
-                            for size_record in (
-                                await products_crm_data.get_product_bouquet_data(
-                                    product_id,
-                                    currency=default_currency,
-                                    discount=product["discount"],
-                                )
-                            )["bouquet_sizes"]
-                        ):
-                            # TODO: removing of bouquets with deprecated sizes from the cart
-                            return JsonResponse(
-                                {"msg": 'Not existing "size" parameter was provided'},
-                                status=404,
-                            )
-                        break
-            ordered_product["amount"] = amount
-            cart["quantity"] = sum(i["amount"] for i in cart["products"])
-            session["cart"] = cart
-            await sync_to_async(session.save)()
-            return JsonResponse({"msg": "Succesfully updated amount"}, status=204)
-        return JsonResponse({"msg": "Ordered product doesn't present in the cart."}, status=404)
+            if (
+                product
+                and product["category_slug"] == "bouquets"
+                and bouquet_size not in await cls.get_bouquet_sizes(product, default_currency)
+            ):
+                # TODO: removing of bouquets with deprecated sizes from the cart
+                return JsonResponse(
+                    {"msg": 'Not existing "size" parameter was provided'},
+                    status=404,
+                )
+        cart.set_amount(product_id, amount, bouquet_size)
+        cls.save_cart(session, cart)
+        return JsonResponse({"msg": "Succesfully updated amount"}, status=204)
 
     @classmethod
     async def remove_ordered_product(
@@ -179,43 +182,140 @@ class SessionData:
             product_id (str): The ID of the product to remove.
 
         Returns:
-            bool: True if the product was successfully removed, False if it doesn't exist.
+            JsonResponse: A JSON response indicating success or failure.
 
         This method removes a product from the cart in the provided session. If the product
         doesn't exist in the cart, it won't be removed.
         """
         cart = await cls.get_or_create_cart(session)
-        if ordered_product := cls.get_ordered_product(cart, product_id, bouquet_size):
-            response = JsonResponse({"msg": "Ordered product deleted"}, status=204)
-            cart["quantity"] -= ordered_product["amount"]
-            cart["products"].remove(ordered_product)
-            session["cart"] = cart
-            await sync_to_async(session.save)()
-            return response
-        return JsonResponse({"msg": "Ordered product doesn't present in the cart."}, status=404)
+        if cart.remove(product_id, bouquet_size) is None:
+            return JsonResponse(
+                {"msg": "Ordered product doesn't present in the cart."}, status=404
+            )
+        cls.save_cart(session, cart)
+        return JsonResponse({"msg": "Ordered product deleted"}, status=204)
 
     @classmethod
     async def remove_ordered_products(
         cls, session: SessionBase, products_ids: Iterable[str]
+    ) -> None:
+        """
+        Remove products of all sizes from the session's cart.
+
+        Args:
+            session (SessionBase): The session to work with.
+            products_ids (Iterable[str]): The IDs of the products to remove.
+
+        Products, that aren't in the cart, are skipped.
+        """
+        cart = await cls.get_or_create_cart(session)
+        if products_ids := set(products_ids) & cart.products_ids:
+            cart.remove_products(products_ids)
+            cls.save_cart(session, cart)
+
+    @classmethod
+    async def apply_cart_operations(
+        cls,
+        request: HttpRequest,
+        session: SessionBase,
+        operations: list[dict[str, Any]],
+        region: dict[str, Any],
     ) -> JsonResponse:
         """
-        Remove an ordered product from the session's cart.
+        Apply several cart operations at once.
+
+        Operations are validated against the region catalog once and applied in order
+        to a copy of the cart, which is put into the session only if all of them succeed.
 
         Args:
             session (SessionBase): The session to work with.
-            product_id (str): The ID of the product to remove.
+            operations (list[dict]): Operations with 'op' ("add", "update" or "remove"),
+                'id', 'amount' (except removing) and optional 'bouquet_size'.
+            region (dict): The region of the cart.
 
         Returns:
-            bool: True if the product was successfully removed, False if it doesn't exist.
-
-        This method removes a product from the cart in the provided session. If the product
-        doesn't exist in the cart, it won't be removed.
+            JsonResponse: The new cart summary or the error with the failed operation index.
         """
         cart = await cls.get_or_create_cart(session)
-        cart["products"] = [p for p in cart["products"] if p["id"] not in products_ids]
-        cart["quantity"] = sum(i["amount"] for i in cart["products"])
-        session["cart"] = cart
-        await sync_to_async(session.save)()
+        default_currency = utilities.get_selected_currency(
+            await crm_data.get_currency_list(request), region["default_currency"]
+        )
+        region_products = await crm_data.get_region_products(
+            region["slug"], currency=default_currency
+        )
+        products_ids = {operation["id"] for operation in operations}
+        products = {
+            product["id"]: product
+            for product in region_products
+            if product["id"] in products_ids
+        }
+        bouquets = {
+            operation["id"]: products[operation["id"]]
+            for operation in operations
+            if operation["op"] != "remove"
+            and operation.get("bouquet_size") is not None
+            and products.get(operation["id"], {}).get("category_slug") == "bouquets"
+        }
+        bouquets_sizes = dict(
+            zip(
+                bouquets,
+                await asyncio.gather(
+                    *(
+                        cls.get_bouquet_sizes(product, default_currency)
+                        for product in bouquets.values()
+                    )
+                ),
+            )
+        )
+        for index, operation in enumerate(operations):
+            product_id, size = operation["id"], operation.get("bouquet_size")
+            if operation["op"] != "remove" and product_id not in products:
+                return JsonResponse(
+                    {"msg": "Product doesn't present in the region catalog.", "index": index},
+                    status=404,
+                )
+            if (
+                operation["op"] == "add"
+                and products.get(product_id, {}).get("category_slug") != "bouquets"
+            ):
+                size = None
+            amount = cart.get_amount(product_id, size)
+            if operation["op"] == "add" and amount is not None:
+                return JsonResponse({"msg": "Already created", "index": index}, status=409)
+            if operation["op"] != "add" and amount is None:
+                return JsonResponse(
+                    {"msg": "Ordered product doesn't present in the cart.", "index": index},
+                    status=404,
+                )
+            if (
+                operation["op"] != "remove"
+                and size is not None
+                and product_id in bouquets_sizes
+                and size not in bouquets_sizes[product_id]
+            ):
+                return JsonResponse(
+                    {"msg": 'Not existing "size" parameter was provided', "index": index},
+                    status=404,
+                )
+            if operation["op"] == "remove":
+                cart.remove(product_id, size)
+            else:
+                cart.set_amount(product_id, operation["amount"], size)
+        cls.save_cart(session, cart)
+        pricing = await pricing_engine.price_cart(
+            cart, region["slug"], default_currency, region_products
+        )
+        return JsonResponse(
+            {
+                "msg": "Cart is updated",
+                "cart": {
+                    "quantity": cart.quantity,
+                    "products": cart.products,
+                    "grand_total": str(pricing.grand_total),
+                    "currency_symbol": default_currency["symbol"],
+                },
+            }
+        )
 
     @staticmethod
     async def add_order(session: SessionBase, order_id: str):
@@ -232,19 +332,32 @@ class SessionData:
         This static method adds an order to the session. If the session already has
         orders, the new order ID is appended to the existing list of orders. If there
         are no existing orders, a new list containing the provided order ID is created.
-        The session is then saved asynchronously.
+        The session is saved once by the session middleware.
         """
         if session.get("orders"):
             session["orders"].append(order_id)
-            await sync_to_async(session.save)()
+            session.modified = True
         else:
             session["orders"] = [
                 order_id,
             ]
-            await sync_to_async(session.save)()
 
     @staticmethod
-    async def get_client_orders_id_list(session: SessionBase):
+    async def add_pending_order(session: SessionBase, order_number: str):
+        """
+        Add an order, that isn't created in the ZohoCRM yet, to the session.
+
+        Args:
+            session (SessionBase): The session to work with.
+            order_number (str): The number of the order in the outbox.
+
+        Pending orders are replaced with their ZohoCRM IDs, when the client's orders
+        are requested after the orders are created.
+        """
+        session["pending_orders"] = [*session.get("pending_orders", []), order_number]
+
+    @classmethod
+    async def get_client_orders_id_list(cls, session: SessionBase):
         """
         Retrieve the list of order IDs associated with the client's session.
 
@@ -254,11 +367,27 @@ class SessionData:
         Returns:
             List[str]: A list of order IDs. If no orders are present, an empty list is returned.
 
-        This static method retrieves the list of order IDs associated with the provided
-        client session. If the session has orders, the list of order IDs is returned.
-        If there are no orders, an empty list is returned.
+        Pending orders, that are created in the ZohoCRM since the last request,
+        are moved to the list of order IDs.
         """
-        return await sync_to_async(session.get)("orders", [])
+        if pending_orders := session.get("pending_orders"):
+            submitted_orders = dict(
+                await db_pool.fetch(
+                    OrderOutbox.objects.filter(
+                        order_number__in=pending_orders, status=OrderOutbox.SUBMITTED
+                    ).values_list("order_number", "zoho_id")
+                )
+            )
+            if submitted_orders:
+                for order_number in pending_orders:
+                    if order_number in submitted_orders:
+                        await cls.add_order(session, submitted_orders[order_number])
+                session["pending_orders"] = [
+                    order_number
+                    for order_number in pending_orders
+                    if order_number not in submitted_orders
+                ]
+        return session.get("orders", [])
 
 
 session_data = SessionData()
@@ -4,6 +4,8 @@ from typing import Any
 from products.app_services.data_getters import crm_data
 from products.exceptions import DeprecatedBouquetSizeFoundError
 
+from .cart import Cart
+
 
 class Formatters:
     @staticmethod
@@ -26,7 +28,7 @@ class Formatters:
         region_product: dict[str, Any],
         cart_product: dict[str, int | str],
         currency: dict[str, str | float],
-        cart: dict[str, Any],
+        cart: Cart,
     ) -> dict[str, Any]:
         if region_product["category_slug"] == "bouquets":
             region_product.update(
@@ -53,7 +55,7 @@ class Formatters:
     @classmethod
     async def format_cart_products(
         cls,
-        cart: dict[str, Any],
+        cart: Cart,
         region_products: list[dict[str, Any]],
         currency: dict[str, str | float],
     ) -> list[dict[str, str]]:
@@ -63,32 +65,31 @@ class Formatters:
         Removes bouquets because of the deprecated sizes.
 
         Args:
-            cart_products (dict): A dictionary containing product IDs and their
-                respective cart amounts.
+            cart (Cart): The customer cart.
             region_products (list): A list of product dictionaries for a specific region.
 
         Returns:
             list[dict]: A list of formatted product dictionaries with cart amounts included.
         """
+        region_products_by_id = {
+            product["id"]: product for product in region_products if product["id"] in cart
+        }
         result = []
-        filtered_region_products = tuple(
-            filter(
-                lambda x: x["id"] in (cart_product["id"] for cart_product in cart["products"]),
-                region_products,
-            )
-        )
-        for product in filtered_region_products:
-            for cart_product in cart["products"]:
-                if cart_product["id"] == product["id"]:
-                    product_copy = copy(product)
-                    cls.include_product_cart_amount(product_copy, cart_product["amount"])
-                    try:
-                        await cls.include_bouquets_sizes(
-                            product_copy, cart_product, currency, cart
-                        )
-                    except DeprecatedBouquetSizeFoundError():
-                        continue
-                    result.append(product_copy)
+        for product_id, size, amount in cart:
+            if (product := region_products_by_id.get(product_id)) is None:
+                continue
+            product_copy = copy(product)
+            cls.include_product_cart_amount(product_copy, amount)
+            try:
+                await cls.include_bouquets_sizes(
+                    product_copy,
+                    {"id": product_id, "size": size, "amount": amount},
+                    currency,
+                    cart,
+                )
+            except DeprecatedBouquetSizeFoundError:
+                continue
+            result.append(product_copy)
         return result
 
 
@@ -2,10 +2,11 @@
 
 from django.urls import path
 
-from .views import CartView
+from .views import CartBatchView, CartView
 
 app_name = "cart"
 
 urlpatterns = [
     path("<slug:region_slug>/cart/", CartView.as_view(), name="cart"),
+    path("<slug:region_slug>/cart/batch/", CartBatchView.as_view(), name="cart_batch"),
 ]
@@ -4,12 +4,16 @@ import json
 from typing import Any
 
 from django.http import HttpRequest, HttpResponse, HttpResponseServerError, JsonResponse
+from django.views import View
 
 from async_views.generic.base import AsyncTemplateView
+from config.constants import Constants
 from services.common_handlers import common_handlers
 from services.data_getters import crm_data
 from services.mixins import ApplicationMixin
 
+from .app_services.cart import Cart
+from .app_services.pricing import pricing_engine
 from .app_services.session_data import session_data
 from .app_services.utils import formatters
 
@@ -45,7 +49,7 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         old_cart = await session_data.get_or_create_cart(self.request.session)
         region = context["region"]
         region_products = await self._get_region_products(
-            region, context["selected_currency"], old_cart["products"]
+            region, context["selected_currency"], old_cart
         )
         context["cart"] = updated_cart = await self._update_cart_data(region_products, old_cart)
 
@@ -54,9 +58,10 @@ class CartView(AsyncTemplateView, ApplicationMixin):
             region_products,
             context["selected_currency"],
         )
-        context["cart_grand_total_price"] = self._calculate_cart_grand_total_price(
-            context["cart_products"]
+        context["cart_pricing"] = pricing = await pricing_engine.price_cart(
+            updated_cart, region["slug"], context["selected_currency"], region_products
         )
+        context["cart_grand_total_price"] = pricing.grand_total
         context["suggested_products"] = await self._get_suggested_products(
             region, region_products, context["cart_products"]
         )
@@ -64,8 +69,8 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         return context
 
     async def _update_cart_data(
-        self, region_products: list[dict[str, Any]], old_cart: dict[str, Any]
-    ) -> dict[str, Any]:
+        self, region_products: list[dict[str, Any]], old_cart: Cart
+    ) -> Cart:
         """
         Update cart data in the context.
 
@@ -81,7 +86,7 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         self,
         region: dict[str, Any],
         selected_currency: dict[str, str | float],
-        cart_products: list[dict[str, int]],
+        cart: Cart,
     ) -> list[dict[str, Any]]:
         """
         Get region products based on the provided region and context.
@@ -93,12 +98,12 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         return await crm_data.get_region_products(
             region["slug"],
             currency=selected_currency,
-            cart_ids_set={product["id"] for product in cart_products},
+            cart_ids_set=cart.products_ids,
         )
 
     async def _find_outdated_cart_products_ids(
-        self, region_products: list[dict[str, Any]], cart: dict[str, Any]
-    ) -> tuple[dict[str, Any]]:
+        self, region_products: list[dict[str, Any]], cart: Cart
+    ) -> set[str]:
         """
         Find outdated cart products by comparing region products with the cart.
 
@@ -106,11 +111,7 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         :param cart: The cart dictionary.
         :return: A list of outdated cart product IDs.
         """
-        return {
-            product["id"]
-            for product in cart["products"]
-            if product["id"] not in (product["id"] for product in region_products)
-        }
+        return cart.products_ids - {product["id"] for product in region_products}
 
     async def _remove_outdated_cart_products(
         self, outdated_cart_products_ids: tuple[str]
@@ -138,26 +139,6 @@ class CartView(AsyncTemplateView, ApplicationMixin):
             region["slug"], region_products, cart_products
         )
 
-    def _calculate_cart_grand_total_price(
-        self, cart_products: list[dict[str, Any]]
-    ) -> float:  # TODO: to combine this method with CheckoutView.calculate_cart_grand_total
-        """
-        Calculate the grand total price of cart products.
-
-        :param cart_products: list of cart products.
-        :return: The grand total price.
-        """
-        return round(
-            sum(
-                map(
-                    lambda x: (x["unit_price"] if not x["discount"] else x["new_price"])
-                    * x["cart_amount"],
-                    cart_products,
-                )
-            ),
-            2,
-        )
-
     async def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
         """Handle POST request for adding product to customer ordered products."""
         try:
@@ -185,15 +166,15 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         if bouquet_size:
             if not isinstance(bouquet_size, int):
                 return JsonResponse({"msg": "Bouquet size must be integer"}, status=400)
-        context: dict[str, list[dict[str, Any]]] = await self.get_common_context(
-            *args, **kwargs
-        )
+        region = await self.get_request_region(kwargs.get("region_slug"))
+        if isinstance(region, HttpResponseServerError):
+            return region
         return await session_data.create_ordered_product(
             request,
             request.session,
             product_id,
             amount,
-            context["region"],
+            region,
             bouquet_size,
         )
 
@@ -224,11 +205,11 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         if bouquet_size:
             if not isinstance(bouquet_size, int):
                 return JsonResponse({"msg": "Bouquet size must be integer"}, status=400)
-        context: dict[str, list[dict[str, Any]]] = await self.get_common_context(
-            *args, **kwargs
-        )
+        region = await self.get_request_region(kwargs.get("region_slug"))
+        if isinstance(region, HttpResponseServerError):
+            return region
         return await session_data.update_ordered_product(
-            request, request.session, product_id, amount, context["region"], bouquet_size
+            request, request.session, product_id, amount, region, bouquet_size
         )
 
     async def delete(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
@@ -258,3 +239,64 @@ class CartView(AsyncTemplateView, ApplicationMixin):
         return await session_data.remove_ordered_product(
             request.session, product_id, bouquet_size
         )
+
+
+class CartBatchView(View, ApplicationMixin):
+    """Class view for applying several cart operations with one request."""
+
+    http_method_names = ["post"]
+    operations_names = ("add", "update", "remove")
+
+    async def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        """
+        Handle POST request with the list of cart operations.
+
+        Body is {"operations": [{"op": "add" | "update" | "remove", "id": str,
+        "amount": int, "bouquet_size": int | null}, ...]}, 'amount' isn't needed for removing.
+        """
+        try:
+            data: dict = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({"msg": "Wrong data passed"}, status=400)
+
+        operations = data.get("operations") if isinstance(data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return JsonResponse({"msg": "Operations list isn't passed"}, status=400)
+
+        if len(operations) > Constants.MAX_CART_OPERATIONS:
+            return JsonResponse({"msg": "Too many operations passed"}, status=400)
+
+        for index, operation in enumerate(operations):
+            if error := self._validate_operation(operation):
+                return JsonResponse({"msg": error, "index": index}, status=400)
+
+        region = await self.get_request_region(kwargs.get("region_slug"))
+        if isinstance(region, HttpResponseServerError):
+            return region
+        return await session_data.apply_cart_operations(
+            request, request.session, operations, region
+        )
+
+    def _validate_operation(self, operation: Any) -> str | None:
+        """
+        Validate cart operation structure.
+
+        :param operation: Operation passed in the request.
+        :return: Error message or None if the operation is valid.
+        """
+        if not isinstance(operation, dict) or operation.get("op") not in self.operations_names:
+            return "Operation must be one of: " + ", ".join(self.operations_names)
+
+        product_id = operation.get("id")
+        if not isinstance(product_id, str) or not product_id.isdigit():
+            return "Product ID must be integer reduced to string"
+
+        if operation["op"] != "remove":
+            amount = operation.get("amount")
+            if not isinstance(amount, int) or isinstance(amount, bool) or amount < 1:
+                return "Product amount must be positive integer"
+
+        bouquet_size = operation.get("bouquet_size")
+        if bouquet_size is not None and not isinstance(bouquet_size, int):
+            return "Bouquet size must be integer"
+        return None
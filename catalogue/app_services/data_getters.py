@@ -1,11 +1,12 @@
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from pprint import pprint
 
 import httpx
 from django.core.cache import cache
-from zcrmsdk.src.com.zoho.crm.api import Initializer
 from zcrmsdk.src.com.zoho.crm.api.util import APIHTTPConnector
 
+from zoho_token.utils import zoho_init
+
 
 class CRMData:
     def __init__(self):
@@ -15,8 +16,7 @@ class CRMData:
     async def get_bouquets_module_fields(self):
         if fields := cache.get("bouquets_module_fields"):
             return fields
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
         async with httpx.AsyncClient(headers=self.connector.headers) as client:
             response = await client.get(
                 url="https://www.zohoapis.eu/crm/v5/settings/fields?module=bouquets"
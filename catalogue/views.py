@@ -1,35 +1,46 @@
 """Function and class views list for 'catalogue' app."""
 
+from functools import partial
 from typing import Any, Dict
 
 from django.core.paginator import Paginator
 from django.http import HttpResponseNotFound, HttpResponseServerError
+from django.template.loader import render_to_string
 
 from async_views.generic.base import AsyncTemplateView
-from cart.app_services.session_data import session_data
+from cart.app_services.cart import Cart
+from services.context_loader import Dataset
 from services.data_getters import crm_data
-from services.mixins import ApplicationMixin
+from services.mixins import ApplicationMixin, ConditionalGetMixin, PageCacheMixin
 from userprofile.app_services.userprofile_handlers import user_handlers
 
 from .app_services.utils import bread_crumbs, filters
 
 
 # Create your views here.
-class CatalogueView(ApplicationMixin, AsyncTemplateView):
+class CatalogueView(ConditionalGetMixin, PageCacheMixin, ApplicationMixin, AsyncTemplateView):
     """
     View class for rendering the catalogue page with product listings.
 
-    Extends `ApplicationMixin` and `AsyncTemplateView`.
+    Extends `ConditionalGetMixin`, `PageCacheMixin`, `ApplicationMixin` and
+    `AsyncTemplateView`.
 
     Attributes:
         template_name (str): The name of the template to be rendered.
+        page_cache_query_params (tuple): Query parameters the cached page varies on.
+        etag_session_keys (tuple): Session keys the page depends on.
 
     Dependencies:
+        - ConditionalGetMixin: Answers conditional GET requests with 304.
+        - PageCacheMixin: Serves the page from the page cache, viewed products are
+          filled per request.
         - ApplicationMixin: Provides common functionality for the view.
         - AsyncTemplateView: Django's class-based async view for rendering templates.
     """
 
     template_name = "catalogue/catalogue.html"
+    page_cache_query_params = ("currency", "sort", "page")
+    etag_session_keys = ("viewed_products",)
 
     def __init__(self) -> None:
         """To initiate CatalogueView class."""
@@ -49,39 +60,91 @@ class CatalogueView(ApplicationMixin, AsyncTemplateView):
         )
         if isinstance(context, HttpResponseServerError):
             return context
-        cat_slug = self.kwargs.get("category_slug")
-        subcat_slug = self.kwargs.get("subcategory_slug")
-
-        context["category_crumb"] = await bread_crumbs.get_category_crumb(cat_slug)
-        if self.is_subcat_exists:
-            context["subcategory_crumb"] = await bread_crumbs.get_subcategory_crumb(subcat_slug)
-
-        cart: dict = await session_data.get_or_create_cart(self.request.session)
-        cart_products_id_list = {product["id"] for product in cart["products"]}
-        filtered_products_by_cat_and_subcat = await filters.filter_products(
-            context["region"],
-            cat_slug,
-            subcat_slug,
-            context["selected_currency"],
-            self.request.GET.get("sort"),
-            cart_ids_set=cart_products_id_list,
-        )
+        filtered_products_by_cat_and_subcat = context["filtered_products"]
         #   TODO check if it will be convinient to change list to set
         context["sort"] = self.request.GET.get("sort")
         paginator = Paginator(filtered_products_by_cat_and_subcat, per_page=2)  # TODO return 12
         page_number = self.request.GET.get("page")
         page = paginator.get_page(page_number)
         context["products_page"] = page
-        context[
-            "viewed_products"
-        ] = await user_handlers.get_and_refresh_viewed_customer_products(
-            self.request.session,
-            context["region"]["slug"],
-            context["selected_currency"],
-            cart_products_id_list,
-        )
         return context
 
+    def get_context_datasets(self, **context: Any) -> Dict[str, Dataset]:
+        """
+        Get datasets of the page context with the breadcrumbs and filtered products.
+
+        Args:
+            **context (Any): Context data.
+
+        Returns:
+            Dict[str, Dataset]: Datasets by the names of the context variables.
+        """
+        datasets = {
+            **super().get_context_datasets(**context),
+            "category_crumb": Dataset(
+                partial(bread_crumbs.get_category_crumb, self.kwargs.get("category_slug"))
+            ),
+            "filtered_products": Dataset(
+                self.load_filtered_products, ("region", "selected_currency")
+            ),
+        }
+        if self.is_subcat_exists:
+            datasets["subcategory_crumb"] = Dataset(
+                partial(bread_crumbs.get_subcategory_crumb, self.kwargs.get("subcategory_slug"))
+            )
+        return datasets
+
+    async def load_filtered_products(
+        self, region: dict | None, selected_currency: dict | None
+    ) -> list[dict[str, Any]]:
+        """
+        Get products of the category and subcategory sorted by the 'sort' query parameter.
+
+        Args:
+            region (dict | None): The selected region.
+            selected_currency (dict | None): The selected currency.
+
+        Returns:
+            list: The filtered products.
+        """
+        if region is None or selected_currency is None:
+            return []
+        return await filters.filter_products(
+            region,
+            self.kwargs.get("category_slug"),
+            self.kwargs.get("subcategory_slug"),
+            selected_currency,
+            self.request.GET.get("sort"),
+            cart_ids_set=set(),
+        )
+
+    async def get_page_holes(
+        self, region: dict[str, Any], currency: dict[str, Any], cart: Cart
+    ) -> dict[str, str]:
+        """
+        Get per-user parts of the page with the products viewed by the customer.
+
+        Args:
+            region (dict): The region of the request.
+            currency (dict): The selected currency.
+            cart (Cart): The session's cart.
+
+        Returns:
+            dict: Content of the holes.
+        """
+        holes = await super().get_page_holes(region, currency, cart)
+        holes["viewed-products"] = render_to_string(
+            "catalogue/viewedProducts.html",
+            {
+                "viewed_products": await user_handlers.get_and_refresh_viewed_customer_products(
+                    self.request.session, region["slug"], currency, cart.products_ids
+                ),
+                "region": region,
+                "selected_currency": currency,
+            },
+        )
+        return holes
+
     async def get(self, request, *args, **kwargs: Dict):
         """Async implementation of the GET-method (for async get_context_data using)."""
         self.is_cat_exists = self.kwargs.get("category_slug") in (
@@ -94,10 +157,7 @@ class CatalogueView(ApplicationMixin, AsyncTemplateView):
                     subcat["slug"] for subcat in await crm_data.get_subcategories_list()
                 )
                 if self.is_subcat_exists:
-                    context = await self.get_context_data(**kwargs)
-                    if isinstance(context, HttpResponseServerError):
-                        return context
-                    return self.render_to_response(context)
+                    return await self.render_cached_page(**kwargs)
                 return HttpResponseNotFound()
-            return self.render_to_response(await self.get_context_data(**kwargs))
+            return await self.render_cached_page(**kwargs)
         return HttpResponseNotFound()
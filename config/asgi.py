@@ -2,6 +2,8 @@
 ASGI config for BonnyFlowers project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Lifespan events open the pooled HTTP clients and warm up the catalog caches
+on startup and close the clients on shutdown (see services/lifespan.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -13,4 +15,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from services.lifespan import lifespan_application  # noqa: E402
+
+application = lifespan_application(django_application)
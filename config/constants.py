@@ -12,3 +12,6 @@ class Constants:
     COQL_REQUEST_URL = "https://www.zohoapis.eu/crm/v5/coql"
     DEFAULT_REGION_CODE = "Dnipro"
     DEFAULT_REGION_SLUG = "dnipro"
+    MAX_CART_OPERATIONS = 50
+    CLIENT_ORDERS_CHUNK = 50
+    CLIENT_ORDERS_CACHE_TIMEOUT = 60
@@ -58,11 +58,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "services.request_timing.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
+    "services.static_files.static_files_middleware",
+    "services.db_router.replica_pinning_middleware",
+    "services.sessions.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -100,9 +101,30 @@ DATABASES = {
         "PORT": os.getenv("MYSQL_INTERNAL_PORT"),
         "USER": os.getenv("MYSQL_USER"),
         "PASSWORD": os.getenv("MYSQL_PASSWORD"),
+        # Connections of the requests are closed when they finish, as every request
+        # runs its thread-sensitive calls in its own thread. Connections of the database
+        # pool workers are kept for DB_POOL_CONN_MAX_AGE seconds (see services/db.py)
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Reads are sent to the replica, if it's configured (see services/db_router.py)
+DATABASE_REPLICA_ALIAS = "replica"
+if os.getenv("MYSQL_REPLICA_HOST"):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("MYSQL_REPLICA_HOST"),
+        "PORT": os.getenv("MYSQL_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["services.db_router.ReplicaRouter"]
+
+# Worker threads running queries of the async views, every one keeps its own connection,
+# keep workers * DB_POOL_SIZE below the database connections limit (see services/db.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_POOL_CONN_MAX_AGE = int(os.getenv("DB_POOL_CONN_MAX_AGE", 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -148,10 +170,32 @@ STATICFILES_DIRS = [
     "orders/templates/",
     "fillers/templates/",
 ]
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "services.static_files.CompressedManifestStaticFilesStorage"},
+}
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Responsive image derivatives (see services/image_derivatives.py)
+IMAGE_DERIVATIVES_WIDTHS = (320, 640, 960, 1280)
+IMAGE_DERIVATIVES_WORKERS = int(os.getenv("IMAGE_DERIVATIVES_WORKERS", 2))
+MEDIA_DOWNLOADS_CONCURRENCY = int(os.getenv("MEDIA_DOWNLOADS_CONCURRENCY", 8))
+MEDIA_DOWNLOADS_RETRIES = int(os.getenv("MEDIA_DOWNLOADS_RETRIES", 3))
+ORDER_OUTBOX_MAX_ATTEMPTS = int(os.getenv("ORDER_OUTBOX_MAX_ATTEMPTS", 8))
+NOTIFICATIONS_MAX_ATTEMPTS = int(os.getenv("NOTIFICATIONS_MAX_ATTEMPTS", 5))
+INDIVIDUAL_ORDER_PHOTO_MAX_SIDE = int(os.getenv("INDIVIDUAL_ORDER_PHOTO_MAX_SIDE", 1600))
+INDIVIDUAL_ORDER_PHOTO_MAX_ATTEMPTS = int(os.getenv("INDIVIDUAL_ORDER_PHOTO_MAX_ATTEMPTS", 5))
+ZOHO_WEBHOOK_SECRET = os.getenv("ZOHO_WEBHOOK_SECRET")
+
+# Pooled HTTP clients of the ASGI workers (see services/http_clients.py)
+HTTP_CLIENTS_TIMEOUT = float(os.getenv("HTTP_CLIENTS_TIMEOUT", 30))
+HTTP_CLIENTS_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENTS_MAX_CONNECTIONS", 100))
+HTTP_CLIENTS_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("HTTP_CLIENTS_MAX_KEEPALIVE_CONNECTIONS", 20)
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -181,4 +225,15 @@ CACHES = {
     }
 }
 
-CACHE_MIDDLEWARE_SECONDS = 10
+# Cookies the cached pages vary on besides region and currency (see services/page_cache.py)
+PAGE_CACHE_VARY_COOKIES = ()
+
+# Seconds to load the page context datasets in (see services/context_loader.py)
+CONTEXT_LOADER_TIMEOUT = float(os.getenv("CONTEXT_LOADER_TIMEOUT", 10))
+
+# Phase timings of the requests (see services/request_timing.py), the header exposes
+# the backend timings to every client, so it's sent only if it's explicitly enabled
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "0") == "1"
+REQUEST_TIMING_LOG_THRESHOLD = float(os.getenv("REQUEST_TIMING_LOG_THRESHOLD", 1))
+
+SESSION_ENGINE = "services.sessions"
@@ -52,56 +52,91 @@ document.addEventListener('DOMContentLoaded', function () {
     const action = decrementBtn ? 'decreace' : 'increace';
     const isBouquet = card.dataset.isBouquet.toLowerCase() === "true";
 
-    try {
-      const config = {
-        headers: {
-          'Content-Type': 'application/json',
-          'X-CSRFToken': csrfmiddlewaretoken,
-        }
-      };
-      let requestBody
-      if (isBouquet) {
-        const bouquetSize = parseInt(card.dataset.selectedSize);
-        if (!isNaN(bouquetSize) && bouquetSize % 1 === 0) {
-          requestBody = { id, amount: count, csrfmiddlewaretoken, bouquet_size: bouquetSize };
-        } else {
-          requestBody = { id, amount: count, csrfmiddlewaretoken };
-        }
-         
-      } else {
-          requestBody = { id, amount: count, csrfmiddlewaretoken };
-      }
-      
-      const response = await axios.put(
-        `/${region}/cart/`,
-        requestBody,
-        config
-      );
-
-      if (response.status === 204) {
-        countSpan.textContent = count;
-        totalCountElements[0].innerText = totalCount;
-        totalCountElements[1].innerText = totalCount;
-
-        if (totalPriceElement) {
-          totalPriceElement.innerText = newTotalPrice.toFixed(2);
-        }
-        
-        setTotalCount2(card, action);
-        if(totalOrderElement) {
-          totalOrderElement.innerText = totalOrderCount;
-        }
+    const operation = { op: 'update', id, amount: count };
+    if (isBouquet) {
+      const bouquetSize = parseInt(card.dataset.selectedSize);
+      if (!isNaN(bouquetSize) && bouquetSize % 1 === 0) {
+        operation.bouquet_size = bouquetSize;
       }
+    }
 
-      // if (response.status === 204 && decrementBtn && totalPriceElement) {
-      //   decreaseTotalPrice(card);
-      // }
+    const previousState = {
+      count: countSpan.textContent,
+      totalCounts: [...totalCountElements].map((element) => element.innerText),
+      totalPrice: totalPriceElement ? totalPriceElement.innerText : null,
+      totalOrderCount: totalOrderElement ? totalOrderElement.innerText : null,
+    };
 
-      // if (response.status === 204 && incrementBtn && totalPriceElement) {
-      //   increaseTotalPrice(card);
-      // }
-    } catch (error) {
-      console.error('Помилка PUT-запиту:', error);
+    countSpan.textContent = count;
+    totalCountElements[0].innerText = totalCount;
+    totalCountElements[1].innerText = totalCount;
+
+    if (totalPriceElement) {
+      totalPriceElement.innerText = newTotalPrice.toFixed(2);
     }
+
+    setTotalCount2(card, action);
+    if(totalOrderElement) {
+      totalOrderElement.innerText = totalOrderCount;
+    }
+
+    queueCartOperation(region, csrfmiddlewaretoken, operation, () => {
+      countSpan.textContent = previousState.count;
+      totalCountElements.forEach((element, index) => {
+        element.innerText = previousState.totalCounts[index];
+      });
+      if (totalPriceElement) {
+        totalPriceElement.innerText = previousState.totalPrice;
+      }
+      if (totalOrderElement) {
+        totalOrderElement.innerText = previousState.totalOrderCount;
+      }
+    });
   })
 });
+
+
+// BATCHING OF THE CART UPDATES
+// Clicks made in a short time are sent with one request, only the latest amount
+// of every product is sent. If the request fails, the page state is rolled back.
+const CART_BATCH_DELAY = 300;
+const pendingCartOperations = new Map();
+let pendingCartRollbacks = [];
+let cartBatchTimer = null;
+let cartBatchRequest = Promise.resolve();
+
+function queueCartOperation(region, csrfmiddlewaretoken, operation, rollback) {
+  pendingCartOperations.set(`${operation.id}:${operation.bouquet_size || ''}`, operation);
+  pendingCartRollbacks.push(rollback);
+  clearTimeout(cartBatchTimer);
+  cartBatchTimer = setTimeout(() => {
+    const operations = [...pendingCartOperations.values()];
+    const rollbacks = pendingCartRollbacks;
+    pendingCartOperations.clear();
+    pendingCartRollbacks = [];
+    cartBatchRequest = cartBatchRequest.then(() =>
+      sendCartOperations(region, csrfmiddlewaretoken, operations, rollbacks)
+    );
+  }, CART_BATCH_DELAY);
+}
+
+async function sendCartOperations(region, csrfmiddlewaretoken, operations, rollbacks) {
+  try {
+    const response = await axios.post(
+      `/${region}/cart/batch/`,
+      { operations },
+      {
+        headers: {
+          'Content-Type': 'application/json',
+          'X-CSRFToken': csrfmiddlewaretoken,
+        }
+      }
+    );
+    document.querySelectorAll('.products-count').forEach((element) => {
+      element.innerText = response.data.cart.quantity;
+    });
+  } catch (error) {
+    rollbacks.reverse().forEach((rollback) => rollback());
+    console.error('Помилка POST-запиту:', error);
+  }
+}
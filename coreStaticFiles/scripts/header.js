@@ -314,7 +314,17 @@ function loyautXSCard(productsList) {
                 : ''
               }
               <div class="img-box">
-                <img src="${product.image_url}" alt="${product.Name}" />
+                <picture>
+                  ${product.image_srcset && product.image_srcset.avif
+                    ? `<source type="image/avif" srcset="${product.image_srcset.avif}" sizes="150px" />`
+                    : ''
+                  }
+                  ${product.image_srcset && product.image_srcset.webp
+                    ? `<source type="image/webp" srcset="${product.image_srcset.webp}" sizes="150px" />`
+                    : ''
+                  }
+                  <img src="${product.image_url}" alt="${product.Name}" />
+                </picture>
               </div>
               <div class="prod-desc">
                 <div class="card-top">
@@ -1,9 +1,9 @@
 from typing import Any
 
-from asgiref.sync import sync_to_async
 from django.http import HttpResponse, HttpResponseServerError
 
 from async_views.generic.base import AsyncTemplateView
+from services.db import db_pool
 from services.mixins import ApplicationMixin
 
 from .models import AboutUsContextModel, ContactsDataModel, DeliveryDataModel
@@ -39,10 +39,9 @@ class AboutUsView(AsyncTemplateView, ApplicationMixin):
             return context
         return context
 
-    @sync_to_async
-    def get_about_us_context(self):
+    async def get_about_us_context(self):
         """To return 'about us' context asynchronously from DB."""
-        return list(AboutUsContextModel.objects.all()[:1])
+        return await db_pool.fetch(AboutUsContextModel.objects.all()[:1])
 
 
 class DeliveryView(AsyncTemplateView, ApplicationMixin):
@@ -74,10 +73,9 @@ class DeliveryView(AsyncTemplateView, ApplicationMixin):
             return context
         return context
 
-    @sync_to_async
-    def get_delivery_context(self):
+    async def get_delivery_context(self):
         """To return 'about us' context asynchronously from DB."""
-        return list(DeliveryDataModel.objects.all()[:1])
+        return await db_pool.fetch(DeliveryDataModel.objects.all()[:1])
 
 
 class ContactsView(AsyncTemplateView, ApplicationMixin):
@@ -109,7 +107,6 @@ class ContactsView(AsyncTemplateView, ApplicationMixin):
             return context
         return context
 
-    @sync_to_async
-    def get_contacts_context(self):
+    async def get_contacts_context(self):
         """To return 'about us' context asynchronously from DB."""
-        return list(ContactsDataModel.objects.all()[:1])
+        return await db_pool.fetch(ContactsDataModel.objects.all()[:1])
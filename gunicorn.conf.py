@@ -6,6 +6,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 bind = os.getenv("GUNICORN_DOMEN")
-workers = multiprocessing.cpu_count() * 2 + 1
+# ASGI by default: async views share one event loop per worker and the pooled clients.
+# Set GUNICORN_APP=config.wsgi:application and GUNICORN_WORKER_CLASS=sync for WSGI.
+wsgi_app = os.getenv("GUNICORN_APP", "config.asgi:application")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
 timeout = 30
+graceful_timeout = 30
 cache = None
@@ -1,5 +1,10 @@
 """Feedback views."""
-from django.http import HttpRequest, HttpResponseRedirect, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponseRedirect,
+    HttpResponseServerError,
+    JsonResponse,
+)
 from django.urls import reverse_lazy
 
 from async_views.generic.edit import AsyncFormView
@@ -32,12 +37,13 @@ class LocationView(AsyncFormView):
             data: dict[str, str | int] = form.cleaned_data
             if not data.get("country") or not data.get("city"):
                 return JsonResponse({"msg": "Wrong data passed"}, status=400)
-            regions = await crm_data.get_regions_list(self.request)
-            for region in regions:
-                if region["code"].lower() == data["city"].lower():
-                    return HttpResponseRedirect(
-                        reverse_lazy(
-                            "main_page:mainpage-view", kwargs={"region_slug": region["slug"]}
-                        )
+            regions_lookup = await crm_data.get_regions_lookup(self.request)
+            if isinstance(regions_lookup, HttpResponseServerError):
+                return regions_lookup
+            if region := regions_lookup["code"].get(data["city"].lower()):
+                return HttpResponseRedirect(
+                    reverse_lazy(
+                        "main_page:mainpage-view", kwargs={"region_slug": region["slug"]}
                     )
+                )
         return HttpResponseRedirect(reverse_lazy("main_page:main_page"))
@@ -1,6 +1,7 @@
 """Mainpage configure for 'mainpage' app."""
 
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class MainpageConfig(AppConfig):
@@ -8,3 +9,16 @@ class MainpageConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "mainpage"
+
+    def ready(self) -> None:
+        """Drop cached pages when the content managed in the admin site changes."""
+        from services.page_cache import page_cache
+
+        for model_name in ("Contact", "SeoBlock", "MainSlider", "CustomCategories"):
+            model = self.get_model(model_name)
+            post_save.connect(
+                page_cache.invalidate, sender=model, dispatch_uid=f"page_cache_{model_name}"
+            )
+            post_delete.connect(
+                page_cache.invalidate, sender=model, dispatch_uid=f"page_cache_{model_name}"
+            )
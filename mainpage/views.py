@@ -1,24 +1,25 @@
 """Function and class views list for 'mainpage' app."""
 
-import asyncio
 from typing import Any
 
-from asgiref.sync import sync_to_async
 from django.http import HttpResponseServerError
 from django.shortcuts import render
+from django.template.loader import render_to_string
 
 from async_views.generic.base import AsyncTemplateView
-from cart.app_services.session_data import session_data
+from cart.app_services.cart import Cart
 from mainpage.models import MainSlider, SeoBlock
 from services.common_handlers import common_handlers
+from services.context_loader import Dataset
 from services.data_getters import crm_data
-from services.mixins import ApplicationMixin
+from services.db import db_pool
+from services.mixins import ApplicationMixin, ConditionalGetMixin, PageCacheMixin
 
 from .app_services.mainpage_handlers import utilities
 
 
-class MainPageView(ApplicationMixin, AsyncTemplateView):
-    """Class view mixin for region page."""
+class MainPageView(ConditionalGetMixin, PageCacheMixin, ApplicationMixin, AsyncTemplateView):
+    """Class view mixin for region page, additional products are filled per request."""
 
     template_name = "mainpage/index.html"
 
@@ -34,35 +35,16 @@ class MainPageView(ApplicationMixin, AsyncTemplateView):
         if isinstance(context, HttpResponseServerError):
             return context
 
-        region = context["region"]
-        cart: dict = await session_data.get_or_create_cart(self.request.session)
-        region_products, subcategories_list = await asyncio.gather(
-            crm_data.get_region_products(
-                region["slug"],
-                currency=context["selected_currency"],
-                cart_ids_set={product["id"] for product in cart["products"]},
-            ),
-            crm_data.get_subcategories_list(),
-        )
-
+        region_products = context["region_products"]
         context["quick_selection_subcategories"] = [
             subcategory
-            for subcategory in subcategories_list
+            for subcategory in context["subcategories_list"]
             if subcategory["slug"]
             in [product["subcategory_slug"] for product in region_products]
         ]
 
         context["region_bestsellers"] = utilities.get_region_bestsellers(region_products)
-
-        cart_products = await common_handlers.get_cart_products(
-            region["slug"], cart, context["selected_currency"]
-        )
-        context[
-            "additional_products"
-        ] = await common_handlers.get_first_three_additional_products(
-            region["slug"], region_products, cart_products
-        )
-        seo_blocks = await self.get_seo_blocks()
+        seo_blocks = context["seo_blocks"]
         context["first_seo_block"] = seo_blocks[0]
         context["second_seo_block"] = seo_blocks[1]
         if not context["first_seo_block"].picture or not context["second_seo_block"].picture:
@@ -82,23 +64,59 @@ class MainPageView(ApplicationMixin, AsyncTemplateView):
                 status=503,
             )
 
-        main_slider = await self.get_main_slider()
-        context["main_slider"] = main_slider
         return context
 
-    @sync_to_async
-    def get_seo_blocks(self):
+    def get_context_datasets(self, **context: Any) -> dict[str, Dataset]:
+        """
+        Get datasets of the page context with the region products, SEO-blocks and main slider.
+
+        :params context: any context data.
+        """
+        return {
+            **super().get_context_datasets(**context),
+            "region_products": Dataset(
+                self.load_region_products, ("region", "selected_currency")
+            ),
+            "seo_blocks": Dataset(self.get_seo_blocks),
+            "main_slider": Dataset(self.get_main_slider),
+        }
+
+    async def get_page_holes(
+        self, region: dict[str, Any], currency: dict[str, Any], cart: Cart
+    ) -> dict[str, str]:
+        """
+        Get per-user parts of the page with the additional products, that aren't in the cart.
+
+        :param region: dict The region of the request.
+        :param currency: dict The selected currency.
+        :param cart: Cart The session's cart.
+        """
+        holes = await super().get_page_holes(region, currency, cart)
+        region_products = await crm_data.get_region_products(
+            region["slug"], currency=currency, cart_ids_set=cart.products_ids
+        )
+        cart_products = await common_handlers.get_cart_products(region["slug"], cart, currency)
+        additional_products = await common_handlers.get_first_three_additional_products(
+            region["slug"], region_products, cart_products
+        )
+        holes["additional-products"] = render_to_string(
+            "mainpage/additionalProducts.html",
+            {
+                "additional_products": additional_products,
+                "region": region,
+                "selected_currency": currency,
+            },
+        )
+        return holes
+
+    async def get_seo_blocks(self):
         """To return SEO-block asynchronously."""
-        return list(SeoBlock.objects.all()[:2])
+        return await db_pool.fetch(SeoBlock.objects.all()[:2])
 
-    @sync_to_async
-    def get_main_slider(self):
+    async def get_main_slider(self):
         """To return main slider asynchronously."""
-        return list(MainSlider.objects.all())
+        return await db_pool.fetch(MainSlider.objects.all())
 
     async def get(self, request, *args, **kwargs):
         """Asynchronous variation of GET method."""
-        context = await self.get_context_data(**kwargs)
-        if isinstance(context, HttpResponseServerError):
-            return context
-        return self.render_to_response(context)
+        return await self.render_cached_page(**kwargs)
@@ -1,3 +1,92 @@
+"""Admin site configuration for 'orders' app."""
+
 from django.contrib import admin
 
-# Register your models here.
+from orders.models import (
+    IndividualOrderPhoto,
+    Notification,
+    OrderOutbox,
+    OrderStatusMirror,
+)
+
+
+class OrderOutboxAdmin(admin.ModelAdmin):
+    """OrderOutbox admin site settings."""
+
+    list_display = (
+        "id",
+        "order_number",
+        "region_slug",
+        "grand_total",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "zoho_id",
+    )
+    list_display_links = (
+        "id",
+        "order_number",
+    )
+    list_filter = ("status",)
+    search_fields = ("order_number", "zoho_id")
+
+
+class OrderStatusMirrorAdmin(admin.ModelAdmin):
+    """OrderStatusMirror admin site settings."""
+
+    list_display = (
+        "id",
+        "zoho_id",
+        "order_number",
+        "status",
+        "updated_at",
+    )
+    list_display_links = (
+        "id",
+        "zoho_id",
+    )
+    search_fields = ("order_number", "zoho_id")
+
+
+class NotificationAdmin(admin.ModelAdmin):
+    """Notification admin site settings."""
+
+    list_display = (
+        "id",
+        "channel",
+        "recipient",
+        "status",
+        "attempts",
+        "created_at",
+        "sent_at",
+    )
+    list_display_links = (
+        "id",
+        "recipient",
+    )
+    list_filter = ("channel", "status")
+
+
+class IndividualOrderPhotoAdmin(admin.ModelAdmin):
+    """IndividualOrderPhoto admin site settings."""
+
+    list_display = (
+        "id",
+        "module_api_name",
+        "record_id",
+        "photo",
+        "status",
+        "attempts",
+        "uploaded_at",
+    )
+    list_display_links = (
+        "id",
+        "record_id",
+    )
+    list_filter = ("status",)
+
+
+admin.site.register(OrderOutbox, OrderOutboxAdmin)
+admin.site.register(OrderStatusMirror, OrderStatusMirrorAdmin)
+admin.site.register(Notification, NotificationAdmin)
+admin.site.register(IndividualOrderPhoto, IndividualOrderPhotoAdmin)
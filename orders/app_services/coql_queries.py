@@ -0,0 +1,29 @@
+"""Module for creating coql queries for fetching Zoho CRM data for 'orders' api."""
+from typing import Iterable
+
+
+class COQLQueries:
+    """Class for creating 'orders' api coql queries."""
+
+    ORDERS_FIELDS = (
+        "order_id.id, order_id.order_number, order_id.target_delivery_date, "
+        "order_id.grand_total, order_id.order_status, order_id.order_currency_id, "
+        "sku, product_id.Name, amount, price"
+    )
+
+    def get_client_orders_query(self, orders_ids: Iterable[str]) -> str:
+        """Get query for fetching ordered products of the orders with their orders fields."""
+        return (
+            f"select {self.ORDERS_FIELDS} from ordered_products "
+            f"where order_id.id in ({', '.join(orders_ids)})"
+        )
+
+    def get_all_orders_query(self) -> str:
+        """Get query for fetching ordered products of all the orders."""
+        return (
+            f"select {self.ORDERS_FIELDS} from ordered_products "
+            f"where order_id is not null order by order_id.id"
+        )
+
+
+coql_queries = COQLQueries()
@@ -0,0 +1,15 @@
+"""Module for 'orders' app crm entities handlers."""
+from services.coql_handlers import COQLHandler
+
+from .coql_queries import coql_queries as queries
+from .utils import formatters
+
+client_orders_handler = COQLHandler(
+    queries.get_client_orders_query,
+    (formatters.group_ordered_products,),
+)
+
+all_orders_handler = COQLHandler(
+    queries.get_all_orders_query,
+    (formatters.group_ordered_products,),
+)
@@ -0,0 +1,159 @@
+"""Background downscaling and uploading of the individual orders photos to Zoho CRM."""
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from orders.models import IndividualOrderPhoto
+from services.crm_interface import image_handler
+
+from .leased_queue import LeasedQueueProcessor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIDE = 1600
+
+
+def prepare_photo(source_path: str, media_root: str, max_side: int) -> str:
+    """
+    Downscale photo to fit the max side and re-encode it to progressive JPEG.
+
+    Runs inside a worker process, so it takes and returns only picklable values.
+    The source is replaced with the prepared file.
+    :param source_path: str Source file path relative to the media root.
+    :param media_root: str Absolute media root path.
+    :param max_side: int Max width and height of the prepared photo.
+
+    Returns prepared file path relative to the media root.
+    """
+    file_name = f"{os.path.splitext(source_path)[0]}.jpg"
+    absolute_source_path = os.path.join(media_root, source_path)
+    absolute_file_name = os.path.join(media_root, file_name)
+    with Image.open(absolute_source_path) as source:
+        photo = ImageOps.exif_transpose(source)
+        photo.thumbnail((max_side, max_side), Image.LANCZOS)
+        if photo.mode != "RGB":
+            photo = photo.convert("RGB")
+        temporary_file_name = f"{absolute_file_name}.{os.getpid()}.tmp"
+        photo.save(temporary_file_name, "JPEG", quality=85, optimize=True, progressive=True)
+    os.replace(temporary_file_name, absolute_file_name)
+    if absolute_source_path != absolute_file_name:
+        os.remove(absolute_source_path)
+    return file_name
+
+
+class IndividualOrderPhotoUploader(LeasedQueueProcessor):
+    """
+    Queues individual orders photos and uploads them to Zoho CRM.
+
+    The uploaded file is stored once: Django moves its temporary file into
+    the media directory. Photos are downscaled in a process pool and uploaded
+    by the worker command, claimed and retried as 'LeasedQueueProcessor' does.
+    """
+
+    model = IndividualOrderPhoto
+    max_attempts_setting = "INDIVIDUAL_ORDER_PHOTO_MAX_ATTEMPTS"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize uploader without starting the pool, it's created on first use."""
+        super().__init__(*args, **kwargs)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Get or create process pool for photos encoding."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_DERIVATIVES_WORKERS", None)
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shutdown process pool, waiting for the running encodings."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    async def queue(
+        module_api_name: str, record_id: int | str, photo: UploadedFile
+    ) -> IndividualOrderPhoto:
+        """
+        Store uploaded photo and queue it for uploading to the record.
+
+        :param module_api_name: str The API name of the Zoho CRM module.
+        :param record_id: int | str The identifier of the record.
+        :param photo: UploadedFile The uploaded photo.
+        """
+        order_photo = IndividualOrderPhoto(module_api_name=module_api_name, record_id=record_id)
+        await asyncio.to_thread(
+            order_photo.photo.save,
+            f"{module_api_name}/{record_id}/{os.path.basename(photo.name)}",
+            photo,
+            False,
+        )
+        await order_photo.asave()
+        return order_photo
+
+    async def upload(self, order_photo: IndividualOrderPhoto) -> bool:
+        """Downscale photo, if it isn't done yet, upload it and save the result."""
+        order_photo.attempts += 1
+        try:
+            if not order_photo.is_prepared:
+                order_photo.photo.name = await asyncio.get_running_loop().run_in_executor(
+                    self.executor,
+                    prepare_photo,
+                    order_photo.photo.name,
+                    str(settings.MEDIA_ROOT),
+                    getattr(settings, "INDIVIDUAL_ORDER_PHOTO_MAX_SIDE", DEFAULT_MAX_SIDE),
+                )
+                order_photo.is_prepared = True
+            content = await asyncio.to_thread(self.read_photo, order_photo)
+            await image_handler.upload_record_photo(
+                order_photo.module_api_name,
+                order_photo.record_id,
+                content,
+                os.path.basename(order_photo.photo.name),
+            )
+        except Exception as exc:
+            await self.record_failure(order_photo, exc, ["photo", "is_prepared"])
+            return False
+        order_photo.status = IndividualOrderPhoto.UPLOADED
+        order_photo.uploaded_at = timezone.now()
+        order_photo.last_error = ""
+        await order_photo.asave(
+            update_fields=[
+                "photo",
+                "is_prepared",
+                "attempts",
+                "last_error",
+                "status",
+                "uploaded_at",
+            ]
+        )
+        return True
+
+    @staticmethod
+    def read_photo(order_photo: IndividualOrderPhoto) -> bytes:
+        """Read prepared photo content."""
+        with order_photo.photo.open("rb") as photo:
+            return photo.read()
+
+    async def process(self, batch_size: int = 10) -> Dict[str, int]:
+        """
+        Upload photos due for an attempt.
+
+        Returns numbers of the uploaded and retried photos.
+        """
+        order_photos = await self.claim_due(batch_size)
+        results = await asyncio.gather(*(self.upload(photo) for photo in order_photos))
+        return {"uploaded": sum(results), "retried": len(results) - sum(results)}
+
+
+individual_order_photo_uploader = IndividualOrderPhotoUploader()
@@ -0,0 +1,106 @@
+"""Base of the background queues processed by the worker commands with retries."""
+import logging
+from datetime import timedelta
+from typing import Iterable, List, Optional, Type
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class LeasedQueueProcessor:
+    """
+    Processes queued model instances with retries.
+
+    Queued model has 'status' with PENDING and FAILED values, 'attempts',
+    'next_attempt_at' and 'last_error' fields. Instances are claimed by moving
+    their next attempt time forward by the lease, so several workers don't process
+    the same instance. Failed attempts are retried with exponential backoff,
+    the instance is marked as failed after the max attempts.
+
+    Attributes:
+        model (Type[models.Model]): Queued model.
+        max_attempts_setting (str): Setting with the max attempts.
+        default_max_attempts (int): Max attempts, if the setting isn't set.
+    """
+
+    model: Type[models.Model]
+    max_attempts_setting: str
+    default_max_attempts: int = 5
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        backoff: float = 30,
+        max_backoff: float = 3600,
+        lease: float = 300,
+    ) -> None:
+        """
+        Initialize processor.
+
+        :param max_attempts: int Attempts before the instance is marked as failed.
+        :param backoff: float Seconds before the first retry, doubled for every next one.
+        :param max_backoff: float Max seconds between retries.
+        :param lease: float Seconds the claimed instance isn't given to other workers.
+        """
+        self.max_attempts = max_attempts or getattr(
+            settings, self.max_attempts_setting, self.default_max_attempts
+        )
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+
+    async def claim(self, instance: models.Model) -> bool:
+        """Claim instance for processing, returns False if another worker did it first."""
+        claimed_till = timezone.now() + timedelta(seconds=self.lease)
+        claimed = await self.model.objects.filter(
+            id=instance.id,
+            status=self.model.PENDING,
+            next_attempt_at=instance.next_attempt_at,
+        ).aupdate(next_attempt_at=claimed_till)
+        instance.next_attempt_at = claimed_till
+        return bool(claimed)
+
+    async def claim_due(self, batch_size: int) -> List[models.Model]:
+        """
+        Claim instances due for an attempt, the longest waiting first.
+
+        :param batch_size: int Max number of the claimed instances.
+        """
+        due_instances = self.model.objects.filter(
+            status=self.model.PENDING, next_attempt_at__lte=timezone.now()
+        ).order_by("next_attempt_at")[:batch_size]
+        return [
+            instance
+            for instance in [instance async for instance in due_instances]
+            if await self.claim(instance)
+        ]
+
+    async def record_failure(
+        self, instance: models.Model, error: BaseException, update_fields: Iterable[str] = ()
+    ) -> None:
+        """
+        Schedule the retry of the failed attempt or mark the instance as failed.
+
+        :param instance: Model The instance, which attempt has failed.
+        :param error: BaseException The error of the attempt.
+        :param update_fields: Iterable[str] Other fields changed by the attempt.
+        """
+        instance.last_error = repr(error)
+        if instance.attempts >= self.max_attempts:
+            instance.status = self.model.FAILED
+            logger.error("%s failed after %d attempts: %r", instance, instance.attempts, error)
+        else:
+            delay = min(self.backoff * 2 ** (instance.attempts - 1), self.max_backoff)
+            instance.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        await instance.asave(
+            update_fields=[
+                "attempts",
+                "last_error",
+                "status",
+                "next_attempt_at",
+                *update_fields,
+            ]
+        )
@@ -0,0 +1,207 @@
+"""Queued customer notifications sent by SMS and email in background."""
+import asyncio
+import logging
+import os
+import smtplib
+from typing import Any, Dict, Optional
+
+import httpx
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from orders.models import Notification
+
+from .leased_queue import LeasedQueueProcessor
+
+logger = logging.getLogger(__name__)
+
+TWILIO_MESSAGES_URL = "https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+
+
+class NotificationQueue:
+    """Puts notifications into the queue, so views don't wait for them to be sent."""
+
+    @staticmethod
+    async def enqueue(
+        channel: str, recipient: str, body: str, subject: str = ""
+    ) -> Notification:
+        """
+        Queue notification.
+
+        :param channel: str Notification.SMS or Notification.EMAIL.
+        :param recipient: str Phone number or email address.
+        :param body: str Message text.
+        :param subject: str Email subject.
+        """
+        return await Notification.objects.acreate(
+            channel=channel, recipient=recipient, subject=subject, body=body
+        )
+
+    async def enqueue_order_confirmation(
+        self,
+        customer_phone_number: str,
+        order_number: str,
+        order_grand_total: Any,
+        order_currency: dict[str, Any],
+        customer_email: str | None = None,
+    ) -> None:
+        """
+        Queue SMS and, if the email is known, email about the created order.
+
+        :param customer_phone_number: str The customer's phone number.
+        :param order_number: str The order number.
+        :param order_grand_total: The total amount of the order.
+        :param order_currency: dict The order currency.
+        :param customer_email: str | None The customer's email address.
+        """
+        body = (
+            f"Приветствуем! Вы успешно оплатили заказ {order_number} на сумму "
+            f"{order_grand_total}{order_currency.get('symbol')} на BonnyFlowers."
+        )
+        await self.enqueue(Notification.SMS, customer_phone_number, body)
+        if customer_email:
+            await self.enqueue(
+                Notification.EMAIL,
+                customer_email,
+                body,
+                subject=f"Подтверждение заказа {order_number} в BonnyFlowers",
+            )
+
+
+notification_queue = NotificationQueue()
+
+
+class NotificationDispatcher(LeasedQueueProcessor):
+    """
+    Sends queued notifications with retries.
+
+    Dispatcher keeps one SMTP connection and one HTTP client for the SMS
+    provider open between batches, so every message doesn't pay for
+    the connection setup. Notifications are claimed and retried
+    as 'LeasedQueueProcessor' does.
+    """
+
+    model = Notification
+    max_attempts_setting = "NOTIFICATIONS_MAX_ATTEMPTS"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize dispatcher, connections are opened on first use."""
+        super().__init__(*args, **kwargs)
+        self._email_connection: Optional[BaseEmailBackend] = None
+        self._sms_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def email_connection(self) -> BaseEmailBackend:
+        """Get or create the email connection, it's opened when the first email is sent."""
+        if self._email_connection is None:
+            self._email_connection = get_connection()
+        return self._email_connection
+
+    @property
+    def sms_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client for the SMS provider API."""
+        if self._sms_client is None:
+            self._sms_client = httpx.AsyncClient(
+                auth=(os.getenv("TWILIO_ACCOUNT_SID", ""), os.getenv("TWILIO_AUTH_TOKEN", "")),
+                timeout=10,
+            )
+        return self._sms_client
+
+    async def close(self) -> None:
+        """Close the connections."""
+        if self._email_connection is not None:
+            await asyncio.to_thread(self._email_connection.close)
+            self._email_connection = None
+        if self._sms_client is not None:
+            await self._sms_client.aclose()
+            self._sms_client = None
+
+    def send_emails(self, notifications: list[Notification]) -> list[Optional[Exception]]:
+        """
+        Send emails through the kept open connection, returns errors of the emails.
+
+        Runs in a worker thread, as SMTP client is blocking. Connection is reopened
+        once, if the server has dropped it since the previous batch.
+        """
+        connection = self.email_connection
+        errors: list[Optional[Exception]] = []
+        for notification in notifications:
+            message = EmailMessage(
+                notification.subject, notification.body, to=[notification.recipient]
+            )
+            try:
+                try:
+                    connection.open()
+                    connection.send_messages([message])
+                except smtplib.SMTPServerDisconnected:
+                    connection.close()
+                    connection.open()
+                    connection.send_messages([message])
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+        return errors
+
+    async def send_sms(self, notification: Notification) -> str:
+        """Send SMS by the provider API, returns id of the message."""
+        response = await self.sms_client.post(
+            TWILIO_MESSAGES_URL.format(account_sid=os.getenv("TWILIO_ACCOUNT_SID", "")),
+            data={
+                "To": notification.recipient,
+                "From": os.getenv("TWILIO_PHONE_NUMBER", ""),
+                "Body": notification.body,
+            },
+        )
+        response.raise_for_status()
+        return response.json()["sid"]
+
+    async def record_result(
+        self,
+        notification: Notification,
+        error: Optional[BaseException],
+        provider_id: str = "",
+    ) -> bool:
+        """Save the result of the sending attempt, returns True if notification is sent."""
+        notification.attempts += 1
+        if error is not None:
+            await self.record_failure(notification, error)
+            return False
+        notification.status = Notification.SENT
+        notification.provider_id = provider_id
+        notification.sent_at = timezone.now()
+        notification.last_error = ""
+        await notification.asave(
+            update_fields=["attempts", "status", "provider_id", "sent_at", "last_error"]
+        )
+        return True
+
+    async def process(self, batch_size: int = 50) -> Dict[str, int]:
+        """
+        Send notifications due for an attempt.
+
+        Emails of the batch are sent through one connection, SMS concurrently.
+        Returns numbers of the sent and retried notifications.
+        """
+        notifications = await self.claim_due(batch_size)
+        emails = [n for n in notifications if n.channel == Notification.EMAIL]
+        messages = [n for n in notifications if n.channel == Notification.SMS]
+        emails_errors = await asyncio.to_thread(self.send_emails, emails) if emails else []
+        sms_results = await asyncio.gather(
+            *(self.send_sms(notification) for notification in messages),
+            return_exceptions=True,
+        )
+        results = [
+            await self.record_result(notification, error)
+            for notification, error in zip(emails, emails_errors)
+        ]
+        for notification, result in zip(messages, sms_results):
+            if isinstance(result, BaseException):
+                results.append(await self.record_result(notification, result))
+            else:
+                results.append(await self.record_result(notification, None, result))
+        return {"sent": sum(results), "retried": len(results) - sum(results)}
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,80 @@
+"""Submission of the outbox orders to Zoho CRM."""
+import asyncio
+import logging
+from typing import Dict
+
+from django.utils import timezone
+
+from orders.models import OrderOutbox
+
+from .leased_queue import LeasedQueueProcessor
+from .notifications import notification_queue
+from .orders_handlers import order_handlers
+
+logger = logging.getLogger(__name__)
+
+
+class OrderOutboxProcessor(LeasedQueueProcessor):
+    """
+    Creates outbox orders in Zoho CRM with retries.
+
+    Orders are claimed and retried as 'LeasedQueueProcessor' does. Order number
+    is the idempotency key: before creating the record Zoho CRM is asked for
+    the order with the same number, so an order submitted by an interrupted
+    attempt isn't created twice.
+    The customer is notified about the order once it's created.
+    """
+
+    model = OrderOutbox
+    max_attempts_setting = "ORDER_OUTBOX_MAX_ATTEMPTS"
+    default_max_attempts = 8
+
+    async def submit(self, order: OrderOutbox) -> bool:
+        """
+        Create order in Zoho CRM and save the result.
+
+        Returns True if the order is created (now or by one of the previous attempts).
+        """
+        order.attempts += 1
+        try:
+            zoho_id = await order_handlers.find_order_id(order.order_number)
+            if zoho_id is None:
+                zoho_id = await order_handlers.create_order_record(order.record)
+        except Exception as exc:
+            await self.record_failure(order, exc)
+            return False
+        order.status = OrderOutbox.SUBMITTED
+        order.zoho_id = zoho_id
+        order.submitted_at = timezone.now()
+        order.last_error = ""
+        await order.asave(
+            update_fields=["attempts", "last_error", "status", "zoho_id", "submitted_at"]
+        )
+        await self.send_confirmation(order)
+        return True
+
+    @staticmethod
+    async def send_confirmation(order: OrderOutbox) -> None:
+        """Queue confirmation of the created order to the customer contacts from the payload."""
+        if not (confirmation := order.payload.get("confirmation")):
+            return
+        await notification_queue.enqueue_order_confirmation(
+            confirmation["phone_number"],
+            order.order_number,
+            order.grand_total,
+            {"symbol": confirmation.get("currency_symbol")},
+            confirmation.get("email"),
+        )
+
+    async def process(self, batch_size: int = 20) -> Dict[str, int]:
+        """
+        Submit orders due for an attempt.
+
+        Returns numbers of the submitted and retried orders.
+        """
+        orders = await self.claim_due(batch_size)
+        results = await asyncio.gather(*(self.submit(order) for order in orders))
+        return {"submitted": sum(results), "retried": len(results) - sum(results)}
+
+
+order_outbox_processor = OrderOutboxProcessor()
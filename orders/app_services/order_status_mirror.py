@@ -0,0 +1,94 @@
+"""Local mirror of the Zoho CRM orders shown to customers."""
+from decimal import Decimal
+from typing import Any
+
+from orders.models import OrderStatusMirror
+from services.db import db_pool
+
+from .crm_entities_handlers import all_orders_handler
+from .orders_handlers import order_handlers
+
+
+class OrderStatusMirrorHandlers:
+    """
+    Reads customer orders from the local mirror.
+
+    The mirror is filled by the backfill command and by the orders fetched
+    from Zoho CRM, statuses are updated by Zoho CRM workflow webhook.
+    Zoho CRM is requested only for the orders absent in the mirror.
+    """
+
+    @staticmethod
+    def to_order(mirror: OrderStatusMirror) -> dict[str, Any]:
+        """Get order dict, the same as fetched from Zoho CRM, from the mirror record."""
+        return {
+            "id": mirror.zoho_id,
+            "number": mirror.order_number,
+            "target_delivery_date": mirror.target_delivery_date,
+            "grand_total": mirror.grand_total,
+            "status": mirror.status,
+            "currency_id": mirror.currency_id,
+            "products": mirror.products,
+        }
+
+    @staticmethod
+    def get_defaults(order: dict[str, Any]) -> dict[str, Any]:
+        """Get mirror record fields from the order fetched from Zoho CRM."""
+        return {
+            "order_number": order["number"],
+            "status": order["status"],
+            "target_delivery_date": order["target_delivery_date"] or "",
+            "grand_total": Decimal(str(order["grand_total"] or 0)),
+            "currency_id": order["currency_id"] or "",
+            "products": order["products"],
+        }
+
+    async def get_client_orders(self, orders_id_list: list[str]) -> list[dict[str, Any]]:
+        """
+        Get orders in the order of their ids, orders absent in Zoho CRM are skipped.
+
+        :param orders_id_list: list[str] Zoho CRM orders ids.
+        """
+        orders = {
+            mirror.zoho_id: self.to_order(mirror)
+            for mirror in await db_pool.fetch(
+                OrderStatusMirror.objects.filter(zoho_id__in=orders_id_list)
+            )
+        }
+        if missing_ids := [order_id for order_id in orders_id_list if order_id not in orders]:
+            for order in await order_handlers.get_client_orders(missing_ids):
+                await self.store_order(order)
+                orders[order["id"]] = order
+        return [orders[order_id] for order_id in orders_id_list if order_id in orders]
+
+    async def store_order(self, order: dict[str, Any]) -> None:
+        """Create or update the mirror record of the order fetched from Zoho CRM."""
+        await db_pool.run(
+            OrderStatusMirror.objects.update_or_create,
+            zoho_id=order["id"],
+            defaults=self.get_defaults(order),
+        )
+
+    @staticmethod
+    async def update_status(zoho_id: str, status: str) -> bool:
+        """
+        Update status of the mirrored order.
+
+        Returns False if the order isn't mirrored yet, it's mirrored with
+        the actual status, when the customer requests it.
+        """
+        return bool(
+            await db_pool.run(
+                OrderStatusMirror.objects.filter(zoho_id=zoho_id).update, status=status
+            )
+        )
+
+    async def backfill(self) -> int:
+        """Mirror all Zoho CRM orders, returns number of the mirrored orders."""
+        orders = await all_orders_handler.fetch_instances()
+        for order in orders:
+            await self.store_order(order)
+        return len(orders)
+
+
+order_status_mirror_handlers = OrderStatusMirrorHandlers()
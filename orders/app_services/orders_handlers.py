@@ -1,19 +1,26 @@
 """Orders handlers."""
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+import hashlib
+from datetime import date
 from typing import Any, Union
 
 import httpx
+from django.core.cache import cache
 from dotenv import load_dotenv
-from zcrmsdk.src.com.zoho.crm.api import Initializer
 from zcrmsdk.src.com.zoho.crm.api.record import Record
 from zcrmsdk.src.com.zoho.crm.api.util import APIHTTPConnector, Choice
 
+from cart.app_services.cart import Cart
+from cart.app_services.pricing import CartPricing, pricing_engine
 from config.constants import Constants
-from products.app_services.data_getters import crm_data as products_crm_data
-from services.crm_interface import custom_record_operations
-from services.data_getters import crm_data
+from orders.models import OrderOutbox
+from services.crm_interface import coql_query_executor, custom_record_operations
+from services.db import db_pool
+from services.http_clients import http_clients
+from zoho_token.utils import zoho_init
+
+from .crm_entities_handlers import client_orders_handler
+from .individual_order_photos import individual_order_photo_uploader
 
 load_dotenv()
 
@@ -39,7 +46,8 @@ class IndividualOrderHandlers:
             customer_phone_number (str): Customer's phone number.
             min_budget (float): Minimum budget for the order.
             max_budget (float): Maximum budget for the order.
-            photo: Optional photo data for the order.
+            photo: Optional uploaded photo for the order, it's queued and uploaded
+                to the record in background.
 
         Returns:
             object: The created individual order record.
@@ -64,13 +72,15 @@ class IndividualOrderHandlers:
         data["customer_phone_number"] = customer_phone_number
         data["budget_from"] = min_budget
         data["budget_to"] = max_budget
-        return await custom_record_operations.create_records(
+        record_id = await custom_record_operations.create_records(
             "individual_orders",
             [
                 data,
             ],
-            photo,
         )
+        if record_id and photo:
+            await individual_order_photo_uploader.queue("individual_orders", record_id, photo)
+        return record_id
 
 
 individual_order_handlers = IndividualOrderHandlers()
@@ -144,46 +154,51 @@ class OrderHandlers:
         Example:
             products = await self.get_not_existent_products(["id1", "id2"])
         """
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
 
         coroutines = []
-        async with httpx.AsyncClient(
-            headers=self.connector.headers,
-            base_url="https://www.zohoapis.eu/crm/v5/products_base/",
-        ) as client:
+        async with http_clients.client("zoho") as client:
             for product_id in products_id_list:
-                coroutines.append(self.__get_not_existent_product(client, product_id))
+                coroutines.append(
+                    self.__get_not_existent_product(client, self.connector.headers, product_id)
+                )
             result = await asyncio.gather(*coroutines)
         return {i for i in result if i is not None}
 
     @staticmethod
     async def __get_not_existent_product(
-        client: httpx.AsyncClient, product_id: str
+        client: httpx.AsyncClient, headers: dict[str, str], product_id: str
     ) -> str | None:
         """
         Check if a product exists asynchronously.
 
         Args:
             client (httpx.AsyncClient): An instance of httpx.AsyncClient.
+            headers (dict[str, str]): Zoho CRM authorization headers.
             product_id (str): The ID of the product to check.
 
         Returns:
             Union[str, None]: The product ID if it does not exist, otherwise None.
         """
-        response = await client.get(product_id)
+        response = await client.get(
+            f"https://www.zohoapis.eu/crm/v5/products_base/{product_id}", headers=headers
+        )
         if response.status_code == 204:
             return product_id
 
     async def create_order(
         self,
-        cart_products: list[str],
+        cart: Cart,
         order_number: str,
         region_slug: str,
         selected_currency: dict[str, Any],
-        order_data: dict[str, datetime.date | Any],
-    ) -> dict[str, Any]:
-        """To create an order based on provided customer and delivery information.
+        order_data: dict[str, date | Any],
+        pricing: CartPricing | None = None,
+    ) -> OrderOutbox:
+        """To put an order based on provided customer and delivery information into outbox.
+
+        The order is priced and stored locally, it's created in Zoho CRM later by
+        the 'process_order_outbox' command, so checkout doesn't wait for Zoho CRM.
 
         Args:
             *args: Variable-length argument list.
@@ -206,7 +221,7 @@ class OrderHandlers:
                 - postcard (str): The content of the postcard (optional).
 
         Returns:
-            dict[str, Any]: This method returns base order data after creation.
+            OrderOutbox: The stored order.
 
         Example:
             OrderHandlers.create_order(
@@ -250,140 +265,114 @@ class OrderHandlers:
                 data["delivery_building"] = address["building"]
             data["delivery_appartment"] = order_data["flat"]
         data["valentine"] = order_data["postcard"]
-        region_products = await crm_data.get_region_products(
-            region_slug, currency=selected_currency, cart_ids_set=None
-        )
-        created_order_json = await self.create_order_record(
-            data, cart_products, region_products, selected_currency
+        if pricing is None:
+            pricing = await pricing_engine.price_cart(cart, region_slug, selected_currency)
+        data["ordered_products"] = [
+            {
+                "product_id": line.product_id,
+                "amount": line.amount,
+                "size": line.size,
+                "price": float(line.price),
+            }
+            for line in pricing.lines
+        ]
+        data["order_currency_id"] = selected_currency["id"]
+        data["confirmation"] = {
+            "phone_number": order_data["customer_phone_number"],
+            "email": order_data.get("customer_email"),
+            "currency_symbol": selected_currency.get("symbol"),
+        }
+        return await db_pool.run(
+            OrderOutbox.objects.create,
+            order_number=order_number,
+            region_slug=region_slug,
+            payload=data,
+            grand_total=pricing.grand_total,
         )
-        return created_order_json
 
-    async def create_order_record(
-        self,
-        order_data: dict[str, Any],
-        cart_products: list[dict[str, Any]],
-        region_products: list[dict[str, Any]],
-        selected_currency: dict[str, Any],
-    ) -> dict[str, Any]:
+    async def create_order_record(self, payload: dict[str, Any]) -> str:
         """
-        Create an order record asynchronously.
+        Create an order record in Zoho CRM.
 
         Args:
-            order_data (Dict[str, Any]): Information about the order.
-            cart_products (Dict[str, Any]): Products in the shopping cart.
+            payload (Dict[str, Any]): Order record data with the ordered products.
 
         Returns:
-            Dict[str, Any]: Information about the created order.
+            str: Id of the created record.
 
-        Example:
-            order_data = {...}  # Your order data
-            cart_products = {...}  # Your cart products
-            result = await create_order_record(order_data, cart_products)
+        Raises:
+            httpx.HTTPError: If the request fails or Zoho CRM doesn't create the record.
         """
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
-        async with httpx.AsyncClient(headers=self.connector.headers) as client:
-            json_data = {
-                "data": [
-                    order_data,
-                ]
-            }
-            json_data["data"][0]["ordered_products"] = []
-            grand_total = 0.0
-            for product in cart_products:
-                if region_product := next(
-                    filter(lambda x: x["id"] == product["id"], region_products), None
-                ):
-                    if region_product["category_slug"] == "bouquets" and product.get("size"):
-                        region_product.update(
-                            await products_crm_data.get_product_bouquet_data(
-                                region_product["id"],
-                                currency=selected_currency,
-                                discount=region_product["discount"],
-                            )
-                        )
-                        for size_record in region_product["bouquet_sizes"]:
-                            if size_record["value"] == product.get("size"):
-                                bouquet_size_price = size_record[
-                                    "price"
-                                ]  # TODO: delete deprecated bouquet size
-                                json_data["data"][0]["ordered_products"].append(
-                                    {
-                                        "product_id": product["id"],
-                                        "amount": product["amount"],
-                                        "size": product.get("size"),
-                                        "price": bouquet_size_price,
-                                    }
-                                )
-                                grand_total += bouquet_size_price
-                                break
-                    else:
-                        price = (
-                            region_product.get("new_price")
-                            if region_product.get("discount")
-                            else region_product["unit_price"]
-                        )
-                        json_data["data"][0]["ordered_products"].append(
-                            {
-                                "product_id": product["id"],
-                                "amount": product["amount"],
-                                "size": product.get("size"),
-                                "price": price,
-                            }
-                        )
-                        grand_total += price
-            json_data["data"][0]["order_currency_id"] = selected_currency["id"]
-            created_order_response = await client.post(
-                url="https://www.zohoapis.eu/crm/v5/orders", json=json_data
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
+        async with http_clients.client("zoho") as client:
+            response = await client.post(
+                url="https://www.zohoapis.eu/crm/v5/orders",
+                json={"data": [payload]},
+                headers=self.connector.headers,
             )
-            created_order_json = created_order_response.json()
-            created_order_json["data"][0]["grand_total"] = grand_total
-            return created_order_json
+        response.raise_for_status()
+        result = response.json()["data"][0]
+        if result.get("status") != "success":
+            raise httpx.HTTPError(f"Order record isn't created: {result}")
+        return result["details"]["id"]
 
-    async def get_client_orders(self, orders_id_list: list[str]):
+    @staticmethod
+    async def find_order_id(order_number: str) -> str | None:
         """
-        Retrieve order records for the specified order IDs.
+        Find id of the Zoho CRM order record by its number.
 
         Args:
-            orders_id_list (List[str]): A list of order IDs to retrieve records for.
+            order_number (str): The order number.
 
         Returns:
-            List[Optional[OrderRecord]]: A list of order records. If a record is not found for
-            a particular order ID, the corresponding element in the list will be None.
-
-        This asynchronous method retrieves order records for the provided list of order IDs.
-        It utilizes an AsyncClient to make asynchronous HTTP requests to the Zoho CRM API
-        for each order ID. The method returns a list of order records, and any order ID
-        without a corresponding record will have a None value in the result list.
+            str | None: Id of the record, None if there is no such order.
         """
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
-
-        coroutines = []
-        async with httpx.AsyncClient(
-            headers=self.connector.headers,
-            base_url="https://www.zohoapis.eu/crm/v5/orders/",
-        ) as client:
-            for order_id in orders_id_list:
-                coroutines.append(self.__get_order_record(client, order_id))
-            result = await asyncio.gather(*coroutines)
-            return [i for i in result if i is not None]
+        orders = await coql_query_executor.fetch_data(
+            f"select id from orders where order_number = '{order_number}'", lim=1
+        )
+        return orders[0]["id"] if orders else None
 
     @staticmethod
-    async def __get_order_record(client: httpx.AsyncClient, order_id: str) -> str | None:
+    async def get_client_orders(orders_id_list: list[str]) -> list[dict[str, Any]]:
         """
-        Check if a product exists asynchronously.
+        Retrieve orders with their ordered products for the specified order IDs.
 
         Args:
-            client (httpx.AsyncClient): An instance of httpx.AsyncClient.
-            product_id (str): The ID of the product to check.
+            orders_id_list (List[str]): A list of order IDs to retrieve orders for.
 
         Returns:
-            Union[str, None]: The product ID if it does not exist, otherwise None.
+            List[dict]: Orders in the order of their IDs, orders absent in the ZohoCRM
+            are skipped.
+
+        Orders are fetched by one COQL query per CLIENT_ORDERS_CHUNK IDs and cached
+        under the key made of all the IDs, so the key changes when the client creates
+        a new order.
         """
-        response = await client.get(order_id)
-        if response.status_code == 200:
-            return response.json()
+        if not orders_id_list:
+            return []
+        cache_key = (
+            "client_orders_" + hashlib.sha1(",".join(orders_id_list).encode()).hexdigest()
+        )
+        if (orders := await cache.aget(cache_key)) is not None:
+            return orders
+        chunk = Constants.CLIENT_ORDERS_CHUNK
+        fetched_orders = {
+            order["id"]: order
+            for chunk_orders in await asyncio.gather(
+                *(
+                    client_orders_handler.fetch_instances(orders_id_list[index : index + chunk])
+                    for index in range(0, len(orders_id_list), chunk)
+                )
+            )
+            for order in chunk_orders
+        }
+        orders = [
+            fetched_orders[order_id]
+            for order_id in orders_id_list
+            if order_id in fetched_orders
+        ]
+        await cache.aset(cache_key, orders, Constants.CLIENT_ORDERS_CACHE_TIMEOUT)
+        return orders
 
 
 order_handlers = OrderHandlers()
@@ -0,0 +1,42 @@
+"""Formatters for 'orders' app."""
+from typing import Any
+
+
+class Formatters:
+    """Class with methods for formatting dicts."""
+
+    @staticmethod
+    def group_ordered_products(
+        ordered_products: list[dict[str, Any]], **kwargs: Any
+    ) -> list[dict[str, Any]]:
+        """
+        Group ordered products rows by their orders.
+
+        :param ordered_products: list[dict] Ordered products with their orders fields.
+        """
+        orders: dict[str, dict[str, Any]] = {}
+        for ordered_product in ordered_products:
+            order_id = ordered_product["order_id.id"]
+            if (order := orders.get(order_id)) is None:
+                currency = ordered_product["order_id.order_currency_id"] or {}
+                order = orders[order_id] = {
+                    "id": order_id,
+                    "number": ordered_product["order_id.order_number"],
+                    "target_delivery_date": ordered_product["order_id.target_delivery_date"],
+                    "grand_total": ordered_product["order_id.grand_total"],
+                    "status": ordered_product["order_id.order_status"],
+                    "currency_id": currency.get("id"),
+                    "products": [],
+                }
+            order["products"].append(
+                {
+                    "sku": ordered_product["sku"],
+                    "name": ordered_product["product_id.Name"],
+                    "amount": ordered_product["amount"],
+                    "price": ordered_product["price"],
+                }
+            )
+        return list(orders.values())
+
+
+formatters = Formatters()
@@ -0,0 +1,21 @@
+"""Command for filling the local mirror of the Zoho CRM orders."""
+import asyncio
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from orders.app_services.order_status_mirror import order_status_mirror_handlers
+
+
+class Command(BaseCommand):
+    """Mirror all Zoho CRM orders locally."""
+
+    help = (
+        "Fetch all orders with their ordered products from Zoho CRM and store them "
+        "in the local mirror, which is kept up to date by the order status webhook."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run backfill."""
+        mirrored = asyncio.run(order_status_mirror_handlers.backfill())
+        self.stdout.write(self.style.SUCCESS(f"Mirrored {mirrored} orders."))
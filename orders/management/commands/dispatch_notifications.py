@@ -0,0 +1,53 @@
+"""Command for sending the queued customer notifications."""
+import asyncio
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.app_services.notifications import notification_dispatcher
+
+
+class Command(BaseCommand):
+    """Send the queued SMS and email notifications."""
+
+    help = (
+        "Send the queued customer notifications, keeping SMTP connection and SMS "
+        "provider client open between batches, and retry the failed ones."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Max number of notifications sent at once.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat sending every given seconds amount instead of a single run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Send notifications once or periodically."""
+        asyncio.run(self.dispatch(options["batch_size"], options["interval"]))
+
+    async def dispatch(self, batch_size: int, interval: int) -> None:
+        """Send notifications in one event loop, so the connections are reused."""
+        try:
+            while True:
+                results = await notification_dispatcher.process(batch_size)
+                if results["sent"] or results["retried"] or not interval:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Sent {results['sent']} notifications, "
+                            f"{results['retried']} notifications will be retried."
+                        )
+                    )
+                if not interval:
+                    break
+                await asyncio.sleep(interval)
+        finally:
+            await notification_dispatcher.close()
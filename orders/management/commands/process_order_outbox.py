@@ -0,0 +1,47 @@
+"""Command for submitting the outbox orders to Zoho CRM."""
+import asyncio
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.app_services.order_outbox import order_outbox_processor
+
+
+class Command(BaseCommand):
+    """Create the checkout orders, waiting in the outbox, in Zoho CRM."""
+
+    help = (
+        "Create the pending checkout orders in Zoho CRM, retrying the failed ones "
+        "with growing delays."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Max number of orders submitted at once.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat submission every given seconds amount instead of a single run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Submit orders once or periodically."""
+        while True:
+            results = asyncio.run(order_outbox_processor.process(options["batch_size"]))
+            if results["submitted"] or results["retried"] or not options["interval"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Submitted {results['submitted']} orders, "
+                        f"{results['retried']} orders will be retried."
+                    )
+                )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,52 @@
+"""Command for uploading the queued individual orders photos to Zoho CRM."""
+import asyncio
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.app_services.individual_order_photos import individual_order_photo_uploader
+
+
+class Command(BaseCommand):
+    """Downscale the queued individual orders photos and upload them to Zoho CRM."""
+
+    help = (
+        "Downscale the queued individual orders photos in a process pool and upload "
+        "them to their Zoho CRM records, retrying the failed ones."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Max number of photos uploaded at once.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat uploading every given seconds amount instead of a single run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Upload photos once or periodically."""
+        try:
+            while True:
+                results = asyncio.run(
+                    individual_order_photo_uploader.process(options["batch_size"])
+                )
+                if results["uploaded"] or results["retried"] or not options["interval"]:
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Uploaded {results['uploaded']} photos, "
+                            f"{results['retried']} photos will be retried."
+                        )
+                    )
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            individual_order_photo_uploader.shutdown()
@@ -0,0 +1,261 @@
+"""Models for 'orders' app."""
+
+from django.db import models
+from django.utils import timezone
+
+
+class OrderOutbox(models.Model):
+    """Model for storing checkout orders until they are created in Zoho CRM."""
+
+    PENDING = "pending"
+    SUBMITTED = "submitted"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Ожидает отправки"),
+        (SUBMITTED, "Создан в Zoho CRM"),
+        (FAILED, "Не удалось создать"),
+    )
+
+    order_number = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name="Номер заказа",
+    )
+    region_slug = models.CharField(
+        max_length=100,
+        verbose_name="Регион",
+    )
+    payload = models.JSONField(verbose_name="Данные заказа для Zoho CRM")
+    grand_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name="Сумма заказа",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Количество попыток",
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Дата следующей попытки",
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Последняя ошибка",
+    )
+    zoho_id = models.CharField(
+        max_length=30,
+        blank=True,
+        verbose_name="Id заказа в Zoho CRM",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+    submitted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Дата создания в Zoho CRM",
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    @property
+    def record(self) -> dict:
+        """Get data of the Zoho CRM record, without the customer confirmation contacts."""
+        return {key: value for key, value in self.payload.items() if key != "confirmation"}
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.order_number} {self.status}"
+
+
+class OrderStatusMirror(models.Model):
+    """Model for storing Zoho CRM orders shown to customers, kept up to date by webhooks."""
+
+    zoho_id = models.CharField(
+        max_length=30,
+        unique=True,
+        verbose_name="Id заказа в Zoho CRM",
+    )
+    order_number = models.CharField(
+        max_length=64,
+        verbose_name="Номер заказа",
+    )
+    status = models.CharField(
+        max_length=50,
+        verbose_name="Статус",
+    )
+    target_delivery_date = models.CharField(
+        max_length=10,
+        blank=True,
+        verbose_name="Дата доставки",
+    )
+    grand_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name="Сумма заказа",
+    )
+    currency_id = models.CharField(
+        max_length=30,
+        blank=True,
+        verbose_name="Id валюты в Zoho CRM",
+    )
+    products = models.JSONField(
+        default=list,
+        verbose_name="Заказанные продукты",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата обновления",
+    )
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.order_number} {self.status}"
+
+
+class Notification(models.Model):
+    """Model for storing customer notifications until they are sent."""
+
+    SMS = "sms"
+    EMAIL = "email"
+    CHANNELS = (
+        (SMS, "SMS"),
+        (EMAIL, "Email"),
+    )
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Ожидает отправки"),
+        (SENT, "Отправлено"),
+        (FAILED, "Не удалось отправить"),
+    )
+
+    channel = models.CharField(
+        max_length=10,
+        choices=CHANNELS,
+        verbose_name="Канал",
+    )
+    recipient = models.CharField(
+        max_length=254,
+        verbose_name="Получатель",
+    )
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Тема",
+    )
+    body = models.TextField(verbose_name="Текст")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Количество попыток",
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Дата следующей попытки",
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Последняя ошибка",
+    )
+    provider_id = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name="Id сообщения у провайдера",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Дата отправки",
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.channel} {self.recipient} {self.status}"
+
+
+class IndividualOrderPhoto(models.Model):
+    """Model for storing individual orders photos until they are uploaded to Zoho CRM."""
+
+    PENDING = "pending"
+    UPLOADED = "uploaded"
+    FAILED = "failed"
+    STATUSES = (
+        (PENDING, "Ожидает загрузки"),
+        (UPLOADED, "Загружено в Zoho CRM"),
+        (FAILED, "Не удалось загрузить"),
+    )
+
+    module_api_name = models.CharField(
+        max_length=100,
+        verbose_name="Модуль Zoho CRM",
+    )
+    record_id = models.CharField(
+        max_length=30,
+        verbose_name="Id записи в Zoho CRM",
+    )
+    photo = models.FileField(
+        upload_to="individual_orders/",
+        max_length=255,
+        verbose_name="Фото",
+    )
+    is_prepared = models.BooleanField(
+        default=False,
+        verbose_name="Уменьшено",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Количество попыток",
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Дата следующей попытки",
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Последняя ошибка",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+    uploaded_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Дата загрузки",
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.module_api_name} {self.record_id} {self.status}"
@@ -1,7 +1,13 @@
 """Orders urls."""
 from django.urls import path
 
-from .views import CheckoutView, IndividualOrders, OrdersList, QuickOrders
+from .views import (
+    CheckoutView,
+    IndividualOrders,
+    OrdersList,
+    OrderStatusWebhook,
+    QuickOrders,
+)
 
 app_name = "orders"
 
@@ -18,4 +24,9 @@ urlpatterns = [
     ),
     path("<slug:region_slug>/checkout/", CheckoutView.as_view(), name="checkout"),
     path("<slug:region_slug>/orders/", OrdersList.as_view(), name="orders-list"),
+    path(
+        "webhooks/order-status/",
+        OrderStatusWebhook.as_view(),
+        name="order-status-webhook",
+    ),
 ]
@@ -1,16 +1,17 @@
 """Orders views."""
 
+import hmac
 import json
-import os
 from enum import Enum
 from typing import Any, Union
 from uuid import uuid4
 
-from django.core.mail import send_mail
+from django.conf import settings
 from django.http import (
     HttpRequest,
     HttpResponse,
     HttpResponseBadRequest,
+    HttpResponseForbidden,
     HttpResponseRedirect,
     HttpResponseServerError,
     JsonResponse,
@@ -20,13 +21,12 @@ from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views import View
-from django.views.decorators.csrf import csrf_protect
-from twilio.http.async_http_client import AsyncTwilioHttpClient
-from twilio.rest import Client
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 
 from async_forms.async_forms import AsyncForm, AsyncModelForm
 from async_views.generic.base import AsyncTemplateView
 from async_views.generic.edit import AsyncFormView
+from cart.app_services.pricing import pricing_engine
 from cart.app_services.session_data import session_data
 from cart.app_services.utils import formatters as cart_formatters
 from orders.forms import AsyncCheckoutForm
@@ -35,6 +35,7 @@ from services.data_getters import crm_data
 from services.mixins import ApplicationMixin
 from services.utils import utilities
 
+from .app_services.order_status_mirror import order_status_mirror_handlers
 from .app_services.orders_handlers import (
     individual_order_handlers,
     order_handlers,
@@ -243,12 +244,14 @@ class CheckoutView(AsyncFormView, ApplicationMixin):
         )
         if isinstance(context, HttpResponseServerError):
             return context
+        cart = await session_data.get_or_create_cart(self.request.session)
         context["cart_products"] = cart_products = await common_handlers.get_cart_products(
-            context["region"]["slug"],
-            await session_data.get_or_create_cart(self.request.session),
-            context["selected_currency"],
+            context["region"]["slug"], cart, context["selected_currency"]
         )
-        context["cart_grand_total_price"] = self.calculate_cart_grand_total(cart_products)
+        context["cart_pricing"] = pricing = await pricing_engine.price_cart(
+            cart, context["region"]["slug"], context["selected_currency"]
+        )
+        context["cart_grand_total_price"] = pricing.grand_total
         await self.update_context_with_suggested_products(context, cart_products)
         return context
 
@@ -260,37 +263,17 @@ class CheckoutView(AsyncFormView, ApplicationMixin):
             context (dict): The context dictionary.
         """
         region = context["region"]
-        cart: dict = await session_data.get_or_create_cart(self.request.session)
+        cart = await session_data.get_or_create_cart(self.request.session)
         region_products = await crm_data.get_region_products(
             region["slug"],
             currency=context["selected_currency"],
-            cart_ids_set={product["id"] for product in cart["products"]},
+            cart_ids_set=cart.products_ids,
         )
         context["cart_products"] = await cart_formatters.format_cart_products(
             cart, region_products, context["selected_currency"]
         )
         return context["cart_products"]
 
-    def calculate_cart_grand_total(
-        self, cart_products
-    ):  # TODO: to combine this method with CartView._calculate_cart_grand_total_price
-        """
-        Calculate and add the cart grand total to the context.
-
-        Args:
-            context (dict): The context dictionary.
-        """
-        return round(
-            sum(
-                map(
-                    lambda x: (x["unit_price"] if not x["discount"] else x["new_price"])
-                    * x["cart_amount"],
-                    cart_products,
-                )
-            ),
-            2,
-        )
-
     async def update_context_with_suggested_products(self, context, cart_products):
         """
         Update the context with suggested products.
@@ -321,9 +304,7 @@ class CheckoutView(AsyncFormView, ApplicationMixin):
             HttpResponse: The HTTP response object.
         """
         session = self.request.session
-        cart_products = (await session_data.get_or_create_cart(session))["products"]
-
-        if not cart_products:
+        if not await session_data.get_or_create_cart(session):
             return await self.redirect_to_success_url()
 
         return await super().get(request, *args, **kwargs)
@@ -401,18 +382,17 @@ class CheckoutView(AsyncFormView, ApplicationMixin):
                 )
             )
         session = self.request.session
-        cart_products = (await session_data.get_or_create_cart(session))["products"]
-        if not cart_products:
+        cart = await session_data.get_or_create_cart(session)
+        if not cart:
             return HttpResponseRedirect(
                 await self.get_success_url(region_slug, data["selected_currency"])
             )
-        cart_products_ids = {product["id"] for product in cart_products}
-        not_existent_products_id_set = await order_handlers.get_not_existent_products(
-            cart_products_ids
-        )
-
-        if not_existent_products_id_set:
-            await session_data.remove_ordered_products(session, not_existent_products_id_set)
+        pricing = await pricing_engine.price_cart(cart, region_slug, selected_currency)
+        if pricing.missing or pricing.deprecated:
+            await session_data.remove_ordered_products(
+                session,
+                {*pricing.missing, *(product_id for product_id, _ in pricing.deprecated)},
+            )
             return render(
                 self.request,
                 "templates/notification.html",
@@ -433,82 +413,28 @@ class CheckoutView(AsyncFormView, ApplicationMixin):
             )
 
         order_number = f"{region_slug}-{str(uuid4())[:6]}"
-        created_order_json = await order_handlers.create_order(
-            cart_products, order_number, region_slug, selected_currency, data
-        )
-        if created_order_json["data"][0]["status"] == "success":
-            order_id = created_order_json["data"][0]["details"]["id"]
-            await session_data.remove_ordered_products(session, cart_products_ids)
-            await session_data.add_order(session, order_id)
-            # await self.notify_user_by_email_or_sms(
-            #     data["customer_phone_number"],
-            #     order_number,
-            #     created_order_json["data"][0]["grand_total"],
-            #     selected_currency,
-            #     data["customer_email"],
-            # )
-            return render(
-                self.request,
-                "templates/notification.html",
-                {
-                    "title": "BonnyFlowers",
-                    "header": "Замовлення створено!",
-                    "message_top": "Номер замовлення - ",
-                    "spanned_message": order_number,
-                    "message_bottom": "Списання відбудеться протягом 3-ох днів",
-                    "redirect_url": await self.get_success_url(
-                        region_slug, data["selected_currency"]
-                    ),
-                    "redirect_message": "У кошик",
-                },
-                status=201,
-            )
-        return HttpResponseRedirect(
-            await self.get_success_url(region_slug, data["selected_currency"])
-        )
-
-    @staticmethod
-    async def notify_user_by_email_or_sms(
-        customer_phone_number: str,
-        order_number: str,
-        order_grand_total: int,
-        order_currency: dict[str, Any],
-        customer_email: str | None = None,
-    ):
-        """
-        Notify the user about a successful order payment via email or SMS.
-
-        Args:
-            customer_phone_number (str): The customer's phone number for SMS notification.
-            order_number (str): The unique identifier for the order.
-            order_grand_total (int): The total amount paid for the order.
-            order_currency (dict[str, Any]): A dictionary containing information about the order currency.
-            customer_email (str | None, optional): The customer's email address for email notification. Defaults to None.
-
-        Returns:
-            None
-        """
-        client = Client(
-            os.getenv("TWILIO_ACCOUNT_SID"),
-            os.getenv("TWILIO_AUTH_TOKEN"),
-            http_client=AsyncTwilioHttpClient(pool_connections=False),
+        await order_handlers.create_order(
+            cart, order_number, region_slug, selected_currency, data, pricing
         )
-        await client.messages.create_async(
-            to=customer_phone_number,
-            from_=os.getenv("TWILIO_PHONE_NUMBER"),
-            body=f"Приветствуем! Вы успешно оплатили заказ {order_number} на сумму {order_grand_total}{order_currency.get('symbol')} на BonnyFlowers.",
+        await session_data.remove_ordered_products(session, cart.products_ids)
+        await session_data.add_pending_order(session, order_number)
+        return render(
+            self.request,
+            "templates/notification.html",
+            {
+                "title": "BonnyFlowers",
+                "header": "Замовлення створено!",
+                "message_top": "Номер замовлення - ",
+                "spanned_message": order_number,
+                "message_bottom": "Списання відбудеться протягом 3-ох днів",
+                "redirect_url": await self.get_success_url(
+                    region_slug, data["selected_currency"]
+                ),
+                "redirect_message": "У кошик",
+            },
+            status=201,
         )
 
-        if customer_email:
-            send_mail(
-                f"Подтверждение заказа {order_number} в BonnyFlowers",
-                f"Приветствуем! Вы успешно оплатили заказ {order_number} на сумму {order_grand_total}{order_currency.get('symbol')} на BonnyFlowers..",
-                recipient_list=[
-                    customer_email,
-                ],
-                from_email=None,
-            )
-
     async def form_invalid(self, form: AsyncForm) -> TemplateResponse:
         """Test."""
         return await super().form_invalid(form)
@@ -551,31 +477,24 @@ class OrdersList(AsyncTemplateView, ApplicationMixin):
         client_orders_id_list = await session_data.get_client_orders_id_list(
             self.request.session
         )
-        fetched_orders = await order_handlers.get_client_orders(client_orders_id_list)
+        fetched_orders = await order_status_mirror_handlers.get_client_orders(
+            client_orders_id_list
+        )
         context["orders"] = []
         currencies = await crm_data.get_currency_list(self.request)
+        if isinstance(currencies, HttpResponseServerError):
+            return currencies
+        currencies_by_id = {currency["id"]: currency for currency in currencies}
         for order in fetched_orders:
             try:
                 context["orders"].append(
                     {
-                        "number": order["data"][0]["order_number"],
-                        "target_delivery_date": order["data"][0]["target_delivery_date"],
-                        "grand_total": order["data"][0]["grand_total"],
-                        "status": self.OrderStatus(order["data"][0]["order_status"]),
-                        "products": [
-                            {
-                                "sku": product["sku"],
-                                "name": product["product_id"]["name"],
-                                "amount": product["amount"],
-                                "price": product["price"],
-                            }
-                            for product in order["data"][0]["ordered_products"]
-                        ],
-                        "selected_currency": next(
-                            currency
-                            for currency in currencies
-                            if currency["id"] == order["data"][0]["order_currency_id"]["id"]
-                        ),
+                        "number": order["number"],
+                        "target_delivery_date": order["target_delivery_date"],
+                        "grand_total": order["grand_total"],
+                        "status": self.OrderStatus(order["status"]),
+                        "products": order["products"],
+                        "selected_currency": currencies_by_id.get(order["currency_id"]),
                     }
                 )
             except ValueError:
@@ -607,3 +526,40 @@ class OrdersList(AsyncTemplateView, ApplicationMixin):
             "delivered": self.OrderStatus.delivered.value,
         }
         return context
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class OrderStatusWebhook(View):
+    """Endpoint for Zoho CRM workflow webhook, called when an order status changes."""
+
+    async def post(self, request: HttpRequest, *args, **kwargs):
+        """
+        Update status of the mirrored order.
+
+        Webhook secret is passed in 'X-Webhook-Secret' header or 'secret' query
+        parameter, order 'id' and 'order_status' are passed as form or JSON data.
+
+        Returns:
+        - JsonResponse with status 200 and 'updated' flag.
+        - JsonResponse with status 400 if not all required data is provided.
+        - HttpResponseForbidden if the secret is wrong or isn't configured.
+        """
+        secret = getattr(settings, "ZOHO_WEBHOOK_SECRET", None)
+        passed_secret = request.headers.get("X-Webhook-Secret") or request.GET.get("secret")
+        if not (secret and passed_secret and hmac.compare_digest(secret, passed_secret)):
+            return HttpResponseForbidden()
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body)
+            except json.JSONDecodeError:
+                return JsonResponse({"msg": "Wrong data passed"}, status=400)
+        else:
+            data = request.POST
+        if not isinstance(data, dict):
+            return JsonResponse({"msg": "Wrong data passed"}, status=400)
+        if not isinstance(data.get("id"), str) or not isinstance(data.get("order_status"), str):
+            return JsonResponse({"msg": "Not all data passed"}, status=400)
+        updated = await order_status_mirror_handlers.update_status(
+            data["id"], data["order_status"]
+        )
+        return JsonResponse({"updated": updated})
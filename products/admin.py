@@ -7,7 +7,13 @@ from django.contrib import admin
 from django.db.models import QuerySet
 from django.http import HttpRequest
 
-from products.models import ZohoImage, ZohoModuleRecord
+from products.models import (
+    MediaBlob,
+    ZohoImage,
+    ZohoImageDerivative,
+    ZohoModuleRecord,
+    ZohoSyncState,
+)
 
 
 class ZohoModuleRecordAdmin(admin.ModelAdmin):
@@ -39,7 +45,9 @@ class ZohoModuleRecordAdmin(admin.ModelAdmin):
             accessed_at__lte=(datetime.now() - timedelta(days=90))
         ).defer("accessed_at")
         for instance in instances:
-            shutil.rmtree(f"media/{instance.module_name}/{instance.record_name}")
+            shutil.rmtree(
+                f"media/{instance.module_name}/{instance.record_name}", ignore_errors=True
+            )
         instances.delete()
 
 
@@ -50,6 +58,7 @@ class ZohoImageAdmin(admin.ModelAdmin):
         "id",
         "zoho_record",
         "image",
+        "position",
     )
     list_display_links = (
         "id",
@@ -57,5 +66,49 @@ class ZohoImageAdmin(admin.ModelAdmin):
     )
 
 
+class ZohoImageDerivativeAdmin(admin.ModelAdmin):
+    """ZohoImageDerivative admin site settings."""
+
+    list_display = (
+        "id",
+        "image",
+        "width",
+        "format",
+        "file",
+    )
+    list_display_links = (
+        "id",
+        "image",
+    )
+
+
+class MediaBlobAdmin(admin.ModelAdmin):
+    """MediaBlob admin site settings."""
+
+    list_display = (
+        "id",
+        "sha256",
+        "file",
+        "size",
+        "created_at",
+    )
+    list_display_links = (
+        "id",
+        "sha256",
+    )
+
+
+class ZohoSyncStateAdmin(admin.ModelAdmin):
+    """ZohoSyncState admin site settings."""
+
+    list_display = (
+        "name",
+        "synced_at",
+    )
+
+
 admin.site.register(ZohoModuleRecord, ZohoModuleRecordAdmin)
 admin.site.register(ZohoImage, ZohoImageAdmin)
+admin.site.register(ZohoImageDerivative, ZohoImageDerivativeAdmin)
+admin.site.register(ZohoSyncState, ZohoSyncStateAdmin)
+admin.site.register(MediaBlob, MediaBlobAdmin)
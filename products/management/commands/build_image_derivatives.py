@@ -0,0 +1,49 @@
+"""Command for building responsive derivatives of the stored Zoho CRM images."""
+import asyncio
+from typing import Any, List
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from products.models import ZohoImage
+from services.image_derivatives import image_derivatives_builder
+
+
+class Command(BaseCommand):
+    """Build resized WebP/AVIF variants of images in a process pool."""
+
+    help = "Build resized WebP/AVIF derivatives of Zoho CRM images, that don't have them yet."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--all", action="store_true", help="Process all images, not only new ones."
+        )
+        parser.add_argument("--batch-size", type=int, default=50, help="Images per batch.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Build derivatives batch by batch."""
+        images = ZohoImage.objects.all()
+        if not options["all"]:
+            images = images.filter(derivatives__isnull=True)
+        images_list: List[ZohoImage] = list(images.distinct())
+        created = asyncio.run(self.build(images_list, options["batch_size"]))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {len(images_list)} images, saved {created} derivatives."
+            )
+        )
+
+    @staticmethod
+    async def build(images: List[ZohoImage], batch_size: int) -> int:
+        """Build derivatives of the images in batches, return saved records amount."""
+        created = 0
+        try:
+            for start in range(0, len(images), batch_size):
+                created += len(
+                    await image_derivatives_builder.build_for_images(
+                        images[start : start + batch_size]
+                    )
+                )
+        finally:
+            image_derivatives_builder.shutdown()
+        return created
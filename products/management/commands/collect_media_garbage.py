@@ -0,0 +1,58 @@
+"""Command for removing media store blobs, that aren't referenced by images anymore."""
+import asyncio
+import os
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from products.models import ZohoImage
+from services.media_store import media_store
+
+
+class Command(BaseCommand):
+    """Delete unreferenced blobs and optionally move legacy image files into the store."""
+
+    help = "Delete media store blobs, that aren't referenced by any image, with their files."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=24,
+            help="Keep unreferenced blobs created during the given hours amount.",
+        )
+        parser.add_argument(
+            "--adopt",
+            action="store_true",
+            help="Move files of the images, saved before the media store, into it first.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Collect garbage of the media store."""
+        if options["adopt"]:
+            adopted = asyncio.run(self.adopt_legacy_images())
+            self.stdout.write(f"Moved {adopted} images into the media store.")
+        removed_files = asyncio.run(
+            media_store.collect_garbage(
+                timezone.now() - timedelta(hours=options["grace_hours"])
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(f"Removed {len(removed_files)} files."))
+
+    @staticmethod
+    async def adopt_legacy_images() -> int:
+        """Store files of the images without blobs, return adopted images amount."""
+        adopted = 0
+        async for image in ZohoImage.objects.filter(blob__isnull=True):
+            if not os.path.exists(os.path.join(settings.MEDIA_ROOT, image.image.name)):
+                continue
+            blob = await media_store.ingest(image.image.name)
+            image.blob = blob
+            image.image = blob.file.name
+            await image.asave(update_fields=["blob", "image"])
+            adopted += 1
+        return adopted
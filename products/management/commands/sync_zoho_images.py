@@ -0,0 +1,87 @@
+"""Command for incremental synchronization of the Zoho CRM products images."""
+import asyncio
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from products.models import ZohoSyncState
+from services.crm_interface import custom_record_operations
+from services.downloads import media_downloader
+from services.image_derivatives import image_derivatives_builder
+from services.image_handlers import product_image_handler, subcategory_image_handler
+
+
+class Command(BaseCommand):
+    """Synchronize local products images with the records modified in Zoho CRM."""
+
+    help = (
+        "Download new and delete outdated images of the products modified in Zoho CRM "
+        "since the last run, then refresh the images index used by the pages. "
+        "Derivatives of the subcategories images, that don't have them yet, are built too."
+    )
+    sync_state_name = "products_images"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add command arguments."""
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Process all products and delete images of the removed ones.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat synchronization every given seconds amount instead of a single run.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Run synchronization once or periodically."""
+        try:
+            while True:
+                self.synchronize(options["full"])
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            image_derivatives_builder.shutdown()
+
+    def synchronize(self, is_full: bool) -> None:
+        """Synchronize images of the products modified since the last successful run."""
+        media_downloader.reset_stats()
+        sync_state, _ = ZohoSyncState.objects.get_or_create(name=self.sync_state_name)
+        is_full = is_full or sync_state.synced_at is None
+        started_at = timezone.now()
+        records = asyncio.run(
+            custom_record_operations.get_modified_records(
+                "products_base",
+                ["id", "images", "slug"],
+                None if is_full else sync_state.synced_at,
+            )
+        )
+        if is_full and not records:
+            self.stderr.write("Zoho CRM returned no products, synchronization is skipped.")
+            return
+        if records:
+            images_index = asyncio.run(
+                product_image_handler.sync_products_images(records, is_full)
+            )
+        else:
+            images_index = asyncio.run(product_image_handler.get_images_index())
+        sync_state.synced_at = started_at
+        sync_state.save(update_fields=["synced_at"])
+        subcategories_derivatives = asyncio.run(
+            subcategory_image_handler.build_missing_derivatives()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synchronized {len(records)} products, "
+                f"{len(images_index)} products with images are indexed. "
+                f"Downloaded {media_downloader.stats['files']} files "
+                f"({media_downloader.stats['failed']} failed) "
+                f"at {media_downloader.get_throughput() / 1024:.1f} KB/s. "
+                f"Saved {subcategories_derivatives} subcategories images derivatives."
+            )
+        )
@@ -2,9 +2,10 @@
 
 from typing import List
 
-from asgiref.sync import sync_to_async
 from django.db import models
 
+from services.db import db_pool
+
 
 class ZohoModuleRecord(models.Model):
     """Model for storing Zoho CRM module id storage."""
@@ -31,6 +32,63 @@ class ZohoModuleRecord(models.Model):
         return f"{self.module_name} {self.record_name}"
 
 
+class MediaBlob(models.Model):
+    """Model for storing content-addressed media files, each unique content is stored once."""
+
+    sha256 = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name="SHA-256 содержимого",
+    )
+    file = models.FileField(verbose_name="Адрес файла")
+    size = models.BigIntegerField(verbose_name="Размер в байтах")
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.file}"
+
+
+class MediaBlobAlias(models.Model):
+    """Model for storing Zoho CRM attachments metadata known to have the given content."""
+
+    attachment_id = models.BigIntegerField(
+        unique=True,
+        verbose_name="Id вложения",
+    )
+    file_id = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        verbose_name="Id файла",
+    )
+    file_name = models.CharField(
+        max_length=255,
+        verbose_name="Имя файла",
+    )
+    size = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Размер в байтах",
+    )
+    blob = models.ForeignKey(
+        MediaBlob,
+        on_delete=models.CASCADE,
+        related_name="aliases",
+        verbose_name="Файл",
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["file_name", "size"])]
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.attachment_id} {self.file_name}"
+
+
 class ZohoImage(models.Model):
     """Model for storing Zoho CRM images."""
 
@@ -44,19 +102,71 @@ class ZohoImage(models.Model):
         verbose_name="Зохо запись",
     )
     image = models.ImageField(verbose_name="Адресс картинки")
+    blob = models.ForeignKey(
+        MediaBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="images",
+        verbose_name="Файл",
+    )
+    position = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Порядковый номер",
+    )
 
     @classmethod
-    @sync_to_async
-    def avalues_list(cls, *args, **kwargs) -> List:
+    async def avalues_list(cls, *args, **kwargs) -> List:
         """
         Async implementation of "filter" method.
 
         Is async because of this one exception:
         django.core.exceptions.SynchronousOnlyOperation:
         You cannot call this from an async context - use a thread or sync_to_async.
+        Query is run on the database pool, see services/db.py.
         """
-        return list(cls.objects.filter(*args, **kwargs))
+        return await db_pool.fetch(cls.objects.filter(*args, **kwargs))
 
     def __str__(self) -> str:
         """Represent class instance."""
         return f"{self.image}"
+
+
+class ZohoImageDerivative(models.Model):
+    """Model for storing resized and re-encoded variants of Zoho CRM images."""
+
+    image = models.ForeignKey(
+        ZohoImage,
+        on_delete=models.CASCADE,
+        related_name="derivatives",
+        verbose_name="Исходная картинка",
+    )
+    width = models.PositiveIntegerField(verbose_name="Ширина")
+    format = models.CharField(max_length=10, verbose_name="Формат")
+    file = models.ImageField(verbose_name="Адресс картинки")
+
+    class Meta:
+        unique_together = ("image", "width", "format")
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.file}"
+
+
+class ZohoSyncState(models.Model):
+    """Model for storing the last successful synchronization time of Zoho CRM data."""
+
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="Наименование синхронизации",
+    )
+    synced_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Время последней синхронизации",
+    )
+
+    def __str__(self) -> str:
+        """Represent class instance."""
+        return f"{self.name} {self.synced_at}"
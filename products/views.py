@@ -17,15 +17,16 @@ from products.app_services.data_getters import crm_data
 from products.app_services.product_handlers import product_detail_handlers
 from products.exceptions import BouquetSizeNotFoundError, ProductNotFoundError
 from services.data_getters import crm_data as service_crm_data
-from services.mixins import ApplicationMixin
+from services.mixins import ApplicationMixin, ConditionalGetMixin
 from services.utils import utilities
 from userprofile.app_services.userprofile_handlers import user_handlers
 
 
-class ProductView(ApplicationMixin, AsyncTemplateView):
+class ProductView(ConditionalGetMixin, ApplicationMixin, AsyncTemplateView):
     """Class view for product detail information."""
 
     template_name = "products/product.html"
+    etag_session_keys = ("viewed_products",)
 
     async def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         """
@@ -47,12 +48,11 @@ class ProductView(ApplicationMixin, AsyncTemplateView):
             region_slug, subcategory_slug, product_slug, context["selected_currency"]
         )
         self._handle_product_not_found(product_dict)
-        cart: dict = await session_data.get_or_create_cart(self.request.session)
-        cart_ids_set = {product["id"] for product in cart["products"]}
+        cart = await session_data.get_or_create_cart(self.request.session)
         region_products = await service_crm_data.get_region_products(
             context["region"]["slug"],
             currency=context["selected_currency"],
-            cart_ids_set=cart_ids_set,
+            cart_ids_set=cart.products_ids,
         )
         similar_products = await product_detail_handlers.get_first_nine_similar_products(
             region_slug,
@@ -103,30 +103,18 @@ class ProductView(ApplicationMixin, AsyncTemplateView):
             except ProductNotFoundError:
                 return HttpResponseNotFound()
 
-            cart: dict = await session_data.get_or_create_cart(self.request.session)
+            cart = await session_data.get_or_create_cart(self.request.session)
+            bouquet_size = None
             if (product := context["product"])["is_bouquet"]:
                 try:
                     self._handle_bouquet_size(request, product, context)
                 except BouquetSizeNotFoundError:
                     return HttpResponseNotFound()
-                for cart_product in cart["products"]:
-                    if (
-                        cart_product["id"] == context["product"]["id"]
-                        and cart_product["size"] == context["selected_bouquet_size"]["value"]
-                    ):
-                        context["product"]["is_in_cart"] = True
-                        context["product"]["cart_amount"] = cart_product["amount"]
-                        break
-                else:
-                    context["product"]["is_in_cart"] = False
-            else:
-                for cart_product in cart["products"]:
-                    if context["product"]["id"] == cart_product["id"]:
-                        context["product"]["is_in_cart"] = True
-                        context["product"]["cart_amount"] = cart_product["amount"]
-                        break
-                else:
-                    context["product"]["is_in_cart"] = False
+                bouquet_size = context["selected_bouquet_size"]["value"]
+            cart_amount = cart.get_amount(product["id"], bouquet_size)
+            product["is_in_cart"] = cart_amount is not None
+            if cart_amount is not None:
+                product["cart_amount"] = cart_amount
             return self.render_to_response(context)
         return HttpResponseNotFound()
 
@@ -249,7 +237,7 @@ class ProductView(ApplicationMixin, AsyncTemplateView):
                 raise BouquetSizeNotFoundError()
 
 
-class ProductSearchView(View, ApplicationMixin):
+class ProductSearchView(ConditionalGetMixin, View, ApplicationMixin):
     """
     Class view for searching products.
 
@@ -299,18 +287,18 @@ class ProductSearchView(View, ApplicationMixin):
         if not currency_qparam:
             return JsonResponse({"msg": "Currency is not provided"}, status=400)
 
-        context = await self.get_common_context(**kwargs)
-        if isinstance(context, HttpResponseServerError):
-            return context
-        if not context["region"]:
+        region = await self.get_request_region(kwargs.get("region_slug"))
+        if isinstance(region, HttpResponseServerError):
+            return region
+        if not region:
             return JsonResponse({"msg": "Selected region not found"}, status=400)
 
-        cart: dict = await session_data.get_or_create_cart(self.request.session)
-        cart_ids_set = {product["id"] for product in cart["products"]}
+        cart = await session_data.get_or_create_cart(self.request.session)
+        cart_ids_set = cart.products_ids
         return await self.handle_search_request(
             request,
             currency_qparam,
-            context["region"],
+            region,
             name,
             subcategory_slug,
             data.get("minBudget"),
@@ -345,12 +333,10 @@ class ProductSearchView(View, ApplicationMixin):
         error message and status 400.
         """
         if name and not subcategory_slug and min_budget is None and max_budget is None:
-            currencies: list[
-                dict
-            ] | HttpResponseServerError = await service_crm_data.get_currency_list(request)
+            currencies = await service_crm_data.get_currencies_lookup(request)
             if isinstance(currencies, HttpResponseServerError):
                 return currencies
-            currency = utilities.get_selected_currency(currencies, currency_qparam)
+            currency = currencies.get(currency_qparam.lower())
 
             if not currency:
                 return JsonResponse({"msg": "Selected currency not found"}, status=400)
@@ -374,10 +360,10 @@ class ProductSearchView(View, ApplicationMixin):
                     {"msg": 'Min and max budget must be "str reduced to float"/"int".'},
                     status=400,
                 )
-            currencies = await service_crm_data.get_currency_list(request)
+            currencies = await service_crm_data.get_currencies_lookup(request)
             if isinstance(currencies, HttpResponseServerError):
                 return currencies
-            currency = utilities.get_selected_currency(currencies, currency_qparam)
+            currency = currencies.get(currency_qparam.lower())
 
             if not currency:
                 return JsonResponse({"msg": "Selected currency not found"}, status=400)
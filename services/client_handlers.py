@@ -76,5 +76,35 @@ class ClientInteractionHandler:
         ):
             return region
 
+    async def get_client_region_by_lookup(
+        self, request: HttpRequest, regions_lookup: dict[str, dict]
+    ) -> Optional[dict[str, str]]:
+        """
+        Get the region of the client with the regions lookup maps.
+
+        It works as 'get_client_region', but finds the region by the client city code,
+        country code or language header with dict lookups.
+
+        Args:
+            request (HttpRequest): The Django HttpRequest instance.
+            regions_lookup (dict): Regions lookup maps, see 'crm_data.get_regions_lookup'.
+
+        Returns:
+            Optional[dict]: The region, if found.
+        """
+        location_data: Dict = await crm_data.get_location(ip_geo_locator.get_client_ip(request))
+        if (city := location_data.get("city")) and (
+            region := regions_lookup["code"].get(city.lower())
+        ):
+            return region
+        if (country := location_data.get("country")) and (
+            region := regions_lookup["country"].get(country.lower())
+        ):
+            return region
+        for language in re.findall("[a-z]{2}", request.headers.get("Accept-Language") or ""):
+            if country := Constants.LANGUAGE_IDENTIFIERS_DICT.get(language):
+                return regions_lookup["country"].get(country.lower())
+        return None
+
 
 client_handler = ClientInteractionHandler()
@@ -58,7 +58,7 @@ class CommonHandlers:
         region_products = await crm_data.get_region_products(
             region_slug,
             currency=currency,
-            cart_ids_set={product["id"] for product in cart["products"]},
+            cart_ids_set=cart.products_ids,
         )
         return await cart_formatters.format_cart_products(cart, region_products, currency)
 
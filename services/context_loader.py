@@ -0,0 +1,125 @@
+"""Concurrent loading of the page context datasets by their dependencies."""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Dataset(NamedTuple):
+    """
+    Dataset of the page context.
+
+    Attributes:
+        loader (Callable): Coroutine function getting the dataset, it's called
+            with the loaded dependencies as keyword arguments.
+        depends_on (tuple): Names of the datasets the loader needs.
+    """
+
+    loader: Callable[..., Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+
+
+class ContextLoader:
+    """
+    Loads datasets concurrently, every dataset is started once its dependencies are loaded.
+
+    Loading is limited by the timeout budget of the request. Start and end times
+    of the datasets are recorded, so the critical path (the chain of dependencies
+    finished last) and its duration are known after the loading.
+    """
+
+    def __init__(self, datasets: dict[str, Dataset], timeout: Optional[float] = None) -> None:
+        """
+        Initialize loader.
+
+        Args:
+            datasets (dict): Datasets by their names.
+            timeout (float | None): Seconds to load all datasets in,
+                CONTEXT_LOADER_TIMEOUT setting by default.
+
+        Raises:
+            ValueError: If the dataset depends on unknown dataset or dependencies are cyclic.
+        """
+        self.datasets = datasets
+        self.timeout = (
+            timeout if timeout is not None else getattr(settings, "CONTEXT_LOADER_TIMEOUT", 10)
+        )
+        self.timings: dict[str, tuple[float, float]] = {}
+        self.critical_path: list[str] = []
+        self.duration = 0.0
+        self.check_dependencies()
+
+    def check_dependencies(self) -> None:
+        """Check the datasets dependencies are known and not cyclic."""
+        resolved: set[str] = set()
+        pending = dict(self.datasets)
+        while pending:
+            ready = [
+                name
+                for name, dataset in pending.items()
+                if all(dependency in resolved for dependency in dataset.depends_on)
+            ]
+            if not ready:
+                raise ValueError(f"Unknown or cyclic dependencies of {sorted(pending)}")
+            for name in ready:
+                resolved.add(name)
+                del pending[name]
+
+    async def load(self) -> dict[str, Any]:
+        """
+        Load the datasets.
+
+        Returns:
+            dict: Loaded datasets by their names.
+
+        Raises:
+            asyncio.TimeoutError: If the datasets aren't loaded in the timeout.
+        """
+        started_at = time.perf_counter()
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def load_dataset(name: str) -> Any:
+            dataset = self.datasets[name]
+            dependencies = {
+                dependency: await tasks[dependency] for dependency in dataset.depends_on
+            }
+            dataset_started_at = time.perf_counter() - started_at
+            result = await dataset.loader(**dependencies)
+            self.timings[name] = (dataset_started_at, time.perf_counter() - started_at)
+            return result
+
+        for name in self.datasets:
+            tasks[name] = asyncio.create_task(load_dataset(name))
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*tasks.values()), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Context isn't loaded in %s s, pending datasets: %s",
+                self.timeout,
+                ", ".join(name for name in tasks if name not in self.timings),
+            )
+            raise
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            self.duration = time.perf_counter() - started_at
+        self.critical_path = self.get_critical_path()
+        logger.debug(
+            "Context is loaded in %.1f ms, critical path: %s",
+            self.duration * 1000,
+            " -> ".join(self.critical_path),
+        )
+        return dict(zip(tasks, results))
+
+    def get_critical_path(self) -> list[str]:
+        """Get the chain of dependencies of the dataset finished last."""
+        if not self.timings:
+            return []
+        path = [max(self.timings, key=lambda name: self.timings[name][1])]
+        while dependencies := self.datasets[path[-1]].depends_on:
+            path.append(max(dependencies, key=lambda name: self.timings[name][1]))
+        return path[::-1]
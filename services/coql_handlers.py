@@ -4,6 +4,7 @@ from types import MethodType
 from typing import Any, Dict, List, Tuple, Union
 
 from services.crm_interface import coql_query_executor
+from services.request_timing import timed
 
 
 class COQLHandler:
@@ -47,7 +48,8 @@ class COQLHandler:
         then 200 will lead only for fetching that max amount of data.
         """
         query: str = self.query(*coql_args)
-        result: List = await coql_query_executor.fetch_data(query, lim=lim)
+        with timed("coql"):
+            result: List = await coql_query_executor.fetch_data(query, lim=lim)
         if result:
             for formatter in self.formatters:
                 if inspect.iscoroutinefunction(formatter):
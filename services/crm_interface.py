@@ -1,12 +1,13 @@
 """ZohoSDKAPI operations."""
+import asyncio
 import os
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Iterator, List, Optional, Union
+from datetime import datetime
+from typing import Dict, List, Optional, Union
 
 import httpx
 from asgiref.sync import sync_to_async
 from django.conf import settings
-from zcrmsdk.src.com.zoho.crm.api import HeaderMap, Initializer, ParameterMap
+from zcrmsdk.src.com.zoho.crm.api import HeaderMap, ParameterMap
 from zcrmsdk.src.com.zoho.crm.api.file import FileOperations, GetFileParam
 from zcrmsdk.src.com.zoho.crm.api.record import (
     ActionWrapper,
@@ -14,6 +15,7 @@ from zcrmsdk.src.com.zoho.crm.api.record import (
     BodyWrapper,
     DeleteRecordParam,
     GetRecordParam,
+    GetRecordsHeader,
     GetRecordsParam,
 )
 from zcrmsdk.src.com.zoho.crm.api.record import Record as ZCRMRecord
@@ -25,13 +27,12 @@ from zcrmsdk.src.com.zoho.crm.api.record import (
 )
 from zcrmsdk.src.com.zoho.crm.api.record.file_body_wrapper import FileBodyWrapper
 from zcrmsdk.src.com.zoho.crm.api.users import User
-from zcrmsdk.src.com.zoho.crm.api.util import (
-    APIHTTPConnector,
-    APIResponse,
-    StreamWrapper,
-)
+from zcrmsdk.src.com.zoho.crm.api.util import APIHTTPConnector, APIResponse
 
 from config.constants import Constants
+from services.downloads import media_downloader
+from services.http_clients import http_clients
+from zoho_token.utils import requires_sdk, zoho_init
 
 
 class CustomRecord:
@@ -109,6 +110,7 @@ class CustomRecord:
 
                     print("Message: " + response_object.get_message().get_value())
 
+    @requires_sdk
     def get_record(self, module_api_name: str, record_id: int, fields: List) -> Dict:
         """
         Get Zoho CRM record with given id and fields list.
@@ -137,6 +139,7 @@ class CustomRecord:
         return dict()
 
     @sync_to_async(thread_sensitive=False)
+    @requires_sdk
     def get_records(self, module_api_name: str, fields: List, id_list: List) -> Optional[List]:
         """
         Fetch module records with specified fields names and fields id list.
@@ -165,11 +168,55 @@ class CustomRecord:
         return []
 
     @sync_to_async(thread_sensitive=False)
+    @requires_sdk
+    def get_modified_records(
+        self,
+        module_api_name: str,
+        fields: List,
+        modified_since: Optional[datetime] = None,
+        per_page: int = 200,
+    ) -> List:
+        """
+        Fetch all module records modified after the given time, page by page.
+
+        :param module_api_name: str Module name.
+        :param fields: list[str] Fields name list.
+        :param modified_since: datetime | None Time of the previous fetch,
+            all records are fetched if it's not passed.
+        :param per_page: int Records amount per page.
+        """
+        record_operations = RecordOperations()
+        result: List = []
+        page: int = 1
+        more_records: bool = True
+        while more_records:
+            param_instance = ParameterMap()
+            for field in fields:
+                param_instance.add(GetRecordsParam.fields, field)
+            param_instance.add(GetRecordsParam.page, page)
+            param_instance.add(GetRecordsParam.per_page, per_page)
+            header_instance = HeaderMap()
+            if modified_since:
+                header_instance.add(GetRecordsHeader.if_modified_since, modified_since)
+            response = record_operations.get_records(
+                module_api_name, param_instance, header_instance
+            )
+            if not response or response.get_status_code() in [204, 304]:
+                break
+            response_object = response.get_object()
+            if not isinstance(response_object, ResponseWrapper):
+                break
+            result.extend(record.get_key_values() for record in response_object.get_data())
+            more_records = bool(response_object.get_info().get_more_records())
+            page += 1
+        return result
+
+    @sync_to_async(thread_sensitive=False)
+    @requires_sdk
     def create_records(
         self,
         module_api_name: str,
         data: List[Dict],
-        photo: Union[Iterator[bytes], None] = None,
     ) -> Union[int, bool]:
         """
         Create records of a module and print the response.
@@ -226,17 +273,10 @@ class CustomRecord:
                     for action_response in action_response_list:
                         if isinstance(action_response, SuccessResponse):
                             details: dict = action_response.get_details()
-                            if photo:
-                                photo_upload_response = image_handler.upload_record_photo(
-                                    module_api_name,
-                                    int(details.get("id")),
-                                    photo,
-                                )
-                                if photo_upload_response:
-                                    return int(details.get("id"))
                             return int(details.get("id"))
         return False
 
+    @requires_sdk
     def update_record(self, module_api_name: str, record_id: int, data: Dict) -> Optional[int]:
         """
         Update a single record of a module with ID and print the response.
@@ -274,6 +314,7 @@ class CustomRecord:
 
         return self.get_user_id(response)  # TODO add APIexception handling
 
+    @requires_sdk
     def delete_record(self, module_api_name: str, record_id: int) -> bool:
         """
         Delete a single record of a module with ID and print the response.
@@ -309,6 +350,7 @@ class CustomRecord:
                             return True
         return False
 
+    @requires_sdk
     def search_records(self, module_name: str, fields: List, criteria: str) -> List:
         """Search instances in Zoho CRM module."""
         record_operations = RecordOperations()
@@ -335,6 +377,7 @@ class CustomRecord:
         return result
 
     @staticmethod
+    @requires_sdk
     def get_file(record_id: int, destination_folder: str) -> str:
         """
         Get file from Zoho CRM and save file to specified folder.
@@ -397,10 +440,13 @@ class CoqlQueryExecutor:
         :param query: The COQL command to execute.
         :return: A dictionary representing the response.
         """
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
-        async with httpx.AsyncClient(headers=self.connector.headers) as client:
-            response = await client.post(url=self.connector.url, json={"select_query": query})
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
+        async with http_clients.client("zoho") as client:
+            response = await client.post(
+                url=self.connector.url,
+                json={"select_query": query},
+                headers=self.connector.headers,
+            )
         if response.content:
             return response.json()
         return {}
@@ -438,16 +484,10 @@ class CRMImageDownloader:
         self, url: str, file_name: str, client: httpx.AsyncClient
     ) -> bool:
         """Perform http request and save file in case of success."""
-        with ThreadPoolExecutor() as executor:
-            executor.submit(Initializer.get_initializer().token.authenticate, self.connector)
-        response = await client.get(url, headers=self.connector.headers)
-        if response.status_code == 200:
-            os.makedirs(os.path.dirname(f"media/{file_name}"), exist_ok=True)
-            with open(f"media/{file_name}", "wb") as f:
-                for chunk in response.iter_bytes(chunk_size=1024):
-                    f.write(chunk)
-            return True
-        return False
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
+        return await media_downloader.download(
+            client, url, file_name, headers=self.connector.headers
+        )
 
     async def download_zoho_crm_attachment_file(
         self,
@@ -457,21 +497,24 @@ class CRMImageDownloader:
         item_slug: str,
         file_name: str,
         client: httpx.AsyncClient,
+        db_file_path: Optional[str] = None,
     ) -> str:
         """
         Download Zoho CRM attachment file with given attachment id.
 
-        Save file as 'media/module_api_name/product_name/file_name'.
+        Save file as 'media/module_api_name/product_name/file_name',
+        unless another path relative to the media root is passed.
         :param module_api_name: str Module API name.
         :param record_id: str Record id.
         :param attachment_id: str Attachment file id.
         :param item_slug: str Product slug to use in path.
         :param file_name: str File name to use in path.
         :param client: httpx.AsyncClient.
+        :param db_file_path: str | None Path to save file with.
 
         Returns file name of the image or empty line if there is a fail of downloading.
         """
-        db_file_path = f"{module_api_name}/{item_slug}/{file_name}"
+        db_file_path = db_file_path or f"{module_api_name}/{item_slug}/{file_name}"
         url = (
             f"https://www.zohoapis.eu/crm/v5/{module_api_name}/{record_id}"
             f"/actions/download_fields_attachment?fields_attachment_id={attachment_id}"
@@ -507,78 +550,32 @@ class CRMImageDownloader:
                 "slug": subcategory["slug"],
             }
 
-    def upload_record_photo(
+    async def upload_record_photo(
         self,
         module_api_name: str,
-        record_id: int,
-        photo=None,
-    ) -> bool:
+        record_id: int | str,
+        content: bytes,
+        file_name: str,
+    ) -> None:
         """
         To upload a photo to a record in the Zoho CRM module.
 
-        :param photo: Iterator[bytes], data of the image to upload.
-        :param photo_name: str, the name of the image file.
         :param module_api_name: str, the API name of the Zoho CRM module.
-        :param record_id: int, the identifier of the record.
+        :param record_id: int | str, the identifier of the record.
+        :param content: bytes, the image data.
+        :param file_name: str, the name of the image file.
 
-        :return: bool, True if created, False if not.
+        Raises:
+            httpx.HTTPError: If the request fails.
         """
-        # Initializer.get_initializer().token.authenticate(self.connector)
-        # print(self.connector.headers)
-        # with requests.Session() as session:
-        #     # Отправьте POST-запрос с чанками изображения
-        #     response = session.post(
-        #         f"https://www.zohoapis.com/crm/v2/{module_api_name}/{record_id}/photo",
-        #         files={"file": photo},
-        #         headers=self.connector.headers,
-        #     )
-        #     if response is not None:
-        #         pprint(response.json())
-        #         return response.json()
-        # return False
-
-        record_operations = RecordOperations()
-        db_file_name = f"individual_orders/{module_api_name}/{record_id}/{photo.name}"
-        os.makedirs(os.path.dirname(f"media/{db_file_name}"), exist_ok=True)
-        with open(f"media/{db_file_name}", "wb") as f:
-            for chunk in photo.chunks():
-                f.write(chunk)
-
-        stream_wrapper = StreamWrapper(stream=open(f"media/{db_file_name}", "rb"))
-        request = FileBodyWrapper()
-        request.set_file(stream_wrapper)
-        response = record_operations.upload_photo(record_id, module_api_name, request)
-        if response is not None:
-            print("Status Code: " + str(response.get_status_code()))
-            response_object = response.get_object()
-            if response_object is not None:
-                if isinstance(response_object, SuccessResponse):
-                    print("Status: " + response_object.get_status().get_value())
-                    print("Code: " + response_object.get_code().get_value())
-                    print("Details")
-                    details = response_object.get_details()
-                    for key, value in details.items():
-                        print(key + " : " + str(value))
-                    print("Message: " + response_object.get_message().get_value())
-                    return True
-
-                # Check if the request returned an exception
-                elif isinstance(response_object, APIException):
-                    # Get the Status
-                    print("Status: " + response_object.get_status().get_value())
-
-                    # Get the Code
-                    print("Code: " + response_object.get_code().get_value())
-
-                    print("Details")
-
-                    # Get the details dict
-                    details = response_object.get_details()
-
-                    for key, value in details.items():
-                        print(key + " : " + str(value))
-                    print("Message: " + response_object.get_message().get_value())
-        return False
+        await asyncio.to_thread(zoho_init.authenticate, self.connector)
+        async with http_clients.client("zoho") as client:
+            response = await client.post(
+                f"https://www.zohoapis.eu/crm/v5/{module_api_name}/{record_id}/photo",
+                files={"file": (file_name, content, "image/jpeg")},
+                headers=self.connector.headers,
+            )
+        response.raise_for_status()
 
 
 image_handler = CRMImageDownloader()
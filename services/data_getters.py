@@ -1,7 +1,7 @@
 """Module, that contains caching operations."""
 from typing import Optional
 
-from django.core.cache import cache
+from django.core.cache import cache as default_cache
 from django.http import HttpRequest, HttpResponseServerError
 from django.shortcuts import render
 
@@ -15,7 +15,18 @@ from .crm_entities_handlers import (
     regions_handler,
     subcategories_handler,
 )
-from .utils import convert_products_prices, ip_geo_locator, mark_products_in_cart
+from .request_timing import TimedCache
+from .utils import (
+    convert_products_prices,
+    formatters,
+    get_data_version,
+    ip_geo_locator,
+    mark_products_in_cart,
+)
+
+cache = TimedCache(default_cache)
+
+NAVIGATION_DATA_KEYS = ("region_dict", "currency_list", "categories", "subcategories")
 
 
 class crm_data:
@@ -68,8 +79,43 @@ class crm_data:
                 status=503,
             )
         cache.set("region_dict", region_dict, 10)
+        cache.set("region_dict_version", get_data_version(region_dict), None)
         return region_dict
 
+    @staticmethod
+    async def get_regions_lookup(request: HttpRequest) -> dict[str, dict]:
+        """
+        Get regions lookup maps by slug, city code and country code.
+
+        Returns:
+            Dict: The lookup maps, see 'formatters.format_regions_lookup'.
+        """
+        if value := cache.get("regions_lookup"):
+            return value
+        regions = await crm_data.get_regions_list(request)
+        if isinstance(regions, HttpResponseServerError):
+            return regions
+        regions_lookup = formatters.format_regions_lookup(regions)
+        cache.set("regions_lookup", regions_lookup, 10)
+        return regions_lookup
+
+    @staticmethod
+    async def get_currencies_lookup(request: HttpRequest) -> dict[str, dict]:
+        """
+        Get currencies by lower-cased names.
+
+        Returns:
+            Dict: The currency name as key, currency as value.
+        """
+        if value := cache.get("currencies_lookup"):
+            return value
+        currencies = await crm_data.get_currency_list(request)
+        if isinstance(currencies, HttpResponseServerError):
+            return currencies
+        currencies_lookup = formatters.format_currencies_lookup(currencies)
+        cache.set("currencies_lookup", currencies_lookup, 10)
+        return currencies_lookup
+
     @staticmethod
     async def get_regions_default_currencies() -> dict | list:
         """
@@ -113,8 +159,37 @@ class crm_data:
             region_slug, currency=currency, subcategories=subcategories_list
         )
         cache.set(f"{region_slug}_products", region_products, 10)
+        cache.set(f"{region_slug}_products_version", get_data_version(region_products), None)
         return region_products
 
+    @staticmethod
+    async def get_catalog_version(region_slug: str) -> Optional[str]:
+        """
+        Get version of the region products, that were got from Zoho CRM last.
+
+        Version changes only if the products data changes.
+        :param region_slug: str Region slug.
+        """
+        return cache.get(f"{region_slug}_products_version")
+
+    @staticmethod
+    async def get_navigation_version() -> str:
+        """
+        Get version of the data shown in the header and footer of every page.
+
+        Version changes only if regions, currencies, categories or subcategories change,
+        so page fragments rendered from them are cached until the next catalog update.
+        Versions are stored when the data is got from Zoho CRM, the missing ones are
+        computed from the cached data.
+        """
+        version_keys = [f"{key}_version" for key in NAVIGATION_DATA_KEYS]
+        versions = cache.get_many(version_keys)
+        for key, version_key in zip(NAVIGATION_DATA_KEYS, version_keys):
+            if version_key not in versions:
+                versions[version_key] = get_data_version(cache.get(key))
+                cache.set(version_key, versions[version_key], None)
+        return get_data_version([versions[version_key] for version_key in version_keys])
+
     @staticmethod
     async def get_currency_list(request: HttpRequest) -> list[dict[str, str]] | list:
         """Get currency list from cache or Zoho CRM."""
@@ -138,6 +213,7 @@ class crm_data:
                 status=503,
             )
         cache.set("currency_list", currency_list, 10)
+        cache.set("currency_list_version", get_data_version(currency_list), None)
         return currency_list
 
     @staticmethod
@@ -152,6 +228,7 @@ class crm_data:
             return subcategories
         subcategories: list = await subcategories_handler.fetch_instances()
         cache.set("subcategories", subcategories, 10)
+        cache.set("subcategories_version", get_data_version(subcategories), None)
         return subcategories
 
     @staticmethod
@@ -166,6 +243,7 @@ class crm_data:
             return categories
         categories: list = await categories_handler.fetch_instances()
         cache.set("categories", categories, 10)
+        cache.set("categories_version", get_data_version(categories), None)
         return categories
 
     @staticmethod
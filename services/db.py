@@ -0,0 +1,186 @@
+"""
+Database access from the async code of the web process.
+
+Django runs 'sync_to_async' calls on the single thread by default, its async
+queryset methods too, so queries of all concurrent requests wait for each other.
+Queries here run on a bounded pool of worker threads instead, every worker
+keeps its own persistent connection, so the pool size limits connections of the process.
+"""
+import asyncio
+import atexit
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.db.models import Model, QuerySet
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+pool_worker = threading.local()
+
+
+def keep_worker_connection(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """Keep new connection of the pool worker for DB_POOL_CONN_MAX_AGE seconds."""
+    if getattr(pool_worker, "is_worker", False):
+        connection.close_at = time.monotonic() + getattr(settings, "DB_POOL_CONN_MAX_AGE", 60)
+
+
+class DatabasePool:
+    """
+    Runs ORM calls on a bounded pool of worker threads.
+
+    Connections of the workers are reused within DB_POOL_CONN_MAX_AGE, unlike ones
+    of the request threads, closed by CONN_MAX_AGE. They're checked before every call,
+    with a health check if CONN_HEALTH_CHECKS is set, and closed after it when they're
+    expired or broken. The pool is created on first use,
+    after the worker process is forked.
+
+    Time of waiting for a free worker and of acquiring its connection is collected
+    in 'stats' with the number of calls, that found all workers busy.
+    """
+
+    def __init__(self) -> None:
+        """Initialize pool, worker threads are started on first use."""
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.size = 0
+        self.busy = 0
+        self.reset_stats()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get or create the workers."""
+        with self._lock:
+            if self._executor is None:
+                self.size = getattr(settings, "DB_POOL_SIZE", 10)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="db", initializer=self.init_worker
+                )
+                connection_created.connect(keep_worker_connection, dispatch_uid="db_pool")
+                atexit.register(self.shutdown)
+            return self._executor
+
+    @staticmethod
+    def init_worker() -> None:
+        """Mark the thread as the pool worker, its connections are kept between calls."""
+        pool_worker.is_worker = True
+
+    def reset_stats(self) -> None:
+        """Reset pool counters."""
+        self.stats: Dict[str, float] = {
+            "calls": 0,
+            "saturated_calls": 0,
+            "max_busy": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "connects": 0,
+            "acquire_seconds": 0.0,
+            "max_acquire_seconds": 0.0,
+        }
+
+    def log_stats(self) -> None:
+        """Log summary of the calls since the last stats reset."""
+        calls = self.stats["calls"] or 1
+        logger.info(
+            "Database pool: %d calls, %d saturated (max %d of %d workers busy), "
+            "wait %.1f ms avg / %.1f ms max, %d connects, "
+            "connection acquire %.1f ms avg / %.1f ms max.",
+            self.stats["calls"],
+            self.stats["saturated_calls"],
+            self.stats["max_busy"],
+            self.size,
+            self.stats["wait_seconds"] / calls * 1000,
+            self.stats["max_wait_seconds"] * 1000,
+            self.stats["connects"],
+            self.stats["acquire_seconds"] / calls * 1000,
+            self.stats["max_acquire_seconds"] * 1000,
+        )
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        """Add the timing to the total and maximum stats."""
+        with self._lock:
+            self.stats[f"{name}_seconds"] += seconds
+            self.stats[f"max_{name}_seconds"] = max(self.stats[f"max_{name}_seconds"], seconds)
+
+    def acquire_connection(self) -> None:
+        """Make sure the worker has a usable connection, recording the time it took."""
+        started_at = time.perf_counter()
+        connection.close_if_health_check_failed()
+        if connection.connection is None:
+            with self._lock:
+                self.stats["connects"] += 1
+        connection.ensure_connection()
+        self.add_timing("acquire", time.perf_counter() - started_at)
+
+    def call(self, submitted_at: float, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call the function in the worker thread, managing its connection."""
+        self.add_timing("wait", time.perf_counter() - submitted_at)
+        close_old_connections()
+        try:
+            self.acquire_connection()
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    def release(self, *args: Any) -> None:
+        """Mark the worker free, when the call is done or cancelled."""
+        with self._lock:
+            self.busy -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run the function with database access on the pool.
+
+        Context variables of the caller are available to the function.
+
+        :param func: Callable Function accessing the database.
+        """
+        executor = self.executor
+        with self._lock:
+            self.stats["calls"] += 1
+            if self.busy >= self.size:
+                self.stats["saturated_calls"] += 1
+            self.busy += 1
+            self.stats["max_busy"] = max(self.stats["max_busy"], min(self.busy, self.size))
+        context = contextvars.copy_context()
+        future = executor.submit(
+            partial(context.run, self.call, time.perf_counter(), func, *args, **kwargs)
+        )
+        future.add_done_callback(self.release)
+        return await asyncio.wrap_future(future)
+
+    async def fetch(self, queryset: QuerySet) -> list:
+        """
+        Evaluate the queryset on the pool.
+
+        :param queryset: QuerySet Queryset to evaluate.
+        """
+        return await self.run(list, queryset)
+
+    async def first(self, queryset: QuerySet) -> Optional[Model]:
+        """
+        Get the first object of the queryset on the pool.
+
+        :param queryset: QuerySet Queryset to get the object from.
+        """
+        return await self.run(queryset.first)
+
+    def shutdown(self) -> None:
+        """Wait for the running calls, stop the workers and log their stats."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            self.log_stats()
+
+
+db_pool = DatabasePool()
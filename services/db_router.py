@@ -0,0 +1,131 @@
+"""
+Routing of the database reads to the replica.
+
+Reads go to the DATABASE_REPLICA_ALIAS database, writes and migrations to the primary.
+After the first write of the request, its reads go to the primary too, so the request
+sees its own writes despite the replication lag. Replica failing to connect is skipped
+for DATABASE_REPLICA_RETRY_SECONDS, reads go to the primary meanwhile.
+"""
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional, Type
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDatabaseState:
+    """Database usage of the request, shared by the threads running its queries."""
+
+    def __init__(self) -> None:
+        """Initialize state of the request without writes."""
+        self.is_written = False
+
+
+request_database_state: contextvars.ContextVar[
+    Optional[RequestDatabaseState]
+] = contextvars.ContextVar("request_database_state", default=None)
+
+
+class ReplicaRouter:
+    """Database router sending reads to the replica, if it's configured and available."""
+
+    def __init__(self) -> None:
+        """Initialize router with the available replica."""
+        self._lock = threading.Lock()
+        self.unavailable_until = 0.0
+
+    @staticmethod
+    def get_replica_alias() -> Optional[str]:
+        """Get alias of the replica, if it's configured."""
+        alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "replica")
+        return alias if alias in settings.DATABASES else None
+
+    @staticmethod
+    def is_primary_only(model: Type[Model]) -> bool:
+        """Check if the model is read from the primary only, as sessions are."""
+        return model._meta.app_label in getattr(
+            settings, "DATABASE_PRIMARY_APP_LABELS", ("sessions",)
+        )
+
+    def is_replica_available(self, alias: str) -> bool:
+        """
+        Check the replica connection of the current thread, connecting to it if needed.
+
+        :param alias: str Alias of the replica.
+        """
+        if time.monotonic() < self.unavailable_until:
+            return False
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError:
+            logger.warning("Replica database %s is unavailable, reading from primary", alias)
+            with self._lock:
+                self.unavailable_until = time.monotonic() + getattr(
+                    settings, "DATABASE_REPLICA_RETRY_SECONDS", 30
+                )
+            return False
+        return True
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        """
+        Read from the replica unless the request wrote data or runs a transaction.
+
+        Code running outside the requests, like management commands, reads from the primary.
+        """
+        alias = self.get_replica_alias()
+        if alias is None or self.is_primary_only(model):
+            return DEFAULT_DB_ALIAS
+        state = request_database_state.get()
+        if state is None or state.is_written or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias if self.is_replica_available(alias) else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> str:
+        """Write to the primary, the following reads of the request use it too."""
+        if (state := request_database_state.get()) is not None:
+            state.is_written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        """Allow relations between objects of the primary and the replica."""
+        databases = {DEFAULT_DB_ALIAS, self.get_replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        """Migrate the primary only, the replica gets changes by the replication."""
+        return db == DEFAULT_DB_ALIAS
+
+
+@sync_and_async_middleware
+def replica_pinning_middleware(get_response: Callable) -> Callable:
+    """Track writes of every request, to read them from the primary."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request: HttpRequest) -> HttpResponse:
+            token = request_database_state.set(RequestDatabaseState())
+            try:
+                return await get_response(request)
+            finally:
+                request_database_state.reset(token)
+
+    else:
+
+        def middleware(request: HttpRequest) -> HttpResponse:
+            token = request_database_state.set(RequestDatabaseState())
+            try:
+                return get_response(request)
+            finally:
+                request_database_state.reset(token)
+
+    return middleware
@@ -0,0 +1,177 @@
+"""Bounded-concurrency streaming downloads of media files."""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+from weakref import WeakKeyDictionary
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class MediaDownloader:
+    """
+    Download files into the media root without blocking the event loop.
+
+    Concurrent transfers are capped by a semaphore, response body is streamed
+    in large chunks to a temporary file written in a thread and moved to its
+    place atomically, so readers never see partially written files.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        chunk_size: int = 64 * 1024,
+        retries: Optional[int] = None,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        Initialize downloader.
+
+        :param max_concurrency: int | None Transfers running at the same time.
+        :param chunk_size: int Streamed chunk size in bytes.
+        :param retries: int | None Retries of a failed transfer.
+        :param backoff: float Delay before the first retry, doubled on every next one.
+        """
+        self.max_concurrency = max_concurrency or getattr(
+            settings, "MEDIA_DOWNLOADS_CONCURRENCY", 8
+        )
+        self.chunk_size = chunk_size
+        self.retries = (
+            retries if retries is not None else getattr(settings, "MEDIA_DOWNLOADS_RETRIES", 3)
+        )
+        self.backoff = backoff
+        self._semaphores: WeakKeyDictionary = WeakKeyDictionary()
+        self.reset_stats()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Get semaphore of the running event loop, management commands may run several."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    def reset_stats(self) -> None:
+        """Reset transfer counters."""
+        self.stats: Dict[str, float] = {
+            "files": 0,
+            "failed": 0,
+            "retries": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+        }
+
+    def get_throughput(self) -> float:
+        """Get average throughput of the successful transfers in bytes per second."""
+        if not self.stats["seconds"]:
+            return 0.0
+        return self.stats["bytes"] / self.stats["seconds"]
+
+    def log_stats(self) -> None:
+        """Log summary of the transfers since the last stats reset."""
+        logger.info(
+            "Downloaded %d files (%d failed, %d retries), %.1f KB at %.1f KB/s.",
+            self.stats["files"],
+            self.stats["failed"],
+            self.stats["retries"],
+            self.stats["bytes"] / 1024,
+            self.get_throughput() / 1024,
+        )
+
+    async def download(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        file_name: str,
+        headers: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Download file and save it in the media root with the given name.
+
+        Transport errors and 429/5xx responses are retried with exponential backoff.
+        :param client: httpx.AsyncClient Client to perform requests with.
+        :param url: str File url.
+        :param file_name: str File path relative to the media root.
+        :param headers: dict | None Request headers.
+
+        Returns whether the file is saved.
+        """
+        path = os.path.join(settings.MEDIA_ROOT, file_name)
+        async with self.semaphore:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.stats["retries"] += 1
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                try:
+                    status_code = await self.stream_to_file(client, url, path, headers)
+                except httpx.TransportError as exc:
+                    logger.warning("Downloading %s failed: %r.", url, exc)
+                    continue
+                if status_code == 200:
+                    return True
+                if status_code not in RETRY_STATUS_CODES:
+                    break
+                logger.warning("Downloading %s failed with status %d.", url, status_code)
+        self.stats["failed"] += 1
+        return False
+
+    async def stream_to_file(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        path: str,
+        headers: Optional[Dict] = None,
+    ) -> int:
+        """
+        Stream response body into a temporary file and move it to the path.
+
+        Returns response status code, the file is written only for 200 one.
+        """
+        started_at = time.perf_counter()
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code != 200:
+                return response.status_code
+            temporary_path = f"{path}.{id(response)}.part"
+            await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+            file = await asyncio.to_thread(open, temporary_path, "wb")
+            downloaded_bytes = 0
+            try:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    await asyncio.to_thread(file.write, chunk)
+                    downloaded_bytes += len(chunk)
+            except BaseException:
+                await asyncio.to_thread(file.close)
+                await self.remove_files([temporary_path])
+                raise
+            await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, temporary_path, path)
+            self.stats["files"] += 1
+            self.stats["bytes"] += downloaded_bytes
+            self.stats["seconds"] += time.perf_counter() - started_at
+            return response.status_code
+
+    @staticmethod
+    async def remove_files(files_names: Iterable[str]) -> None:
+        """
+        Remove files in a thread, missing ones are skipped.
+
+        :param files_names: Iterable[str] Absolute paths or paths relative to the media root.
+        """
+
+        def remove() -> None:
+            for file_name in files_names:
+                try:
+                    os.remove(os.path.join(settings.MEDIA_ROOT, file_name))
+                except FileNotFoundError:
+                    pass
+
+        await asyncio.to_thread(remove)
+
+
+media_downloader = MediaDownloader()
@@ -0,0 +1,85 @@
+"""Pooled HTTP clients for the outgoing requests of the web process."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CLIENTS_NAMES = ("zoho", "default")
+
+
+class HTTPClients:
+    """
+    Named HTTP clients sharing connections between requests.
+
+    Clients are opened by the ASGI lifespan startup and closed by its shutdown,
+    so connections and TLS sessions to Zoho CRM are reused by all requests
+    of the worker. Clients are bound to the event loop they're opened in:
+    code running in another loop (WSGI workers, management commands)
+    gets a short-lived client instead.
+    """
+
+    def __init__(self) -> None:
+        """Initialize closed clients."""
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def get_options() -> dict:
+        """Get options of the created clients."""
+        return {
+            "timeout": getattr(settings, "HTTP_CLIENTS_TIMEOUT", 30),
+            "limits": httpx.Limits(
+                max_connections=getattr(settings, "HTTP_CLIENTS_MAX_CONNECTIONS", 100),
+                max_keepalive_connections=getattr(
+                    settings, "HTTP_CLIENTS_MAX_KEEPALIVE_CONNECTIONS", 20
+                ),
+            ),
+        }
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the pooled clients are open in the running event loop."""
+        try:
+            return bool(self._clients) and self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def open(self) -> None:
+        """Open pooled clients in the running event loop."""
+        if self._clients:
+            await self.close()
+        self._loop = asyncio.get_running_loop()
+        self._clients = {
+            name: httpx.AsyncClient(**self.get_options()) for name in CLIENTS_NAMES
+        }
+
+    async def close(self) -> None:
+        """Close pooled clients, waiting for their connections to be released."""
+        clients, self._clients, self._loop = self._clients, {}, None
+        results = await asyncio.gather(
+            *(client.aclose() for client in clients.values()), return_exceptions=True
+        )
+        for name, result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.warning("HTTP client %s isn't closed properly: %r", name, result)
+
+    @asynccontextmanager
+    async def client(self, name: str = "default") -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Get the pooled client, or a short-lived one if the pool isn't open in this loop.
+
+        :param name: str Name of the client, one of CLIENTS_NAMES.
+        """
+        if self.is_open:
+            yield self._clients[name]
+        else:
+            async with httpx.AsyncClient(**self.get_options()) as client:
+                yield client
+
+
+http_clients = HTTPClients()
@@ -0,0 +1,170 @@
+"""Responsive derivatives (resized WebP/AVIF variants) of locally stored Zoho CRM images."""
+import asyncio
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from products.models import ZohoImage, ZohoImageDerivative
+
+DEFAULT_WIDTHS = (320, 640, 960, 1280)
+FORMATS_EXTENSIONS = {"WEBP": "webp", "AVIF": "avif"}
+ENCODING_OPTIONS = {
+    "WEBP": {"quality": 80, "method": 6},
+    "AVIF": {"quality": 60, "speed": 6},
+}
+
+
+def get_supported_formats() -> List[str]:
+    """
+    Return derivative formats, that Pillow is able to encode.
+
+    WebP is always used, AVIF only when Pillow is built with it or the
+    'pillow-avif-plugin' package is installed.
+    """
+    try:
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    Image.init()
+    return [image_format for image_format in FORMATS_EXTENSIONS if image_format in Image.SAVE]
+
+
+def build_derivatives(
+    source_path: str, media_root: str, widths: Iterable[int], formats: Iterable[str]
+) -> List[Dict[str, str | int]]:
+    """
+    Resize and re-encode the source image into every width and format.
+
+    Runs inside a worker process, so it takes and returns only picklable values.
+    File names are derived from the source content hash, existing files are reused.
+    :param source_path: str Source file path relative to the media root.
+    :param media_root: str Absolute media root path.
+    :param widths: Iterable[int] Target widths, larger than the source are skipped.
+    :param formats: Iterable[str] Pillow format names.
+
+    Returns list of dicts with 'width', 'format' and 'file' keys.
+    """
+    absolute_source_path = os.path.join(media_root, source_path)
+    with open(absolute_source_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:20]
+
+    result = []
+    with Image.open(absolute_source_path) as source:
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "transparency" in source.info else "RGB")
+        target_widths = sorted({width for width in widths if width < source.width})
+        target_widths.append(source.width)
+        for width in target_widths:
+            height = round(source.height * width / source.width)
+            resized = None
+            for image_format in formats:
+                file_name = (
+                    f"derivatives/{digest[:2]}/{digest}-{width}w."
+                    f"{FORMATS_EXTENSIONS[image_format]}"
+                )
+                absolute_file_name = os.path.join(media_root, file_name)
+                if not os.path.exists(absolute_file_name):
+                    if resized is None:
+                        resized = (
+                            source
+                            if width == source.width
+                            else source.resize((width, height), Image.LANCZOS)
+                        )
+                    os.makedirs(os.path.dirname(absolute_file_name), exist_ok=True)
+                    temporary_file_name = f"{absolute_file_name}.{os.getpid()}.tmp"
+                    resized.save(
+                        temporary_file_name,
+                        image_format,
+                        **ENCODING_OPTIONS.get(image_format, {}),
+                    )
+                    os.replace(temporary_file_name, absolute_file_name)
+                result.append({"width": width, "format": image_format, "file": file_name})
+    return result
+
+
+class ImageDerivativesBuilder:
+    """Builds derivatives in a process pool and records them alongside ZohoImage."""
+
+    def __init__(self) -> None:
+        """Initialize builder without starting the pool, it's created on first use."""
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Get or create process pool for image encoding."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_DERIVATIVES_WORKERS", None)
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shutdown process pool, waiting for the running encodings."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def build_for_images(self, images: Iterable[ZohoImage]) -> List[ZohoImageDerivative]:
+        """
+        Build derivatives of the given images and save their records.
+
+        Images, that failed to be processed (missing or broken files), are skipped.
+        :param images: Iterable[ZohoImage] Images to process.
+        """
+        loop = asyncio.get_running_loop()
+        widths = getattr(settings, "IMAGE_DERIVATIVES_WIDTHS", DEFAULT_WIDTHS)
+        formats = get_supported_formats()
+        images = [image for image in images if image.image]
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor,
+                    build_derivatives,
+                    image.image.name,
+                    str(settings.MEDIA_ROOT),
+                    widths,
+                    formats,
+                )
+                for image in images
+            ),
+            return_exceptions=True,
+        )
+        derivatives = [
+            ZohoImageDerivative(image=image, **derivative)
+            for image, image_derivatives in zip(images, results)
+            if not isinstance(image_derivatives, BaseException)
+            for derivative in image_derivatives
+        ]
+        return await ZohoImageDerivative.objects.abulk_create(
+            derivatives, ignore_conflicts=True
+        )
+
+    @staticmethod
+    async def get_images_srcsets(images_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Get 'srcset' attribute values of the images, grouped by derivative format.
+
+        Returns dict like one:
+        {3465: {"webp": "/media/derivatives/...-320w.webp 320w, ...", "avif": "..."}}
+        """
+        grouped: Dict = defaultdict(lambda: defaultdict(list))
+        async for derivative in ZohoImageDerivative.objects.filter(
+            image_id__in=images_ids
+        ).order_by("width"):
+            grouped[derivative.image_id][FORMATS_EXTENSIONS[derivative.format]].append(
+                f"{default_storage.url(derivative.file.name)} {derivative.width}w"
+            )
+        return {
+            image_id: {image_format: ", ".join(urls) for image_format, urls in formats.items()}
+            for image_id, formats in grouped.items()
+        }
+
+
+image_derivatives_builder = ImageDerivativesBuilder()
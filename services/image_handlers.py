@@ -1,20 +1,26 @@
 """Handlers for fetching and saving Zoho CRM images."""
 import asyncio
-import os
 from collections import defaultdict, namedtuple
 from typing import Dict, List, Set, Tuple
 
 import httpx
+from django.core.cache import cache
 from django.db.models import QuerySet
 
 from products.models import ZohoImage, ZohoModuleRecord
-from services.crm_interface import custom_record_operations, image_handler
+from services.crm_interface import image_handler
+from services.downloads import media_downloader
+from services.image_derivatives import image_derivatives_builder
+from services.media_store import media_store
 
 
 class ProductImageHandler:
     """Handler for getting images for products."""
 
-    Image: Tuple = namedtuple("Image", ["id", "slug", "file_name"])
+    Image: Tuple = namedtuple(
+        "Image", ["id", "slug", "file_name", "size", "file_id"], defaults=(None, None)
+    )
+    IMAGES_INDEX_CACHE_KEY: str = "products_images_index"
 
     async def embed_products_image(
         self, data_list: List[Dict], is_many: bool = False, **kwargs
@@ -22,83 +28,188 @@ class ProductImageHandler:
         """
         Add image key/value to dict.
 
+        Images are taken from the precomputed index, which is refreshed by the
+        'sync_zoho_images' management command, so no Zoho CRM requests are made here.
         :param data_list: list[dict] Data dicts list.
         :param is_many: bool Tells whether we need to fetch all possible images to
             every products or the first one.
         """
         if data_list:
-            data_with_images = await custom_record_operations.get_records(
-                "products_base",
-                ["id", "images", "slug"],
-                [item.get("id") for item in data_list],
+            images_index = await self.get_images_index()
+            images_dict, srcsets_dict = self.create_products_images_dicts(
+                data_list, images_index, is_many
             )
-            images_dict = await self.get_or_load_and_create_images(data_with_images, is_many)
-            self.insert_images_in_data_dicts(data_list, images_dict, is_many)
+            self.insert_images_in_data_dicts(data_list, images_dict, is_many, srcsets_dict)
         return data_list
 
-    async def get_or_load_and_create_images(
-        self, data_images: List[Dict], is_many: bool
-    ) -> Dict:
+    @staticmethod
+    def create_products_images_dicts(
+        data_list: List[Dict], images_index: Dict, is_many: bool
+    ) -> Tuple[Dict, Dict]:
         """
-        Get product image data from local db.
+        Create dicts with product_id/images and product_id/srcsets as key/values.
 
-        If Zoho CRM products list contains images not present in local db,
-        load them in local db.
-        :param data_images: list[dict] Products with images field.
+        :param data_list: list[dict] Products dicts list.
+        :param images_index: dict Images index, see 'refresh_images_index'.
         :param is_many: bool Is many images or first one needed.
         """
-        images_dict: Dict = self.create_images_dict(data_images, is_many)
-        local_images: List = await ZohoImage.avalues_list(id__in=images_dict)
-        if len(local_images) != len(images_dict):
-            images_dict, outdated_ids = self.get_missing_and_outdated_images_ids(
-                images_dict=images_dict, saved_images=local_images
-            )
-            local_images.extend(await self.create_images_in_local_db(images_dict))
-            await self.delete_zoho_image_instances(outdated_ids)
-        return await self.create_products_images_dict(local_images)
+        images_dict: Dict = dict()
+        srcsets_dict: Dict = dict()
+        for item in data_list:
+            product_id = int(item.get("id"))
+            product_images = images_index.get(product_id, list())
+            if not is_many:
+                product_images = product_images[:1]
+            images_dict[product_id] = [
+                ZohoImage(image=image["name"]).image for image in product_images
+            ]
+            srcsets_dict[product_id] = [image["srcset"] for image in product_images]
+        return images_dict, srcsets_dict
 
     @staticmethod
     def insert_images_in_data_dicts(
-        products_list: List[Dict], images_dict: Dict, is_many: bool
+        products_list: List[Dict],
+        images_dict: Dict,
+        is_many: bool,
+        srcsets_dict: Dict | None = None,
     ) -> List[Dict]:
         """
-        Insert images into products list dicts.
+        Insert images and their derivatives 'srcset' values into products list dicts.
 
         Delete, if there is, unused 'images' keys.
         """
+        srcsets_dict = srcsets_dict or {}
         for item in products_list:
-            if values := images_dict.get(int(item.get("id")), list()):
+            product_id = int(item.get("id"))
+            srcsets = srcsets_dict.get(product_id, list())
+            if values := images_dict.get(product_id, list()):
                 if not is_many:
                     item["image"] = values[0]
+                    item["image_srcset"] = srcsets[0] if srcsets else {}
                     item.pop("images", None)
                     continue
             item["images"] = values
+            item["images_srcset"] = srcsets
         return products_list
 
+    async def get_images_index(self) -> Dict:
+        """Get images index from cache, building it from the local db if it's missing."""
+        images_index = await cache.aget(self.IMAGES_INDEX_CACHE_KEY)
+        if images_index is None:
+            images_index = await self.refresh_images_index()
+        return images_index
+
+    async def refresh_images_index(self) -> Dict:
+        """
+        Build images index from the local db and save it in cache without expiration.
+
+        Returns dict like one:
+        {3465: [{"name": "products_base/rose/rose.jpg", "srcset": {"webp": "..."}}]}
+        """
+        images = [
+            image
+            async for image in ZohoImage.objects.filter(
+                zoho_record__module_name="products_base"
+            ).order_by("zoho_record_id", "position", "id")
+        ]
+        images_srcsets = await image_derivatives_builder.get_images_srcsets(
+            [image.id for image in images]
+        )
+        images_index: Dict = defaultdict(list)
+        for image in images:
+            images_index[image.zoho_record_id].append(
+                {"name": image.image.name, "srcset": images_srcsets.get(image.id, {})}
+            )
+        images_index = dict(images_index)
+        await cache.aset(self.IMAGES_INDEX_CACHE_KEY, images_index, timeout=None)
+        return images_index
+
+    async def sync_products_images(self, records: List[Dict], is_full: bool = False) -> Dict:
+        """
+        Synchronize local images with the given Zoho CRM products records.
+
+        Downloads missing images, deletes outdated ones, builds derivatives of the
+        downloaded images and refreshes the images index.
+        :param records: list[dict] Products records with 'id', 'images' and 'slug' fields.
+        :param is_full: bool Whether records are all the module records, so images of
+            the absent products have to be deleted as well.
+
+        Returns refreshed images index.
+        """
+        images_dict: Dict = self.create_images_dict(records, is_many=True)
+        local_images: QuerySet = ZohoImage.objects.filter(
+            zoho_record__module_name="products_base"
+        )
+        if not is_full:
+            local_images = local_images.filter(
+                zoho_record_id__in=[int(record.get("id")) for record in records]
+            )
+        missing_images_dict, outdated_ids = self.get_missing_and_outdated_images_ids(
+            images_dict=dict(images_dict), saved_images=[image async for image in local_images]
+        )
+        created_images = await self.create_images_in_local_db(missing_images_dict)
+        await self.delete_zoho_image_instances(outdated_ids)
+        await self.update_images_positions(images_dict)
+        await image_derivatives_builder.build_for_images(created_images)
+        return await self.refresh_images_index()
+
     @staticmethod
-    async def create_products_images_dict(local_images: QuerySet | List) -> Dict:
+    async def update_images_positions(images_dict: Dict) -> None:
         """
-        Create dict with product_id/product_images_list as key/values.
+        Save images order inside their products, as it is in Zoho CRM.
 
-        :param local_images: Queryset with local images.
+        :param images_dict: dict Zoho image id/Image namedtuple as key/values,
+            see 'create_images_dict'.
         """
-        products_images_dict: Dict = defaultdict(list)
-        for image in local_images:
-            products_images_dict[image.zoho_record_id].append(image.image)
-        return products_images_dict
+        positions: Dict = dict()
+        products_counters: Dict = defaultdict(int)
+        for image_id, image_data in images_dict.items():
+            positions[image_id] = products_counters[image_data.id]
+            products_counters[image_data.id] += 1
+        images = [image async for image in ZohoImage.objects.filter(id__in=positions)]
+        for image in images:
+            image.position = positions[image.id]
+        await ZohoImage.objects.abulk_update(images, ["position"])
 
     async def create_images_in_local_db(self, images_dict: Dict) -> List:
         """
-        Check whether input dicts have equal length.
+        Save not stored images in local db, keeping their files in the media store.
 
-        If they don't have, load and save not stored images in local db.
+        Images, which metadata matches already stored content or another image of
+        the same batch, aren't downloaded.
         :param images_dict: Dict Loaded images data from Zoho CRM.
         """
-        files_names = await self.download_images_and_get_files_names(images_dict)
-        images_ids_and_data = zip(images_dict.keys(), images_dict.values())
-        image_objects: List = await self.get_downloaded_images_objects_list(
-            files_names, images_ids_and_data
-        )
+        blobs: Dict = await media_store.find_known_blobs(images_dict)
+        images_to_download: Dict = dict()
+        duplicates: Dict = dict()
+        downloaded_keys: Dict = dict()
+        for image_id, image_data in images_dict.items():
+            if image_id in blobs:
+                continue
+            keys = media_store.get_metadata_keys(
+                image_data.file_id, image_data.file_name, image_data.size
+            )
+            if original_id := next(
+                (downloaded_keys[key] for key in keys if key in downloaded_keys), None
+            ):
+                duplicates[image_id] = original_id
+                continue
+            downloaded_keys.update({key: image_id for key in keys})
+            images_to_download[image_id] = image_data
+
+        files_names = await self.download_images_and_get_files_names(images_to_download)
+        for (image_id, image_data), file_name in zip(images_to_download.items(), files_names):
+            if file_name:
+                blobs[image_id] = await media_store.ingest(file_name, image_data.file_name)
+        for image_id, original_id in duplicates.items():
+            if original_id in blobs:
+                blobs[image_id] = blobs[original_id]
+        for image_id, blob in blobs.items():
+            image_data = images_dict[image_id]
+            await media_store.add_alias(
+                blob, image_id, image_data.file_name, image_data.size, image_data.file_id
+            )
+        image_objects: List = await self.get_downloaded_images_objects_list(blobs, images_dict)
         return await ZohoImage.objects.abulk_create(image_objects)
 
     @staticmethod
@@ -120,7 +231,10 @@ class ProductImageHandler:
         """
         coroutines = []
 
-        async with httpx.AsyncClient(headers=image_handler.connector.headers) as client:
+        async with httpx.AsyncClient(
+            headers=image_handler.connector.headers,
+            limits=httpx.Limits(max_connections=media_downloader.max_concurrency),
+        ) as client:
             for image_id, image_data in images_dict.items():
                 coroutines.append(
                     image_handler.download_zoho_crm_attachment_file(
@@ -130,35 +244,34 @@ class ProductImageHandler:
                         image_data.slug,
                         image_data.file_name,
                         client,
+                        media_store.get_staging_name(image_id, image_data.file_name),
                     )
                 )
-            return await asyncio.gather(*coroutines)
+            files_names = await asyncio.gather(*coroutines)
+        media_downloader.log_stats()
+        return files_names
 
     @staticmethod
-    async def get_downloaded_images_objects_list(
-        files_names: Tuple[
-            str | BaseException,
-            str | BaseException,
-            str | BaseException,
-            str | BaseException,
-            str | BaseException,
-        ],
-        images_ids_and_data,
-    ) -> List:
-        """To save images as records locally in DB."""
+    async def get_downloaded_images_objects_list(blobs: Dict, images_dict: Dict) -> List:
+        """
+        To save images as records locally in DB.
+
+        :param blobs: dict Zoho image id/stored blob as key/values.
+        :param images_dict: Dict Loaded images data from Zoho CRM.
+        """
         result = []
-        for file_name, (image_id, image_data) in zip(files_names, images_ids_and_data):
-            zoho_module_record = await ZohoModuleRecord.objects.aget_or_create(
+        for image_id, image_data in images_dict.items():
+            zoho_module_record = await ZohoModuleRecord.objects.aupdate_or_create(
                 id=image_data.id,
-                module_name="products_base",
-                record_name=image_data.slug,
+                defaults={"module_name": "products_base", "record_name": image_data.slug},
             )
-            if file_name:
+            if blob := blobs.get(image_id):
                 result.append(
                     ZohoImage(
                         id=image_id,
                         zoho_record=zoho_module_record[0],
-                        image=file_name,
+                        image=blob.file.name,
+                        blob=blob,
                     )
                 )
         return result
@@ -168,9 +281,19 @@ class ProductImageHandler:
         """
         Delete ZohoImage instances with ids in outdated_images_ids.
 
+        Files of the images kept outside the media store are removed too,
+        stored blobs are left to the garbage collection.
         :param outdated_images_ids: set[int] Set with instances id.
         """
-        await ZohoImage.objects.filter(id__in=outdated_images_ids).adelete()
+        outdated_images = ZohoImage.objects.filter(id__in=outdated_images_ids)
+        files_names = [
+            name
+            async for name in outdated_images.filter(blob__isnull=True).values_list(
+                "image", flat=True
+            )
+        ]
+        await outdated_images.adelete()
+        await media_downloader.remove_files(files_names)
 
     @staticmethod
     def get_missing_and_outdated_images_ids(
@@ -190,7 +313,6 @@ class ProductImageHandler:
         for image in saved_images:
             if image.id not in images_dict:
                 outdated_images_ids.add(image.id)
-                os.remove(f"media/{image.image}")
             else:
                 images_dict.pop(image.id)
         return images_dict, outdated_images_ids
@@ -211,6 +333,8 @@ class ProductImageHandler:
                         id=int(item.get("id")),
                         slug=item.get("slug"),
                         file_name=image.get_file_name(),
+                        size=image.get_size(),
+                        file_id=image.get_file_id(),
                     )
                     if not is_many:
                         break
@@ -240,10 +364,34 @@ class SubcategoryImageHandler:
         await self.update_subcategories_dict_with_mised_images(
             subcategories, subcategories_dict
         )
+        images_srcsets = await self.get_images_srcsets(subcategories_dict)
         for subcategory in subcategories:
             subcategory["image"] = subcategories_dict[subcategory["id"]]
+            subcategory["image_srcset"] = images_srcsets.get(subcategory["id"], {})
         return subcategories
 
+    @staticmethod
+    async def get_images_srcsets(subcategories_dict: Dict) -> Dict[int, Dict[str, str]]:
+        """
+        Get 'srcset' values of the subcategories images, that have derivatives.
+
+        Missing derivatives are built in background, see 'build_missing_derivatives'.
+        :param subcategories_dict: Dict Subcategories id:image dict.
+        """
+        return await image_derivatives_builder.get_images_srcsets(
+            [image.id for image in subcategories_dict.values() if image]
+        )
+
+    @staticmethod
+    async def build_missing_derivatives() -> int:
+        """Build derivatives of the stored subcategories images, return their amount."""
+        images = ZohoImage.objects.filter(
+            zoho_record__module_name="subcategories", derivatives__isnull=True
+        ).distinct()
+        return len(
+            await image_derivatives_builder.build_for_images([image async for image in images])
+        )
+
     @staticmethod
     async def create_subcategories_dict_with_refreshing_local_db(
         subcategories: List,
@@ -253,15 +401,18 @@ class SubcategoryImageHandler:
             zoho_record__module_name="subcategories"
         )
         images_for_deletion: List = []
+        files_for_deletion: List = []
         subcategories_dict: Dict = {subcategory["id"]: None for subcategory in subcategories}
         async for image in local_db_subcategories_images:
             if image.id in subcategories_dict:
                 subcategories_dict[image.id] = image
             else:
                 images_for_deletion.append(image.id)
-                os.remove(image.image.url[1:])
+                if not image.blob_id:
+                    files_for_deletion.append(image.image.name)
         if images_for_deletion:
             await ZohoImage.objects.filter(id__in=images_for_deletion).adelete()
+            await media_downloader.remove_files(files_for_deletion)
         return subcategories_dict
 
     @staticmethod
@@ -282,7 +433,9 @@ class SubcategoryImageHandler:
 
         if subcategories_wo_images:
             coroutines = []
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=media_downloader.max_concurrency)
+            ) as client:
                 for subcategory in subcategories_wo_images:
                     coroutines.append(
                         image_handler.download_subcategory_photo(subcategory, client)
@@ -295,10 +448,12 @@ class SubcategoryImageHandler:
                     record_name=subcategory["slug"],
                 )
                 if subcategory["path"]:
+                    blob = await media_store.ingest(subcategory["path"])
                     image = ZohoImage(
                         id=subcategory["id"],
                         zoho_record=zoho_record,
-                        image=subcategory["path"],
+                        image=blob.file.name,
+                        blob=blob,
                     )
                     subcategories_images.append(image)
                     subcategories_dict[subcategory["id"]] = image
@@ -0,0 +1,88 @@
+"""ASGI lifespan hooks of the web process."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from django.http import HttpResponseServerError
+
+from services.data_getters import crm_data
+from services.db import db_pool
+from services.http_clients import http_clients
+from services.utils import formatters
+
+logger = logging.getLogger(__name__)
+
+ASGIApplication = Callable[[dict, Callable, Callable], Awaitable[None]]
+
+
+async def warm_up_caches() -> None:
+    """
+    Fill the catalog caches, so the first requests of the worker don't wait for Zoho CRM.
+
+    Navigation data and products of every region are fetched concurrently.
+    """
+    regions, currencies, *_ = await asyncio.gather(
+        crm_data.get_regions_list(None),
+        crm_data.get_currency_list(None),
+        crm_data.get_categories_list(),
+        crm_data.get_subcategories_list(),
+    )
+    if isinstance(regions, HttpResponseServerError) or isinstance(
+        currencies, HttpResponseServerError
+    ):
+        logger.warning("Catalog caches aren't warmed up: regions or currencies are empty")
+        return
+    currencies_lookup = formatters.format_currencies_lookup(currencies)
+    await asyncio.gather(
+        *(
+            crm_data.get_region_products(
+                region["slug"],
+                currency=currencies_lookup.get(region["default_currency"].lower()),
+            )
+            for region in regions
+        )
+    )
+    await crm_data.get_navigation_version()
+
+
+async def startup() -> None:
+    """Open pooled HTTP clients and warm up the catalog caches."""
+    await http_clients.open()
+    try:
+        await warm_up_caches()
+    except Exception:
+        logger.exception("Catalog caches aren't warmed up")
+
+
+async def shutdown() -> None:
+    """Drain and close pooled HTTP clients, wait for the running database queries."""
+    await http_clients.close()
+    await asyncio.get_running_loop().run_in_executor(None, db_pool.shutdown)
+
+
+def lifespan_application(application: ASGIApplication) -> ASGIApplication:
+    """
+    Wrap Django ASGI application to handle lifespan protocol, Django handles HTTP only.
+
+    :param application: Django ASGI application.
+    """
+
+    async def wrapper(scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "lifespan":
+            await application(scope, receive, send)
+            return
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await startup()
+                except Exception as exc:
+                    await send({"type": "lifespan.startup.failed", "message": repr(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    return wrapper
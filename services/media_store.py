@@ -0,0 +1,181 @@
+"""Content-addressed storage of the downloaded media files."""
+import asyncio
+import glob
+import hashlib
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Count, Q
+
+from products.models import MediaBlob, MediaBlobAlias, ZohoImageDerivative
+from services.downloads import media_downloader
+
+BLOBS_DIRECTORY = "blobs"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """Get SHA-256 hex digest and size of the file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def move_file(source_path: str, target_path: str) -> None:
+    """Move file, creating target directories."""
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    os.replace(source_path, target_path)
+
+
+class MediaStore:
+    """
+    Stores every unique file content once under 'blobs/ab/<sha256>.<ext>'.
+
+    ZohoImage records reference blobs, blobs without references are removed by
+    the 'collect_media_garbage' management command. Zoho CRM attachments metadata
+    is remembered as aliases, so already stored content isn't downloaded again.
+    """
+
+    @staticmethod
+    def get_blob_name(sha256: str, extension: str) -> str:
+        """Get blob file name relative to the media root."""
+        return f"{BLOBS_DIRECTORY}/{sha256[:2]}/{sha256}{extension.lower()}"
+
+    @staticmethod
+    def get_staging_name(attachment_id: int | str, file_name: str) -> str:
+        """Get temporary name for a file being downloaded before it's stored."""
+        return f"{BLOBS_DIRECTORY}/incoming/{attachment_id}{os.path.splitext(file_name)[1]}"
+
+    @staticmethod
+    def get_metadata_keys(file_id: Optional[str], file_name: str, size: Optional[int]) -> List:
+        """
+        Get keys identifying attachment content by its metadata.
+
+        Zoho file id is used if there is, then file name with size.
+        Returns empty list when metadata isn't enough to tell the content.
+        """
+        keys: List = []
+        if file_id:
+            keys.append(("file_id", file_id))
+        if size:
+            keys.append(("name", file_name, int(size)))
+        return keys
+
+    async def find_known_blobs(self, images_dict: Dict) -> Dict[int, MediaBlob]:
+        """
+        Find stored blobs of the Zoho CRM images by their metadata, with one query.
+
+        :param images_dict: dict Zoho image id as key and namedtuple with 'file_name',
+            'size' and 'file_id' as value.
+
+        Returns dict with Zoho image id/blob as key/values for the known images.
+        """
+        if not images_dict:
+            return {}
+        files_ids = {data.file_id for data in images_dict.values() if data.file_id}
+        files_names = {data.file_name for data in images_dict.values() if data.size}
+        aliases = MediaBlobAlias.objects.select_related("blob").filter(
+            Q(attachment_id__in=images_dict)
+            | Q(file_id__in=files_ids)
+            | Q(file_name__in=files_names)
+        )
+        by_attachment: Dict = {}
+        by_metadata: Dict = {}
+        async for alias in aliases:
+            by_attachment[alias.attachment_id] = alias.blob
+            for key in self.get_metadata_keys(alias.file_id, alias.file_name, alias.size):
+                by_metadata[key] = alias.blob
+        known_blobs: Dict = {}
+        for image_id, data in images_dict.items():
+            blob = by_attachment.get(image_id) or next(
+                (
+                    by_metadata[key]
+                    for key in self.get_metadata_keys(data.file_id, data.file_name, data.size)
+                    if key in by_metadata
+                ),
+                None,
+            )
+            if blob:
+                known_blobs[image_id] = blob
+        return known_blobs
+
+    async def ingest(self, file_name: str, original_name: Optional[str] = None) -> MediaBlob:
+        """
+        Move a file from the media root into the store.
+
+        If the same content is already stored, the file is removed instead.
+        :param file_name: str File path relative to the media root.
+        :param original_name: str | None Name to take the extension from.
+        """
+        path = os.path.join(settings.MEDIA_ROOT, file_name)
+        sha256, size = await asyncio.to_thread(hash_file, path)
+        if blob := await MediaBlob.objects.filter(sha256=sha256).afirst():
+            await media_downloader.remove_files([path])
+            return blob
+        blob_name = self.get_blob_name(sha256, os.path.splitext(original_name or file_name)[1])
+        await asyncio.to_thread(move_file, path, os.path.join(settings.MEDIA_ROOT, blob_name))
+        try:
+            return await MediaBlob.objects.acreate(sha256=sha256, file=blob_name, size=size)
+        except IntegrityError:
+            return await MediaBlob.objects.aget(sha256=sha256)
+
+    @staticmethod
+    async def add_alias(
+        blob: MediaBlob,
+        attachment_id: int,
+        file_name: str,
+        size: Optional[int] = None,
+        file_id: Optional[str] = None,
+    ) -> None:
+        """Remember that Zoho CRM attachment has the content of the blob."""
+        await MediaBlobAlias.objects.aupdate_or_create(
+            attachment_id=attachment_id,
+            defaults={
+                "blob": blob,
+                "file_name": file_name,
+                "size": size,
+                "file_id": file_id or "",
+            },
+        )
+
+    async def collect_garbage(self, created_before: datetime) -> List[str]:
+        """
+        Delete blobs, that aren't referenced by any image, with their files.
+
+        Derivatives files built from the blob content are removed as well.
+        :param created_before: datetime Only older blobs are deleted, so the ones
+            being stored by a running synchronization are kept.
+
+        Returns removed blobs files names.
+        """
+        unreferenced_blobs = MediaBlob.objects.annotate(references=Count("images")).filter(
+            references=0, created_at__lt=created_before
+        )
+        blobs = [blob async for blob in unreferenced_blobs]
+        if not blobs:
+            return []
+        files_names = [blob.file.name for blob in blobs]
+        for blob in blobs:
+            derivatives_prefix = f"derivatives/{blob.sha256[:2]}/{blob.sha256[:20]}-"
+            if not await ZohoImageDerivative.objects.filter(
+                file__startswith=derivatives_prefix
+            ).aexists():
+                files_names.extend(
+                    await asyncio.to_thread(
+                        glob.glob,
+                        os.path.join(settings.MEDIA_ROOT, f"{derivatives_prefix}*"),
+                    )
+                )
+        await MediaBlob.objects.filter(id__in=[blob.id for blob in blobs]).adelete()
+        await media_downloader.remove_files(files_names)
+        return files_names
+
+
+media_store = MediaStore()
@@ -1,19 +1,33 @@
 """Module for general data mixins for 'API' project."""
+import asyncio
+from functools import partial
 from typing import Any, Optional
 
 from asgiref.sync import sync_to_async
-from django.http import HttpRequest, HttpResponseServerError
+from django.http import HttpRequest, HttpResponse, HttpResponseServerError
+from django.middleware.csrf import get_token
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 
+from cart.app_services.cart import Cart
+from cart.app_services.session_data import session_data
 from config.constants import Constants
 from mainpage.models import CustomCategories
 from services.client_handlers import client_handler
+from services.context_loader import ContextLoader, Dataset
 from services.data_getters import crm_data
-from services.utils import formatters, utilities
+from services.db import db_pool
+from services.page_cache import page_cache
+from services.request_timing import timed
+from services.utils import formatters, get_data_version, utilities
 
 
 class ApplicationMixin:
     """Mixin with data fetching in every view."""
 
+    context_loader: Optional[ContextLoader] = None
+
     def __init__(self) -> None:
         """Initialize the ApplicationMixin object."""
         self.kwargs: Optional[dict] = None
@@ -42,12 +56,16 @@ class ApplicationMixin:
         """
         To fetch general context variables.
 
-        This method populates the 'context' dictionary with the following data:
+        Datasets of the view are loaded concurrently by 'ContextLoader', see
+        'get_context_datasets'. This method populates the 'context' dictionary
+        with the datasets and the following data:
         - 'region'
         - 'currencies'
         - 'selected_currency'
         - 'categories'
         - 'custom_categories'
+        - 'navigation_version', the key of the cached header and footer fragments
+        - 'cart_products_quantity'
 
         Args:
             **context (Any): Additional context data.
@@ -55,20 +73,121 @@ class ApplicationMixin:
         Returns:
             Dict: The context dictionary.
         """
-        regions = await crm_data.get_regions_list(self.request)
-        if isinstance(regions, HttpResponseServerError):
-            return regions
-        context = await self.__get_selected_region(context, regions)
-        context = await self.__get_selected_currency(self.request, context, regions)
-        if isinstance(context, HttpResponseServerError):
-            return context
+        self.context_loader = ContextLoader(self.get_context_datasets(**context))
+        try:
+            datasets = await self.context_loader.load()
+        except asyncio.TimeoutError:
+            return HttpResponseServerError(
+                render(
+                    self.request,
+                    "core_components/notification.html",
+                    {
+                        "header": "Server error",
+                        "message_top": "We are so sorry, but the shop data isn't \
+                            loaded in time",
+                        "message_bottom": "Please, try again in a moment",
+                        "redirect_link": ".",
+                        "redirect_message": "Repeat",
+                    },
+                ),
+                status=503,
+            )
+        for name in ("regions", "currencies"):
+            if isinstance(datasets[name], HttpResponseServerError):
+                return datasets[name]
+        context.update(datasets)
         self.__process_selected_currency(context)
-        context = await self.__get_categories(context)
-        context["cart_products_quantity"] = (
-            await sync_to_async(self.request.session.get)("cart", {})
-        ).get("quantity", 0)
+        context["cart_products_quantity"] = self.request.session.get("cart", {}).get(
+            "quantity", 0
+        )
         return context
 
+    def get_context_datasets(self, **context: Any) -> dict[str, Dataset]:
+        """
+        Get datasets of the page context, views extend them with the datasets they need.
+
+        Args:
+            **context (Any): Context data, 'region_slug' is taken from it.
+
+        Returns:
+            dict: Datasets by the names of the context variables.
+        """
+        return {
+            "regions": Dataset(partial(crm_data.get_regions_list, self.request)),
+            "currencies": Dataset(partial(crm_data.get_currency_list, self.request)),
+            "categories_list": Dataset(crm_data.get_categories_list),
+            "subcategories_list": Dataset(crm_data.get_subcategories_list),
+            "region": Dataset(
+                partial(self.load_region, context.get("region_slug")), ("regions",)
+            ),
+            "selected_currency": Dataset(
+                self.load_selected_currency, ("regions", "currencies", "region")
+            ),
+            "categories": Dataset(
+                self.load_categories, ("categories_list", "subcategories_list")
+            ),
+            "custom_categories": Dataset(self.load_custom_categories, ("categories",)),
+            "navigation_version": Dataset(
+                self.load_navigation_version,
+                ("regions", "currencies", "subcategories_list", "custom_categories"),
+            ),
+        }
+
+    async def get_request_region(
+        self, region_slug: Optional[str] = None
+    ) -> dict[str, Any] | HttpResponseServerError:
+        """
+        Get the region of the request without building the rest of the common context.
+
+        Region is found by the slug, if it's passed, by the client location otherwise,
+        with the precomputed regions lookup maps. Default region is used if it's not found.
+
+        Args:
+            region_slug (str | None): Region slug from the url.
+
+        Returns:
+            dict | HttpResponseServerError: The region dictionary.
+        """
+        regions_lookup = await crm_data.get_regions_lookup(self.request)
+        if isinstance(regions_lookup, HttpResponseServerError):
+            return regions_lookup
+        region = None
+        if region_slug:
+            region = regions_lookup["slug"].get(region_slug.lower())
+        else:
+            region = await client_handler.get_client_region_by_lookup(
+                self.request, regions_lookup
+            )
+        return region or regions_lookup["slug"].get(Constants.DEFAULT_REGION_SLUG)
+
+    async def get_request_region_and_currency(
+        self, region_slug: Optional[str] = None
+    ) -> tuple[dict[str, Any], dict[str, Any] | None] | HttpResponseServerError:
+        """
+        Get the region and selected currency for the endpoints, that don't render pages.
+
+        Currency is taken by the 'currency' query parameter, region default one is used
+        if it isn't passed or found.
+
+        Args:
+            region_slug (str | None): Region slug from the url.
+
+        Returns:
+            tuple | HttpResponseServerError: The region and currency dictionaries.
+        """
+        region = await self.get_request_region(region_slug)
+        if isinstance(region, HttpResponseServerError):
+            return region
+        currencies_lookup = await crm_data.get_currencies_lookup(self.request)
+        if isinstance(currencies_lookup, HttpResponseServerError):
+            return currencies_lookup
+        currency = None
+        if currency_name := self.request.GET.get("currency"):
+            currency = currencies_lookup.get(currency_name.lower())
+        if currency is None and region:
+            currency = currencies_lookup.get(region["default_currency"].lower())
+        return region, currency
+
     def __process_selected_currency(self, context):
         """
         Process the selected currency in the context.
@@ -84,68 +203,269 @@ class ApplicationMixin:
             raise HttpResponseServerError()
         context["currencies"].remove(context["selected_currency"])
 
-    async def __get_selected_region(self, context, regions):
+    async def load_region(
+        self, region_slug: Optional[str], regions: list[dict[str, str]]
+    ) -> dict | None:
         """
-        Get the selected region and set it in the 'context' dictionary.
+        Get the selected region by the slug or the client location, default one otherwise.
 
         Args:
-            context: The context dictionary.
+            region_slug (str | None): Region slug from the url.
             regions: List of regions.
 
         Returns:
-            Dict: The updated context dictionary.
+            dict | None: The region or None if the regions aren't got.
         """
-        if region_slug := context.get("region_slug"):
-            context["region"] = self.get_region(regions, region_slug)
+        if isinstance(regions, HttpResponseServerError):
+            return None
+        if region_slug:
+            region = self.get_region(regions, region_slug)
         else:
-            context["region"] = await client_handler.get_client_region(self.request, regions)
-        if not context.get("region"):
-            context["region"] = self.get_region(regions)
-        return context
+            region = await client_handler.get_client_region(self.request, regions)
+        return region or self.get_region(regions)
 
-    async def __get_selected_currency(self, request: HttpRequest, context, regions):
+    async def load_selected_currency(
+        self,
+        regions: list[dict[str, str]],
+        currencies: list[dict[str, str]],
+        region: dict | None,
+    ) -> dict | None:
         """
-        Get the selected currency and set it in the 'context' dictionary.
+        Get the currency by the 'currency' query parameter, region default one otherwise.
 
         Args:
-            context: The context dictionary.
+            regions: List of regions.
+            currencies: List of currencies.
+            region (dict | None): The selected region.
 
         Returns:
-            Dict: The updated context dictionary.
+            dict | None: The selected currency.
         """
-        currencies = context["currencies"] = await crm_data.get_currency_list(request)
-        if isinstance(currencies, HttpResponseServerError):
-            return currencies
-
+        if isinstance(currencies, HttpResponseServerError) or region is None:
+            return None
+        selected_currency = None
         if selected_currency_name_qparam := self.request.GET.get("currency"):
-            context["selected_currency"] = utilities.get_selected_currency(
+            selected_currency = utilities.get_selected_currency(
                 currencies, selected_currency_name_qparam
             )
-        if not context.get("selected_currency"):
+        if not selected_currency:
             default_regions_currencies = formatters.format_regions_default_currencies(regions)
-            context["selected_currency"] = utilities.get_selected_currency(
-                currencies, default_regions_currencies.get(context["region"]["slug"])
+            selected_currency = utilities.get_selected_currency(
+                currencies, default_regions_currencies.get(region["slug"])
             )
-        return context
+        return selected_currency
 
     @staticmethod
-    async def __get_categories(context):
+    async def load_categories(
+        categories_list: list[dict[str, str]], subcategories_list: list[dict[str, str]]
+    ) -> list[dict[str, Any]]:
         """
-        Get categories and related subcategories and set them in the 'context' dictionary.
+        Get categories with the related subcategories.
 
         Args:
-            context: The context dictionary.
+            categories_list: List of categories.
+            subcategories_list: List of subcategories.
 
         Returns:
-            Dict: The updated context dictionary.
+            list: The categories.
         """
-        categories = context[
-            "categories"
-        ] = formatters.format_categories_and_related_subcategories(
-            await crm_data.get_categories_list(), await crm_data.get_subcategories_list()
+        return formatters.format_categories_and_related_subcategories(
+            categories_list, subcategories_list
         )
+
+    @staticmethod
+    async def load_custom_categories(categories: list[dict[str, Any]]) -> list | None:
+        """
+        Get custom categories, that fill the menu up to 6 items.
+
+        Args:
+            categories: List of categories.
+
+        Returns:
+            list | None: The custom categories or None if there are enough categories.
+        """
         if (cat_len := len(categories)) < 6:
-            context["custom_categories"] = await sync_to_async(list)(
-                CustomCategories.objects.all()[: 6 - cat_len]
+            return await db_pool.fetch(CustomCategories.objects.all()[: 6 - cat_len])
+        return None
+
+    @staticmethod
+    async def load_navigation_version(
+        custom_categories: list | None, **navigation_data: Any
+    ) -> str:
+        """
+        Get the version of the navigation data with the custom categories.
+
+        Navigation data is loaded before, so its versions are already in the cache.
+
+        Args:
+            custom_categories (list | None): The custom categories.
+            **navigation_data (Any): Navigation datasets the version depends on.
+
+        Returns:
+            str: The navigation version.
+        """
+        navigation_version = await crm_data.get_navigation_version()
+        if custom_categories:
+            navigation_version = get_data_version(
+                [
+                    navigation_version,
+                    [(category.title, category.link) for category in custom_categories],
+                ]
             )
-        return context
+        return navigation_version
+
+    async def load_region_products(
+        self, region: dict | None, selected_currency: dict | None
+    ) -> list[dict[str, Any]]:
+        """
+        Get products of the selected region, the dataset for the views showing them.
+
+        Args:
+            region (dict | None): The selected region.
+            selected_currency (dict | None): The selected currency.
+
+        Returns:
+            list: The region products.
+        """
+        if region is None or selected_currency is None:
+            return []
+        return await crm_data.get_region_products(region["slug"], currency=selected_currency)
+
+
+class PageCacheMixin:
+    """
+    Mixin serving pages of the 'ApplicationMixin' views from the page cache.
+
+    Page is rendered with 'page_cache' context variable set, templates render
+    per-user parts as holes then, which are filled by 'get_page_holes' for every request.
+    """
+
+    page_cache_query_params: tuple[str, ...] = ("currency",)
+
+    async def get_page_holes(
+        self, region: dict[str, Any], currency: dict[str, Any], cart: Cart
+    ) -> dict[str, str]:
+        """
+        Get per-user parts of the page by the holes names.
+
+        Override it to add the session-dependent blocks of the page.
+
+        Args:
+            region (dict): The region of the request.
+            currency (dict): The selected currency.
+            cart (Cart): The session's cart.
+
+        Returns:
+            dict: Content of the holes.
+        """
+        return {"cart-quantity": str(cart.quantity), "csrf-token": get_token(self.request)}
+
+    async def render_cached_page(self, **kwargs: Any) -> HttpResponse:
+        """
+        Get the page from the page cache, rendering and caching it if it's missing.
+
+        Args:
+            **kwargs (Any): Keyword arguments of the view.
+
+        Returns:
+            HttpResponse: The page with filled holes.
+        """
+        region_and_currency = await self.get_request_region_and_currency(
+            self.kwargs.get("region_slug")
+        )
+        if isinstance(region_and_currency, HttpResponseServerError):
+            return region_and_currency
+        region, currency = region_and_currency
+        if not region or not currency:
+            context = await self.get_context_data(**kwargs)
+            if isinstance(context, HttpResponse):
+                return context
+            return self.render_to_response(context)
+        key = page_cache.get_key(
+            self.request,
+            self.page_cache_query_params,
+            region["slug"],
+            currency["Name"],
+            await page_cache.get_version(region["slug"], currency),
+        )
+        content = page_cache.get(key)
+        if content is None:
+            context = await self.get_context_data(**kwargs)
+            if isinstance(context, HttpResponse):
+                return context
+            context["page_cache"] = True
+            response = self.render_to_response(context)
+            with timed("render"):
+                await sync_to_async(response.render)()
+            content = response.content.decode(response.charset)
+            page_cache.set(key, content)
+        cart = await session_data.get_or_create_cart(self.request.session)
+        holes = await self.get_page_holes(region, currency, cart)
+        return HttpResponse(page_cache.fill(content, holes, cart.products_ids))
+
+
+class ConditionalGetMixin:
+    """
+    Mixin answering conditional GET requests of the 'ApplicationMixin' views.
+
+    ETag is computed from the request path and query, region, currency, catalog version
+    and per-user state of the response: the cart, the CSRF cookie and session keys
+    listed in 'etag_session_keys'. Request with the matching 'If-None-Match' header
+    is answered with 304 before the response is built.
+    """
+
+    etag_session_keys: tuple[str, ...] = ()
+
+    async def get_etag(self) -> Optional[str]:
+        """
+        Get ETag of the response.
+
+        Returns:
+            str | None: Quoted ETag or None if region or currency isn't found.
+        """
+        region_and_currency = await self.get_request_region_and_currency(
+            self.kwargs.get("region_slug")
+        )
+        if isinstance(region_and_currency, HttpResponseServerError):
+            return None
+        region, currency = region_and_currency
+        if not region or not currency:
+            return None
+        cart = await session_data.get_or_create_cart(self.request.session)
+        return quote_etag(
+            get_data_version(
+                [
+                    self.request.get_full_path(),
+                    region["slug"],
+                    currency["Name"],
+                    await page_cache.get_version(region["slug"], currency),
+                    cart.digest,
+                    self.request.META.get("CSRF_COOKIE", ""),
+                    [self.request.session.get(key) for key in self.etag_session_keys],
+                ]
+            )
+        )
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        """
+        Answer with 304 if the client has the actual response, set ETag of the response.
+
+        Args:
+            request (HttpRequest): The request.
+            *args (Any): Positional arguments of the view.
+            **kwargs (Any): Keyword arguments of the view.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return await super().dispatch(request, *args, **kwargs)
+        etag = await self.get_etag()
+        if etag and (response := get_conditional_response(request, etag=etag)):
+            if response.status_code == 304:
+                response.headers["ETag"] = etag
+            return response
+        response = await super().dispatch(request, *args, **kwargs)
+        if etag and response.status_code == 200:
+            response.headers["ETag"] = etag
+        return response
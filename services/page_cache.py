@@ -0,0 +1,136 @@
+"""Full pages cache, varied by region, currency and cookies, with holes for per-user parts."""
+import re
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.http import HttpRequest
+
+from .data_getters import crm_data
+from .request_timing import TimedCache
+from .utils import get_data_version
+
+HOLE_PATTERN = re.compile(r"<!--page-cache:([a-z-]+)(?::([^>]*?))?-->")
+CSRF_TOKEN_PATTERN = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*"')
+
+cache = TimedCache(default_cache)
+
+
+class PageCache:
+    """
+    Cache of the rendered pages.
+
+    Page is cached once per path, allowed query parameters, region, currency and
+    cookies listed in the PAGE_CACHE_VARY_COOKIES setting. Cached pages don't expire,
+    the version of the region catalog and navigation data is a part of the key,
+    so pages are rendered again once the Zoho CRM data changes. Per-user parts
+    (cart quantity, in-cart markers, CSRF token, session-dependent blocks)
+    are rendered as '<!--page-cache:name-->' holes and filled on every request.
+    """
+
+    generation_key = "page_cache_generation"
+
+    @staticmethod
+    def hole(name: str, argument: Optional[str] = None) -> str:
+        """
+        Get placeholder of the per-user part.
+
+        :param name: str Name of the hole.
+        :param argument: str | None Argument of the hole, e.g. product id for 'in-cart'.
+        """
+        if argument is None:
+            return f"<!--page-cache:{name}-->"
+        return f"<!--page-cache:{name}:{argument}-->"
+
+    async def get_version(self, region_slug: str, currency: dict) -> str:
+        """
+        Get version of the data the page is rendered from.
+
+        Region products are fetched again if their cache has expired, so the catalog
+        version follows Zoho CRM even when all pages are served from the page cache.
+        :param region_slug: str Region slug.
+        :param currency: dict Selected currency.
+        """
+        if f"{region_slug}_products" not in cache:
+            await crm_data.get_region_products(region_slug, currency=currency)
+        return get_data_version(
+            [
+                await crm_data.get_catalog_version(region_slug),
+                await crm_data.get_navigation_version(),
+                cache.get(self.generation_key, 0),
+            ]
+        )
+
+    @staticmethod
+    def get_key(
+        request: HttpRequest,
+        query_params: Iterable[str],
+        region_slug: str,
+        currency_name: str,
+        version: str,
+    ) -> str:
+        """
+        Get cache key of the page variant.
+
+        :param request: HttpRequest The request.
+        :param query_params: Iterable Query parameters the page depends on, others are ignored.
+        :param region_slug: str Region slug.
+        :param currency_name: str Selected currency name.
+        :param version: str Version of the data the page is rendered from.
+        """
+        variant = [
+            request.path,
+            [(param, request.GET.get(param, "")) for param in query_params],
+            region_slug,
+            currency_name,
+            [
+                (cookie, request.COOKIES.get(cookie, ""))
+                for cookie in getattr(settings, "PAGE_CACHE_VARY_COOKIES", ())
+            ],
+            version,
+        ]
+        return f"page_{get_data_version(variant)}"
+
+    @staticmethod
+    def get(key: str) -> Optional[str]:
+        """Get cached page content with the holes."""
+        return cache.get(key)
+
+    def set(self, key: str, content: str) -> None:
+        """
+        Cache page content, CSRF tokens rendered into the page are replaced by holes.
+
+        :param key: str Cache key of the page variant.
+        :param content: str Rendered page with the holes.
+        """
+        content = CSRF_TOKEN_PATTERN.sub(rf'\g<1>{self.hole("csrf-token")}"', content)
+        cache.set(key, content, None)
+
+    @staticmethod
+    def fill(content: str, holes: dict[str, str], in_cart_ids: Iterable[str]) -> str:
+        """
+        Fill holes of the cached page with the per-user parts.
+
+        :param content: str Cached page content.
+        :param holes: dict Content of the holes by their names, unknown holes are emptied.
+        :param in_cart_ids: Iterable Ids of the products in the cart, for 'in-cart' holes.
+        """
+        in_cart_ids = set(in_cart_ids)
+
+        def replace(match: re.Match) -> str:
+            name, argument = match.groups()
+            if name == "in-cart":
+                return str(argument in in_cart_ids)
+            return holes.get(name, "")
+
+        return HOLE_PATTERN.sub(replace, content)
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """Drop all cached pages, used as a receiver of the local content models signals."""
+        try:
+            cache.incr(self.generation_key)
+        except ValueError:
+            cache.set(self.generation_key, 1, None)
+
+
+page_cache = PageCache()
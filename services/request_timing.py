@@ -0,0 +1,207 @@
+"""
+Per-request timing of the slow phases: Zoho CRM queries, file cache, database and rendering.
+
+Hooks add durations of the phases to the timings of the current request, kept in
+a context variable, so they're collected from the tasks and the threads of the request.
+Durations of the concurrent calls add up, so a phase may take longer than the request.
+"""
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+from django.template.response import SimpleTemplateResponse
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTimings:
+    """Durations and counts of the request phases."""
+
+    def __init__(self) -> None:
+        """Initialize timings of the started request."""
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Add duration of the phase call.
+
+        :param phase: str Name of the phase.
+        :param seconds: float Duration of the call.
+        """
+        with self._lock:
+            timing = self.phases.setdefault(phase, {"seconds": 0.0, "count": 0})
+            timing["seconds"] += seconds
+            timing["count"] += 1
+
+    @property
+    def total(self) -> float:
+        """Get seconds since the request start."""
+        return time.perf_counter() - self.started_at
+
+    def get_header(self) -> str:
+        """Get value of the 'Server-Timing' header."""
+        metrics = [
+            f'{phase};dur={timing["seconds"] * 1000:.1f};desc="{timing["count"]:.0f} calls"'
+            for phase, timing in self.phases.items()
+        ]
+        metrics.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def get_summary(self, request: HttpRequest, response: HttpResponse) -> Dict[str, Any]:
+        """Get summary of the request for the log."""
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(self.total * 1000, 1),
+            "phases": {
+                phase: {"ms": round(timing["seconds"] * 1000, 1), "count": timing["count"]}
+                for phase, timing in self.phases.items()
+            },
+        }
+
+
+request_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Time the block as the phase of the current request, outside requests it isn't timed.
+
+    :param phase: str Name of the phase.
+    """
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started_at)
+
+
+class TimedCache:
+    """Cache proxy timing reads and writes as the 'cache' phase."""
+
+    TIMED_METHODS = ("get", "set", "get_many", "set_many", "delete", "incr", "has_key")
+
+    def __init__(self, cache: Any) -> None:
+        """
+        Initialize proxy.
+
+        :param cache: Cache Timed cache.
+        """
+        self._cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        """Get attribute of the cache, wrapping the timed methods."""
+        attribute = getattr(self._cache, name)
+        if name not in self.TIMED_METHODS:
+            return attribute
+
+        def method(*args: Any, **kwargs: Any) -> Any:
+            with timed("cache"):
+                return attribute(*args, **kwargs)
+
+        return method
+
+    def __contains__(self, key: str) -> bool:
+        """Check if the key is in the cache."""
+        with timed("cache"):
+            return key in self._cache
+
+
+def time_query(execute: Callable, sql: str, params: Any, many: bool, context: Dict) -> Any:
+    """Database execute wrapper timing queries as the 'db' phase."""
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def add_query_timing(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """Time queries of every new database connection."""
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class RequestTimingMiddleware:
+    """
+    Collect timings of the request phases.
+
+    Timings are sent in the 'Server-Timing' header, if SERVER_TIMING_HEADER is enabled,
+    and summary of the requests longer than REQUEST_TIMING_LOG_THRESHOLD seconds is logged.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize middleware and start timing database queries."""
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(add_query_timing, dispatch_uid="request_timing")
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Time the request."""
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        return self.process_timings(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Time the request without leaving the event loop."""
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_timings.reset(token)
+        return self.process_timings(request, response, timings)
+
+    def process_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse
+    ) -> SimpleTemplateResponse:
+        """Time rendering of the template response, it's rendered right after this hook."""
+        timings = request_timings.get()
+        if timings is not None:
+            started_at = time.perf_counter()
+
+            def add_render_timing(response: SimpleTemplateResponse) -> None:
+                timings.add("render", time.perf_counter() - started_at)
+
+            response.add_post_render_callback(add_render_timing)
+        return response
+
+    @staticmethod
+    def process_timings(
+        request: HttpRequest, response: HttpResponse, timings: RequestTimings
+    ) -> HttpResponse:
+        """Add the 'Server-Timing' header and log the slow request."""
+        if getattr(settings, "SERVER_TIMING_HEADER", False):
+            response.headers["Server-Timing"] = timings.get_header()
+        if timings.total >= getattr(settings, "REQUEST_TIMING_LOG_THRESHOLD", 1.0):
+            summary = timings.get_summary(request, response)
+            logger.warning(
+                "Slow request: %s", json.dumps(summary), extra={"request_timings": summary}
+            )
+        return response
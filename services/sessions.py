@@ -0,0 +1,207 @@
+"""
+Cache-backed session engine with database write-behind.
+
+Session data is read from the cache once per request without blocking the event
+loop, all the changes of the request are written once, when the response is
+produced: to the cache right away and to the database in a background thread.
+"""
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as DjangoSessionMiddleware,
+)
+from django.db import close_old_connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+from services.db import db_pool
+
+logger = logging.getLogger(__name__)
+
+
+class SessionWriteBehind:
+    """
+    Persists sessions to the database in a background thread.
+
+    Several saves of the same session, queued before it's written, result
+    in a single write of the latest data. One worker keeps writes ordered.
+    Failed write is retried once, then it's logged and dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize write-behind queue, the worker thread is started on first use."""
+        self._pending: Dict[str, Model] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get or create the worker."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="session-write-behind"
+            )
+            atexit.register(self.shutdown)
+        return self._executor
+
+    def schedule(self, session_key: str, instance: Model) -> None:
+        """Queue session model instance to be saved."""
+        with self._lock:
+            is_queued = session_key in self._pending
+            self._pending[session_key] = instance
+        if not is_queued:
+            self.executor.submit(self.flush, session_key)
+
+    def flush(self, session_key: str) -> None:
+        """Save the latest queued data of the session."""
+        with self._lock:
+            instance = self._pending.pop(session_key, None)
+        if instance is None:
+            return
+        try:
+            self.save(instance)
+        except Exception:
+            logger.exception("Session isn't written to the database, retrying.")
+            try:
+                self.save(instance)
+            except Exception:
+                logger.exception("Session isn't written to the database, its changes are lost.")
+
+    @staticmethod
+    def save(instance: Model) -> None:
+        """Save session model instance, closing the connection if it's broken."""
+        try:
+            instance.save()
+        finally:
+            close_old_connections()
+
+    def shutdown(self) -> None:
+        """Write all queued sessions and stop the worker."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for session_key in list(self._pending):
+            self.flush(session_key)
+
+
+session_write_behind = SessionWriteBehind()
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cached database session store with async loading and write-behind saving.
+
+    Data is cached under the same keys as 'cached_db' engine uses.
+    Saving data, that didn't change since it was loaded or saved, is skipped.
+    """
+
+    def __init__(self, session_key: Optional[str] = None) -> None:
+        """Initialize store without saved data state."""
+        super().__init__(session_key)
+        self._saved_state: Optional[bytes] = None
+
+    def _get_state(self, data: Dict) -> bytes:
+        """Get serialized data to compare it with the saved one."""
+        return self.serializer().dumps(data)
+
+    def load(self) -> Dict:
+        """Load session data, remembering its state."""
+        data = super().load()
+        self._saved_state = self._get_state(data)
+        return data
+
+    async def aload(self) -> Dict:
+        """Load session data from cache, falling back to the database in a worker thread."""
+        if not hasattr(self, "_session_cache"):
+            data = None
+            if self.session_key:
+                try:
+                    data = await self._cache.aget(self.cache_key)
+                except Exception:
+                    data = None
+            if data is None:
+                data = await db_pool.run(self._load_from_db)
+            else:
+                self._saved_state = self._get_state(data)
+            self._session_cache = data
+        return self._session_cache
+
+    def preload(self) -> Dict:
+        """Load session data without marking session as accessed."""
+        if not hasattr(self, "_session_cache"):
+            self._session_cache = self.load() if self.session_key else {}
+        return self._session_cache
+
+    def _load_from_db(self) -> Dict:
+        """Load session data from the database in a worker thread."""
+        return self.load() if self.session_key else {}
+
+    def save(self, must_create: bool = False) -> None:
+        """
+        Save session data to cache and queue it to the database.
+
+        New sessions are written to the database right away, to make sure
+        their keys are unique.
+        """
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        state = self._get_state(data)
+        if must_create:
+            DBStore.save(self, must_create=True)
+        elif state == self._saved_state:
+            return
+        else:
+            session_write_behind.schedule(self.session_key, self.create_model_instance(data))
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        self._saved_state = state
+
+    async def asave(self) -> None:
+        """Save session data without blocking the event loop."""
+        if self.session_key is None:
+            return await db_pool.run(self.create)
+        data = self._get_session()
+        state = self._get_state(data)
+        if state == self._saved_state:
+            return
+        session_write_behind.schedule(self.session_key, self.create_model_instance(data))
+        await self._cache.aset(self.cache_key, data, self.get_expiry_age())
+        self._saved_state = state
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """
+    Session middleware, that loads and saves sessions asynchronously.
+
+    Session is loaded before the view, so async views may read it without
+    thread hops, and it's saved once after the view, only if its data has changed.
+    """
+
+    def process_request(self, request: HttpRequest) -> None:
+        """Create session store and load its data, while it's allowed to block."""
+        super().process_request(request)
+        if hasattr(request.session, "preload"):
+            request.session.preload()
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Load session, get response and save session, if it was modified."""
+        super().process_request(request)
+        if hasattr(request.session, "aload"):
+            await request.session.aload()
+        response = await self.get_response(request)
+        session: Any = request.session
+        if (
+            hasattr(session, "asave")
+            and response.status_code < 500
+            and (session.modified or settings.SESSION_SAVE_EVERY_REQUEST)
+            and not session.is_empty()
+        ):
+            await session.asave()
+        return self.process_response(request, response)
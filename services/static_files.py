@@ -0,0 +1,199 @@
+"""Fingerprinted, precompressed static files storage and serving."""
+import gzip
+import mimetypes
+import os
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    ".css",
+    ".js",
+    ".map",
+    ".svg",
+    ".json",
+    ".txt",
+    ".xml",
+    ".html",
+    ".ttf",
+    ".eot",
+)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+HASHED_NAME_PATTERN = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage, that also writes brotli and gzip variants of the text files.
+
+    Variants are written next to the originals with '.br' and '.gz' suffixes
+    during 'collectstatic', brotli ones only if the 'brotli' package is installed.
+    """
+
+    min_compression_ratio: float = 0.95
+
+    def url_converter(self, name: str, hashed_files: Dict, template: Optional[str] = None):
+        """
+        Get converter of the urls inside the file.
+
+        References to the missing files (e.g. source maps of the vendored
+        libraries) are left as they are instead of failing the whole collection.
+        """
+        converter = super().url_converter(name, hashed_files, template)
+
+        def safe_converter(matchobj: re.Match) -> str:
+            try:
+                return converter(matchobj)
+            except ValueError:
+                return matchobj["matched"]
+
+        return safe_converter
+
+    def post_process(
+        self, paths: Dict, dry_run: bool = False, **options
+    ) -> Iterator[Tuple[str, Optional[str], bool]]:
+        """Post process files as manifest storage does, then compress the results."""
+        processed_names: List[str] = []
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                processed_names.extend((name, hashed_name))
+            yield name, hashed_name, processed
+        if not dry_run:
+            for name in dict.fromkeys(processed_names):
+                if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                    self.compress(name)
+
+    def compress(self, name: str) -> List[str]:
+        """
+        Write compressed variants of the file, if they are noticeably smaller.
+
+        Returns names of the written variants.
+        """
+        path = self.path(name)
+        with open(path, "rb") as f:
+            content = f.read()
+        variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content, quality=11)
+        written = []
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(content) * self.min_compression_ratio:
+                with open(f"{path}{suffix}", "wb") as f:
+                    f.write(compressed)
+                written.append(f"{name}{suffix}")
+        return written
+
+
+class StaticFilesServer:
+    """
+    Serves collected static files, choosing precompressed variant by 'Accept-Encoding'.
+
+    Fingerprinted files get immutable far-future 'Cache-Control', the other ones
+    are revalidated on every use. Resolved files are remembered per process.
+    In debug mode files are left to the development server, as they aren't collected.
+    """
+
+    encodings: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self) -> None:
+        """Initialize server with empty resolved files registry."""
+        self.files: Dict[str, Dict] = {}
+
+    @staticmethod
+    def get_prefix() -> str:
+        """Get static url path prefix."""
+        return "/" + settings.STATIC_URL.lstrip("/")
+
+    def find_file(self, path: str) -> Optional[Dict]:
+        """
+        Find static file by url path.
+
+        Returns dict with file path, available encoded variants and headers,
+        or None if there is no such file.
+        """
+        if path not in self.files:
+            if (static_file := self.resolve_file(path)) is None:
+                return None
+            self.files[path] = static_file
+        return self.files[path]
+
+    def resolve_file(self, path: str) -> Optional[Dict]:
+        """Resolve url path to the collected file."""
+        static_root = os.path.realpath(settings.STATIC_ROOT)
+        file_path = os.path.realpath(os.path.join(static_root, path[len(self.get_prefix()) :]))
+        if not file_path.startswith(static_root + os.sep) or not os.path.isfile(file_path):
+            return None
+        content_type, _ = mimetypes.guess_type(file_path)
+        return {
+            "path": file_path,
+            "content_type": content_type or "application/octet-stream",
+            "variants": [
+                (encoding, f"{file_path}{suffix}")
+                for encoding, suffix in self.encodings
+                if os.path.isfile(f"{file_path}{suffix}")
+            ],
+            "cache_control": (
+                IMMUTABLE_CACHE_CONTROL
+                if HASHED_NAME_PATTERN.search(file_path)
+                else REVALIDATE_CACHE_CONTROL
+            ),
+        }
+
+    def get_response(self, request: HttpRequest) -> Optional[HttpResponse]:
+        """Get file response for the static file request or None for any other one."""
+        if (
+            settings.DEBUG
+            or request.method not in ("GET", "HEAD")
+            or not request.path.startswith(self.get_prefix())
+        ):
+            return None
+        static_file = self.find_file(request.path)
+        if static_file is None:
+            return None
+        accept_encoding = request.headers.get("Accept-Encoding", "")
+        file_path, content_encoding = static_file["path"], None
+        for encoding, variant_path in static_file["variants"]:
+            if encoding in accept_encoding:
+                file_path, content_encoding = variant_path, encoding
+                break
+        response = FileResponse(
+            open(file_path, "rb"),
+            content_type=static_file["content_type"],
+            filename=os.path.basename(static_file["path"]),
+        )
+        if content_encoding:
+            response.headers["Content-Encoding"] = content_encoding
+        if static_file["variants"]:
+            response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = static_file["cache_control"]
+        return response
+
+
+static_files_server = StaticFilesServer()
+
+
+@sync_and_async_middleware
+def static_files_middleware(get_response: Callable) -> Callable:
+    """Serve collected static files before the rest of the middleware chain."""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request: HttpRequest) -> HttpResponse:
+            return static_files_server.get_response(request) or await get_response(request)
+
+    else:
+
+        def middleware(request: HttpRequest) -> HttpResponse:
+            return static_files_server.get_response(request) or get_response(request)
+
+    return middleware
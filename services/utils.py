@@ -1,18 +1,20 @@
 """Contains rare-used utils."""
 
+import hashlib
 import inspect
+import json
 import os
 from collections import defaultdict
 from functools import wraps
 from typing import Any, Optional
 
-import httpx
 from django.conf import settings
 from django.http import HttpRequest
 from django.urls import reverse_lazy
 from dotenv import load_dotenv
 
 from mainpage.models import Contact
+from services.http_clients import http_clients
 
 load_dotenv()
 
@@ -40,7 +42,7 @@ class IPGeoLocator:
 
         :param ip_address: str ip_address.
         """
-        async with httpx.AsyncClient() as client:
+        async with http_clients.client() as client:
             response = await client.post(
                 url=f"https://ipapi.co/{ip_address}/json/?key={os.getenv('IP_API_KEY')}"
             )
@@ -156,6 +158,34 @@ class Formatters:
         """
         return {region["slug"]: region["default_currency"] for region in data}
 
+    @staticmethod
+    def format_regions_lookup(regions: list[dict[str, Any]]) -> dict[str, dict]:
+        """
+        Return lookup maps of the regions.
+
+        Returns dict like one:
+        {"slug": {"dnipro": region}, "code": {"dnipro": region}, "country": {"ukraine": region}}
+        Keys are lower-cased, the first region of the country is used for it.
+        """
+        lookup: dict[str, dict] = {"slug": {}, "code": {}, "country": {}}
+        for region in regions:
+            lookup["slug"][region["slug"].lower()] = region
+            if code := region.get("code"):
+                lookup["code"].setdefault(code.lower(), region)
+            if country_code := region.get("country_code"):
+                lookup["country"].setdefault(country_code.lower(), region)
+        return lookup
+
+    @staticmethod
+    def format_currencies_lookup(currencies: list[dict[str, Any]]) -> dict[str, dict]:
+        """
+        Return currencies by lower-cased names.
+
+        Returns dict like one:
+        {"uah": currency, "eur": currency}
+        """
+        return {currency["Name"].lower(): currency for currency in currencies}
+
     @staticmethod
     def format_user_data(data: dict[str, str]) -> dict:
         """Modify given dict keys to correspond with Zoho CRM module keys."""
@@ -239,6 +269,20 @@ class Utilities:
 utilities = Utilities()
 
 
+def get_data_version(data: Any) -> str:
+    """
+    Get version of the JSON-like data, that changes only with the data.
+
+    Args:
+        data (Any): Data of the JSON types.
+
+    Returns:
+        str: Hex digest of the data.
+    """
+    content = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
 def convert_products_prices(func):
     """
     To wrap to convert the prices of a list of products to the selected currency.
@@ -0,0 +1,46 @@
+"""Module for testing cart.app_services.cart."""
+from cart.app_services.cart import Cart
+
+
+class TestCart:
+    """Class for testing Cart structure."""
+
+    def test_set_and_remove(self) -> None:
+        """Test lines lookup, quantity and subtotals are kept up to date."""
+        cart = Cart()
+        cart.set_amount("123", 3, 54)
+        cart.set_amount("123", 1, 25)
+        cart.set_amount("321", 2)
+        assert cart.get_amount("123", 54) == 3
+        assert cart.get_amount("123") is None
+        assert cart.quantity == 6
+        assert cart.subtotals == {"123": 4, "321": 2}
+
+        cart.set_amount("123", 5, 54)
+        assert cart.remove("123", 25) == 1
+        assert cart.remove("123", 25) is None
+        assert cart.quantity == 7
+        assert cart.subtotals == {"123": 5, "321": 2}
+
+        cart.remove_products({"123", "999"})
+        assert cart.quantity == 2
+        assert cart.products_ids == {"321"}
+        assert cart.products == [{"id": "321", "size": None, "amount": 2}]
+
+    def test_from_dict_migrates_previous_format(self) -> None:
+        """Test list based cart is converted and stored in the versioned format."""
+        cart = Cart.from_dict(
+            {
+                "products": [
+                    {"id": "123", "size": 54, "amount": 3},
+                    {"id": "321", "amount": 2},
+                ],
+                "quantity": 5,
+            }
+        )
+        data = cart.to_dict()
+        assert data == {"v": 2, "lines": {"123:54": 3, "321:": 2}, "quantity": 5}
+        restored_cart = Cart.from_dict(data)
+        assert restored_cart.subtotals == cart.subtotals
+        assert restored_cart.digest == cart.digest
+        assert not Cart.from_dict({})
@@ -0,0 +1,81 @@
+"""Module for testing cart.app_services.pricing."""
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from cart.app_services.cart import Cart
+from cart.app_services.pricing import PricingEngine
+
+REGION_PRODUCTS = [
+    {"id": "1", "category_slug": "flowers", "unit_price": 10.1, "discount": None},
+    {
+        "id": "2",
+        "category_slug": "flowers",
+        "unit_price": 20.0,
+        "discount": 10,
+        "new_price": 18.0,
+    },
+    {"id": "3", "category_slug": "bouquets", "unit_price": 50.0, "discount": None},
+]
+BOUQUETS_DATA = {"3": {"bouquet_sizes": [{"value": 25, "price": 70.3}]}}
+
+
+def get_cart() -> Cart:
+    """Get cart with plain, discounted and sized products."""
+    cart = Cart()
+    cart.set_amount("1", 3)
+    cart.set_amount("2", 2)
+    cart.set_amount("3", 1, 25)
+    return cart
+
+
+class TestPricingEngine:
+    """Class for testing PricingEngine compute and price_cart methods."""
+
+    def test_compute(self) -> None:
+        """Test line totals use amounts and sums are exact."""
+        cart = get_cart()
+        cart.set_amount("3", 1, 40)
+        cart.set_amount("404", 1)
+        pricing = PricingEngine.compute(cart, REGION_PRODUCTS, BOUQUETS_DATA)
+        assert [line.total for line in pricing.lines] == [
+            Decimal("30.30"),
+            Decimal("36.00"),
+            Decimal("70.30"),
+        ]
+        assert pricing.subtotal == Decimal("140.60")
+        assert pricing.discount == Decimal("4.00")
+        assert pricing.grand_total == Decimal("136.60")
+        assert pricing.deprecated == (("3", 40),)
+        assert pricing.missing == ("404",)
+
+    def test_price_cart_memoized(self) -> None:
+        """Test cart pricing is reused while cart, catalog and currency are the same."""
+        engine = PricingEngine()
+        currency = {"id": "uah"}
+        with mock.patch(
+            "cart.app_services.pricing.crm_data.get_catalog_version", return_value="v1"
+        ), mock.patch(
+            "cart.app_services.pricing.products_crm_data.get_product_bouquet_data",
+            side_effect=lambda product_id, **kwargs: BOUQUETS_DATA[product_id],
+        ) as get_bouquet_data:
+            pricing = async_to_sync(engine.price_cart)(
+                get_cart(), "kyiv", currency, REGION_PRODUCTS
+            )
+            assert async_to_sync(engine.price_cart)(get_cart(), "kyiv", currency) is pricing
+        assert get_bouquet_data.call_count == 1
+        assert pricing.grand_total == Decimal("136.60")
+
+    def test_memo_key_exchange_rate(self) -> None:
+        """Test memoized pricing isn't reused after the currency exchange rate changes."""
+        cart = get_cart()
+        currency = {"id": "usd", "static_exchange_rate": 40}
+        key = PricingEngine.get_memo_key(cart, "kyiv", "v1", currency)
+        assert PricingEngine.get_memo_key(cart, "kyiv", "v1", dict(currency)) == key
+        assert (
+            PricingEngine.get_memo_key(
+                cart, "kyiv", "v1", {**currency, "static_exchange_rate": 41}
+            )
+            != key
+        )
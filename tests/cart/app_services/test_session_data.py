@@ -0,0 +1,110 @@
+"""Module for testing cart.app_services.session_data."""
+import json
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+
+from cart.app_services.session_data import session_data
+from orders.models import OrderOutbox
+
+CURRENCY = {"id": "1", "Name": "UAH", "symbol": "₴", "static_exchange_rate": 1}
+REGION = {"slug": "dnipro", "default_currency": "UAH"}
+REGION_PRODUCTS = [
+    {"id": "1", "category_slug": "flowers", "unit_price": 10.0, "discount": None},
+    {"id": "2", "category_slug": "bouquets", "unit_price": 50.0, "discount": None},
+]
+
+
+def apply_operations(session: SessionStore, operations: list) -> tuple[int, dict]:
+    """Apply operations with the mocked catalog, return response status and data."""
+    with mock.patch(
+        "cart.app_services.session_data.crm_data.get_currency_list", return_value=[CURRENCY]
+    ), mock.patch(
+        "cart.app_services.session_data.crm_data.get_region_products",
+        return_value=REGION_PRODUCTS,
+    ), mock.patch(
+        "cart.app_services.session_data.products_crm_data.get_product_bouquet_data",
+        return_value={"bouquet_sizes": [{"value": 25, "price": 70.0}]},
+    ), mock.patch(
+        "cart.app_services.pricing.crm_data.get_catalog_version", return_value=None
+    ):
+        response = async_to_sync(session_data.apply_cart_operations)(
+            None, session, operations, REGION
+        )
+    return response.status_code, json.loads(response.content)
+
+
+class TestApplyCartOperations:
+    """Class for testing session_data.apply_cart_operations method."""
+
+    def test_apply_operations(self) -> None:
+        """Test all operations are applied and summary is returned."""
+        session = SessionStore()
+        status, data = apply_operations(
+            session,
+            [
+                {"op": "add", "id": "1", "amount": 1},
+                {"op": "add", "id": "2", "amount": 1, "bouquet_size": 25},
+                {"op": "update", "id": "1", "amount": 3},
+            ],
+        )
+        assert status == 200
+        assert data["cart"]["quantity"] == 4
+        assert data["cart"]["grand_total"] == "100.00"
+        assert session["cart"]["lines"] == {"1:": 3, "2:25": 1}
+
+    def test_failed_operation_is_atomic(self) -> None:
+        """Test cart isn't changed if any of the operations fails."""
+        session = SessionStore()
+        session["cart"] = {"v": 2, "lines": {"1:": 1}, "quantity": 1}
+        status, data = apply_operations(
+            session,
+            [
+                {"op": "remove", "id": "1"},
+                {"op": "add", "id": "2", "amount": 1, "bouquet_size": 40},
+            ],
+        )
+        assert status == 404
+        assert data["index"] == 1
+        assert session["cart"]["lines"] == {"1:": 1}
+
+    def test_product_not_in_catalog(self) -> None:
+        """Test products absent in the region catalog aren't added."""
+        session = SessionStore()
+        status, data = apply_operations(
+            session,
+            [{"op": "add", "id": "1", "amount": 1}, {"op": "add", "id": "404", "amount": 1}],
+        )
+        assert status == 404
+        assert data["index"] == 1
+        assert "cart" not in session
+
+
+@pytest.mark.django_db(transaction=True)
+class TestGetClientOrdersIdList:
+    """Class for testing session_data.get_client_orders_id_list method."""
+
+    def test_pending_orders_are_reconciled(self) -> None:
+        """Test pending orders created in Zoho CRM are replaced with their ids."""
+        for order_number, status, zoho_id in (
+            ("dnipro-1", OrderOutbox.SUBMITTED, "555"),
+            ("dnipro-2", OrderOutbox.PENDING, ""),
+        ):
+            OrderOutbox.objects.create(
+                order_number=order_number,
+                region_slug="dnipro",
+                payload={},
+                grand_total=Decimal("10.00"),
+                status=status,
+                zoho_id=zoho_id,
+            )
+        session = SessionStore()
+        session["orders"] = ["111"]
+        for order_number in ("dnipro-1", "dnipro-2"):
+            async_to_sync(session_data.add_pending_order)(session, order_number)
+        orders_ids = async_to_sync(session_data.get_client_orders_id_list)(session)
+        assert orders_ids == ["111", "555"]
+        assert session["pending_orders"] == ["dnipro-2"]
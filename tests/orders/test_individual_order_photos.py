@@ -0,0 +1,78 @@
+"""Module for testing orders.app_services.individual_order_photos."""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from orders.app_services.individual_order_photos import IndividualOrderPhotoUploader
+from orders.models import IndividualOrderPhoto
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIndividualOrderPhotoUploader:
+    """Class for testing queueing, downscaling and uploading of the photos."""
+
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path) -> None:
+        """Store media in a temporary directory."""
+        settings.MEDIA_ROOT = tmp_path
+        settings.INDIVIDUAL_ORDER_PHOTO_MAX_SIDE = 100
+
+    @staticmethod
+    def get_photo() -> SimpleUploadedFile:
+        """Get uploaded PNG photo."""
+        content = io.BytesIO()
+        Image.new("RGBA", (400, 200), (255, 0, 0, 255)).save(content, "PNG")
+        return SimpleUploadedFile("photo.png", content.getvalue(), "image/png")
+
+    def test_photo_is_downscaled_and_uploaded(self, tmp_path) -> None:
+        """Test queued photo is re-encoded to JPEG fitting max side and uploaded."""
+        uploader = IndividualOrderPhotoUploader()
+        uploader._executor = ThreadPoolExecutor(max_workers=1)
+        order_photo = async_to_sync(uploader.queue)("individual_orders", 15, self.get_photo())
+        source_path = tmp_path / order_photo.photo.name
+        with mock.patch(
+            "orders.app_services.individual_order_photos.image_handler.upload_record_photo",
+            mock.AsyncMock(),
+        ) as upload_record_photo:
+            assert async_to_sync(uploader.process)() == {"uploaded": 1, "retried": 0}
+        uploader.shutdown()
+        order_photo.refresh_from_db()
+        assert order_photo.status == IndividualOrderPhoto.UPLOADED
+        assert order_photo.photo.name == "individual_orders/individual_orders/15/photo.jpg"
+        assert not os.path.exists(source_path)
+        with Image.open(tmp_path / order_photo.photo.name) as photo:
+            assert (photo.format, photo.size) == ("JPEG", (100, 50))
+        module_api_name, record_id, content, file_name = upload_record_photo.await_args.args
+        assert (module_api_name, record_id, file_name) == (
+            "individual_orders",
+            "15",
+            "photo.jpg",
+        )
+        assert content == (tmp_path / order_photo.photo.name).read_bytes()
+
+    def test_failed_upload(self, settings) -> None:
+        """Test failed upload keeps the prepared photo and fails after the max attempts."""
+        settings.INDIVIDUAL_ORDER_PHOTO_MAX_ATTEMPTS = 2
+        uploader = IndividualOrderPhotoUploader(backoff=0)
+        uploader._executor = ThreadPoolExecutor(max_workers=1)
+        order_photo = async_to_sync(uploader.queue)("individual_orders", 15, self.get_photo())
+        with mock.patch(
+            "orders.app_services.individual_order_photos.image_handler.upload_record_photo",
+            mock.AsyncMock(side_effect=RuntimeError("Zoho is down")),
+        ):
+            assert async_to_sync(uploader.process)() == {"uploaded": 0, "retried": 1}
+            order_photo.refresh_from_db()
+            assert order_photo.status == IndividualOrderPhoto.PENDING
+            assert order_photo.is_prepared
+            assert async_to_sync(uploader.process)() == {"uploaded": 0, "retried": 1}
+        uploader.shutdown()
+        order_photo.refresh_from_db()
+        assert order_photo.status == IndividualOrderPhoto.FAILED
+        assert order_photo.attempts == 2
+        assert order_photo.last_error == "RuntimeError('Zoho is down')"
@@ -0,0 +1,52 @@
+"""Module for testing orders.app_services.notifications."""
+from unittest import mock
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+from django.core import mail
+
+from orders.app_services.notifications import NotificationDispatcher, notification_queue
+from orders.models import Notification
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNotificationDispatcher:
+    """Class for testing sending of the queued notifications."""
+
+    @pytest.fixture(autouse=True)
+    def email_backend(self, settings) -> None:
+        """Use in-memory email backend."""
+        settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+    def test_order_confirmation_is_sent(self) -> None:
+        """Test queued SMS and email are sent and their status is recorded."""
+        async_to_sync(notification_queue.enqueue_order_confirmation)(
+            "+380000000000", "dnipro-1", "100.00", {"symbol": "₴"}, "client@example.com"
+        )
+        dispatcher = NotificationDispatcher()
+        with mock.patch.object(
+            dispatcher, "send_sms", mock.AsyncMock(return_value="SM1")
+        ) as send_sms:
+            assert async_to_sync(dispatcher.process)() == {"sent": 2, "retried": 0}
+        assert send_sms.await_args.args[0].recipient == "+380000000000"
+        assert mail.outbox[0].to == ["client@example.com"]
+        assert "dnipro-1" in mail.outbox[0].body
+        sms = Notification.objects.get(channel=Notification.SMS)
+        assert (sms.status, sms.provider_id) == (Notification.SENT, "SM1")
+
+    def test_failed_sms_is_retried(self) -> None:
+        """Test failed SMS stays pending until max attempts and is marked as failed then."""
+        notification = async_to_sync(notification_queue.enqueue)(
+            Notification.SMS, "+380000000000", "Text"
+        )
+        dispatcher = NotificationDispatcher(max_attempts=2, backoff=0)
+        with mock.patch.object(
+            dispatcher, "send_sms", mock.AsyncMock(side_effect=httpx.ConnectError(""))
+        ):
+            assert async_to_sync(dispatcher.process)() == {"sent": 0, "retried": 1}
+            notification.refresh_from_db()
+            assert (notification.status, notification.attempts) == (Notification.PENDING, 1)
+            async_to_sync(dispatcher.process)()
+        notification.refresh_from_db()
+        assert (notification.status, notification.attempts) == (Notification.FAILED, 2)
@@ -0,0 +1,84 @@
+"""Module for testing orders.app_services.order_outbox."""
+from decimal import Decimal
+from unittest import mock
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync
+
+from orders.app_services.order_outbox import OrderOutboxProcessor
+from orders.app_services.orders_handlers import order_handlers
+from orders.models import Notification, OrderOutbox
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOrderOutboxProcessor:
+    """Class for testing submission of the outbox orders."""
+
+    processor = OrderOutboxProcessor(max_attempts=2, backoff=10)
+
+    @staticmethod
+    def create_order(order_number: str = "kyiv-abc123") -> OrderOutbox:
+        """Create pending outbox order."""
+        return OrderOutbox.objects.create(
+            order_number=order_number,
+            region_slug="kyiv",
+            payload={
+                "order_number": order_number,
+                "confirmation": {
+                    "phone_number": "+380000000000",
+                    "email": None,
+                    "currency_symbol": "₴",
+                },
+            },
+            grand_total=Decimal("100.00"),
+        )
+
+    def test_process_submits_order(self) -> None:
+        """Test pending order is created in Zoho CRM and marked as submitted."""
+        order = self.create_order()
+        with mock.patch.object(
+            order_handlers, "find_order_id", mock.AsyncMock(return_value=None)
+        ), mock.patch.object(
+            order_handlers, "create_order_record", mock.AsyncMock(return_value="555")
+        ) as create_order_record:
+            results = async_to_sync(self.processor.process)()
+        order.refresh_from_db()
+        assert results == {"submitted": 1, "retried": 0}
+        assert (order.status, order.zoho_id, order.attempts) == (
+            OrderOutbox.SUBMITTED,
+            "555",
+            1,
+        )
+        create_order_record.assert_awaited_once_with({"order_number": "kyiv-abc123"})
+        sms = Notification.objects.get()
+        assert (sms.channel, sms.recipient) == (Notification.SMS, "+380000000000")
+        assert "kyiv-abc123" in sms.body
+
+    def test_process_reuses_existing_order(self) -> None:
+        """Test order created by an interrupted attempt isn't created again."""
+        order = self.create_order()
+        with mock.patch.object(
+            order_handlers, "find_order_id", mock.AsyncMock(return_value="777")
+        ), mock.patch.object(order_handlers, "create_order_record") as create_order_record:
+            async_to_sync(self.processor.process)()
+        order.refresh_from_db()
+        assert (order.status, order.zoho_id) == (OrderOutbox.SUBMITTED, "777")
+        create_order_record.assert_not_called()
+
+    def test_process_retries_and_fails(self) -> None:
+        """Test failed order is retried later and marked as failed after max attempts."""
+        order = self.create_order()
+        with mock.patch.object(
+            order_handlers, "find_order_id", mock.AsyncMock(side_effect=httpx.ConnectError(""))
+        ):
+            assert async_to_sync(self.processor.process)() == {"submitted": 0, "retried": 1}
+            order.refresh_from_db()
+            assert (order.status, order.attempts) == (OrderOutbox.PENDING, 1)
+            assert async_to_sync(self.processor.process)() == {"submitted": 0, "retried": 0}
+            OrderOutbox.objects.filter(id=order.id).update(next_attempt_at=order.created_at)
+            async_to_sync(self.processor.process)()
+        order.refresh_from_db()
+        assert (order.status, order.attempts) == (OrderOutbox.FAILED, 2)
+        assert "ConnectError" in order.last_error
+        assert not Notification.objects.exists()
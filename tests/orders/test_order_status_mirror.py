@@ -0,0 +1,113 @@
+"""Module for testing orders.app_services.order_status_mirror and the status webhook."""
+import json
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from orders.app_services.order_status_mirror import order_status_mirror_handlers
+from orders.app_services.orders_handlers import order_handlers
+from orders.models import OrderStatusMirror
+from orders.views import OrderStatusWebhook
+
+FETCHED_ORDER = {
+    "id": "20",
+    "number": "dnipro-20",
+    "target_delivery_date": "2024-01-01",
+    "grand_total": 100.0,
+    "status": "В работе",
+    "currency_id": "1",
+    "products": [{"sku": "a", "name": "Product", "amount": 1, "price": 100.0}],
+}
+
+
+def create_mirror(zoho_id: str = "10", status: str = "В ожидании") -> OrderStatusMirror:
+    """Create mirrored order."""
+    return OrderStatusMirror.objects.create(
+        zoho_id=zoho_id,
+        order_number=f"dnipro-{zoho_id}",
+        status=status,
+        grand_total=Decimal("50.00"),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOrderStatusMirrorHandlers:
+    """Class for testing order_status_mirror_handlers.get_client_orders method."""
+
+    def test_only_missing_orders_are_fetched(self) -> None:
+        """Test mirrored orders are read locally and the missing ones are fetched and stored."""
+        create_mirror()
+        with mock.patch.object(
+            order_handlers, "get_client_orders", mock.AsyncMock(return_value=[FETCHED_ORDER])
+        ) as get_client_orders:
+            orders = async_to_sync(order_status_mirror_handlers.get_client_orders)(
+                ["20", "10", "30"]
+            )
+        get_client_orders.assert_awaited_once_with(["20", "30"])
+        assert [(order["id"], order["status"]) for order in orders] == [
+            ("20", "В работе"),
+            ("10", "В ожидании"),
+        ]
+        mirror = OrderStatusMirror.objects.get(zoho_id="20")
+        assert (mirror.grand_total, mirror.products) == (
+            Decimal("100.00"),
+            FETCHED_ORDER["products"],
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOrderStatusWebhook:
+    """Class for testing OrderStatusWebhook view."""
+
+    @pytest.fixture(autouse=True)
+    def webhook_secret(self, settings) -> None:
+        """Configure webhook secret."""
+        settings.ZOHO_WEBHOOK_SECRET = "secret"
+
+    @staticmethod
+    def post(path: str, data: dict, **headers: str) -> JsonResponse:
+        """Call webhook view."""
+        request = RequestFactory().post(path, data, headers=headers)
+        return async_to_sync(OrderStatusWebhook.as_view())(request)
+
+    def test_status_is_updated(self) -> None:
+        """Test status of the mirrored order is updated."""
+        create_mirror()
+        response = self.post(
+            "/webhooks/order-status/",
+            {"id": "10", "order_status": "Доставлено"},
+            X_Webhook_Secret="secret",
+        )
+        assert json.loads(response.content) == {"updated": True}
+        assert OrderStatusMirror.objects.get(zoho_id="10").status == "Доставлено"
+
+    def test_wrong_secret(self) -> None:
+        """Test request with a wrong secret is forbidden."""
+        create_mirror()
+        response = self.post(
+            "/webhooks/order-status/?secret=wrong",
+            {"id": "10", "order_status": "Доставлено"},
+        )
+        assert response.status_code == 403
+        assert OrderStatusMirror.objects.get(zoho_id="10").status == "В ожидании"
+
+    def test_json_data(self) -> None:
+        """Test status is updated by JSON object and other JSON values are rejected."""
+        create_mirror()
+        for data, status_code in (
+            ({"id": "10", "order_status": "Доставлено"}, 200),
+            ([], 400),
+            ("x", 400),
+        ):
+            request = RequestFactory().post(
+                "/webhooks/order-status/?secret=secret",
+                json.dumps(data),
+                content_type="application/json",
+            )
+            response = async_to_sync(OrderStatusWebhook.as_view())(request)
+            assert response.status_code == status_code
+        assert OrderStatusMirror.objects.get(zoho_id="10").status == "Доставлено"
@@ -0,0 +1,47 @@
+"""Module for testing orders.app_services.orders_handlers."""
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+
+from orders.app_services.orders_handlers import order_handlers
+
+
+def get_ordered_product(order_id: str, sku: str) -> dict:
+    """Get ordered product row as it's returned by the COQL query."""
+    return {
+        "order_id.id": order_id,
+        "order_id.order_number": f"dnipro-{order_id}",
+        "order_id.target_delivery_date": "2024-01-01",
+        "order_id.grand_total": 100.0,
+        "order_id.order_status": "В ожидании",
+        "order_id.order_currency_id": {"id": "1"},
+        "sku": sku,
+        "product_id.Name": f"Product {sku}",
+        "amount": 1,
+        "price": 50.0,
+    }
+
+
+class TestGetClientOrders:
+    """Class for testing order_handlers.get_client_orders method."""
+
+    def test_orders_fetched_by_one_query_and_cached(self) -> None:
+        """Test orders are fetched at once, grouped in the ids order and cached."""
+        orders_ids = ["20", "10", "30"]
+        rows = [
+            get_ordered_product("10", "a"),
+            get_ordered_product("20", "b"),
+            get_ordered_product("10", "c"),
+        ]
+        cache.clear()
+        with mock.patch(
+            "services.coql_handlers.coql_query_executor.fetch_data", return_value=rows
+        ) as fetch_data:
+            orders = async_to_sync(order_handlers.get_client_orders)(orders_ids)
+            assert async_to_sync(order_handlers.get_client_orders)(orders_ids) == orders
+        fetch_data.assert_called_once()
+        assert "where order_id.id in (20, 10, 30)" in fetch_data.call_args.args[0]
+        assert [order["id"] for order in orders] == ["20", "10"]
+        assert [product["sku"] for product in orders[1]["products"]] == ["a", "c"]
+        assert orders[0]["currency_id"] == "1"
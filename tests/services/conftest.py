@@ -15,10 +15,14 @@ from tests.mainpage.factories import ContactFactory
 class Image:
     """Class repeat ImageUpload object functionality."""
 
-    def __init__(self, image_id: int, filename: str) -> None:
+    def __init__(
+        self, image_id: int, filename: str, size: int | None = None, file_id: str = ""
+    ) -> None:
         """Create instance attributes."""
         self.id: int = image_id
         self.filename: str = filename
+        self.size: int | None = size
+        self.file_id: str = file_id
 
     def get_id(self) -> int:
         """Get self id."""
@@ -28,6 +32,14 @@ class Image:
         """Get self filename."""
         return self.filename
 
+    def get_size(self) -> int | None:
+        """Get self size."""
+        return self.size
+
+    def get_file_id(self) -> str:
+        """Get self file id."""
+        return self.file_id
+
 
 class ModHttpRequest(HttpRequest):
     """Modified HttpRequest class for testing."""
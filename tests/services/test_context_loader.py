@@ -0,0 +1,60 @@
+"""Module for testing services.context_loader."""
+import asyncio
+
+import pytest
+
+from services.context_loader import ContextLoader, Dataset
+
+
+async def load_after(delay: float, value: str) -> str:
+    """Return the value after the delay."""
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestContextLoader:
+    """Class for testing ContextLoader methods."""
+
+    def test_load(self) -> None:
+        """Test independent datasets are loaded concurrently and dependencies are passed."""
+
+        async def load_region(regions: str) -> str:
+            return f"{regions}:region"
+
+        loader = ContextLoader(
+            {
+                "regions": Dataset(lambda: load_after(0.1, "regions")),
+                "categories": Dataset(lambda: load_after(0.1, "categories")),
+                "region": Dataset(load_region, ("regions",)),
+            }
+        )
+        datasets = asyncio.run(loader.load())
+
+        assert datasets == {
+            "regions": "regions",
+            "categories": "categories",
+            "region": "regions:region",
+        }
+        assert loader.duration < 0.19
+        assert loader.critical_path[-1] == "region"
+        assert loader.critical_path[0] == "regions"
+
+    def test_unknown_or_cyclic_dependencies(self) -> None:
+        """Test datasets with unknown or cyclic dependencies aren't accepted."""
+        with pytest.raises(ValueError):
+            ContextLoader({"region": Dataset(load_after, ("regions",))})
+        with pytest.raises(ValueError):
+            ContextLoader(
+                {
+                    "first": Dataset(load_after, ("second",)),
+                    "second": Dataset(load_after, ("first",)),
+                }
+            )
+
+    def test_timeout(self) -> None:
+        """Test loading is limited by the timeout."""
+        loader = ContextLoader(
+            {"regions": Dataset(lambda: load_after(1, "regions"))}, timeout=0.05
+        )
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(loader.load())
@@ -118,3 +118,23 @@ class TestGetRegionProducts:
         mock_subcategories.return_value = []
         mock_regions.return_value = regions
         #   TODO not finished
+
+
+class TestGetNavigationVersion:
+    """Class for testing CRMData get_navigation_version method."""
+
+    @patch("services.data_getters.categories_handler.fetch_instances", new_callable=AsyncMock)
+    def test_version_changes_with_categories(self, mock_categories: AsyncMock) -> None:
+        """Test version is the same until categories got from Zoho CRM change."""
+        cache.clear()
+        mock_categories.return_value = [{"id": "1", "Name": "Flowers"}]
+        async_to_sync(crm_data.get_categories_list)()
+        version = async_to_sync(crm_data.get_navigation_version)()
+        assert async_to_sync(crm_data.get_navigation_version)() == version
+        cache.delete("categories")
+        async_to_sync(crm_data.get_categories_list)()
+        assert async_to_sync(crm_data.get_navigation_version)() == version
+        cache.delete("categories")
+        mock_categories.return_value = [{"id": "1", "Name": "Bouquets"}]
+        async_to_sync(crm_data.get_categories_list)()
+        assert async_to_sync(crm_data.get_navigation_version)() != version
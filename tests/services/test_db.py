@@ -0,0 +1,78 @@
+"""Module for testing services.db."""
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from django.db import connection
+
+from services.db import DatabasePool
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDatabasePool:
+    """Class for testing DatabasePool methods."""
+
+    def test_run(self, settings) -> None:
+        """Test calls run concurrently on the pool threads with the caller context."""
+        settings.DB_POOL_SIZE = 2
+        db_pool = DatabasePool()
+
+        def query() -> tuple[str, str]:
+            time.sleep(0.1)
+            return threading.current_thread().name, request_id.get()
+
+        async def run_queries():
+            request_id.set("first")
+            return await asyncio.gather(db_pool.run(query), db_pool.run(query))
+
+        started_at = time.perf_counter()
+        results = asyncio.run(run_queries())
+        elapsed = time.perf_counter() - started_at
+        db_pool.shutdown()
+
+        assert elapsed < 0.19
+        assert {thread_name.split("_")[0] for thread_name, _ in results} == {"db"}
+        assert len({thread_name for thread_name, _ in results}) == 2
+        assert [value for _, value in results] == ["first", "first"]
+
+    def test_stats(self, settings) -> None:
+        """Test calls waiting for the busy worker are counted as saturated."""
+        settings.DB_POOL_SIZE = 1
+        db_pool = DatabasePool()
+
+        async def run_queries():
+            await asyncio.gather(*(db_pool.run(time.sleep, 0.05) for _ in range(3)))
+
+        asyncio.run(run_queries())
+        db_pool.shutdown()
+
+        assert db_pool.stats["calls"] == 3
+        assert db_pool.stats["saturated_calls"] == 2
+        assert db_pool.stats["max_busy"] == 1
+        assert db_pool.stats["max_wait_seconds"] >= 0.05
+        assert db_pool.stats["connects"] == 1
+        assert db_pool.busy == 0
+
+    def test_worker_connection_is_kept(self, settings) -> None:
+        """Test connections of the workers are kept, unlike ones of the other threads."""
+        settings.DB_POOL_CONN_MAX_AGE = 60
+        db_pool = DatabasePool()
+
+        def get_connection_age() -> float:
+            connection.close()
+            connection.ensure_connection()
+            return connection.close_at - time.monotonic()
+
+        age = asyncio.run(db_pool.run(get_connection_age))
+        ages = []
+        thread = threading.Thread(target=lambda: ages.append(get_connection_age()))
+        thread.start()
+        thread.join()
+        db_pool.shutdown()
+
+        assert 50 < age <= 60
+        assert ages[0] <= 0
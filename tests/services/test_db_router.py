@@ -0,0 +1,44 @@
+"""Module for testing services.db_router."""
+from unittest.mock import MagicMock, patch
+
+from django.db import OperationalError
+
+from mainpage.models import SeoBlock
+from services.db_router import (
+    ReplicaRouter,
+    RequestDatabaseState,
+    request_database_state,
+)
+
+
+class TestReplicaRouter:
+    """Class for testing ReplicaRouter methods."""
+
+    def test_db_for_read(self) -> None:
+        """Test reads go to the replica until the request writes data."""
+        router = ReplicaRouter()
+        assert router.db_for_read(SeoBlock) == "default"
+
+        token = request_database_state.set(RequestDatabaseState())
+        try:
+            with patch.object(
+                router, "get_replica_alias", return_value="replica"
+            ), patch.object(router, "is_replica_available", return_value=True):
+                assert router.db_for_read(SeoBlock) == "replica"
+                assert router.db_for_write(SeoBlock) == "default"
+                assert router.db_for_read(SeoBlock) == "default"
+        finally:
+            request_database_state.reset(token)
+        assert router.db_for_read(SeoBlock) == "default"
+
+    def test_is_replica_available(self) -> None:
+        """Test replica failing to connect is skipped until the retry time."""
+        router = ReplicaRouter()
+        connections = MagicMock()
+        connections["replica"].ensure_connection.side_effect = OperationalError
+        with patch("services.db_router.connections", connections):
+            assert not router.is_replica_available("replica")
+            connections["replica"].ensure_connection.side_effect = None
+            assert not router.is_replica_available("replica")
+            router.unavailable_until = 0.0
+            assert router.is_replica_available("replica")
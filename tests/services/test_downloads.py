@@ -0,0 +1,104 @@
+"""Module for testing services.downloads."""
+import os
+from typing import List
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.conf import settings
+
+from services.downloads import MediaDownloader
+
+
+def create_client(responses: List[httpx.Response | Exception]) -> httpx.AsyncClient:
+    """Create client answering with the given responses one by one."""
+    responses = list(responses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def download(downloader: MediaDownloader, client: httpx.AsyncClient, file_name: str) -> bool:
+    """Download file with the given client and close it."""
+
+    async def run() -> bool:
+        async with client:
+            return await downloader.download(client, "https://example.com/file", file_name)
+
+    return async_to_sync(run)()
+
+
+class TestMediaDownloader:
+    """Class for testing MediaDownloader download method."""
+
+    file_name: str = "downloads_test/rose.jpg"
+    content: bytes = os.urandom(200 * 1024)
+
+    @staticmethod
+    def get_path(file_name: str) -> str:
+        """Get absolute path of the file in media root."""
+        return os.path.join(settings.MEDIA_ROOT, file_name)
+
+    def get_downloader(self) -> MediaDownloader:
+        """Get downloader without retry delays."""
+        return MediaDownloader(max_concurrency=2, chunk_size=16 * 1024, retries=2, backoff=0)
+
+    def test_download(self) -> None:
+        """Test file is streamed to its place and counted."""
+        downloader = self.get_downloader()
+        client = create_client([httpx.Response(200, content=self.content)])
+        assert download(downloader, client, self.file_name)
+        with open(self.get_path(self.file_name), "rb") as f:
+            assert f.read() == self.content
+        assert downloader.stats["files"] == 1
+        assert downloader.stats["bytes"] == len(self.content)
+        assert not [
+            name
+            for name in os.listdir(os.path.dirname(self.get_path(self.file_name)))
+            if name.endswith(".part")
+        ]
+
+    def test_download_retries(self) -> None:
+        """Test transport errors and 5xx responses are retried."""
+        downloader = self.get_downloader()
+        client = create_client(
+            [
+                httpx.ConnectError("Connection refused"),
+                httpx.Response(503),
+                httpx.Response(200, content=b"content"),
+            ]
+        )
+        assert download(downloader, client, "downloads_test/retried.jpg")
+        assert downloader.stats["retries"] == 2
+        assert downloader.stats["failed"] == 0
+
+    def test_download_not_found(self) -> None:
+        """Test client errors aren't retried and file isn't created."""
+        downloader = self.get_downloader()
+        client = create_client([httpx.Response(404)])
+        assert not download(downloader, client, "downloads_test/missing.jpg")
+        assert downloader.stats["retries"] == 0
+        assert downloader.stats["failed"] == 1
+        assert not os.path.exists(self.get_path("downloads_test/missing.jpg"))
+
+    def test_download_retries_exhausted(self) -> None:
+        """Test download fails after all retries."""
+        downloader = self.get_downloader()
+        client = create_client([httpx.Response(500)] * 3)
+        assert not download(downloader, client, "downloads_test/broken.jpg")
+        assert downloader.stats["retries"] == 2
+        assert downloader.stats["failed"] == 1
+
+    def test_remove_files(self) -> None:
+        """Test files are removed, missing ones are skipped."""
+        os.makedirs(os.path.dirname(self.get_path("downloads_test/old.jpg")), exist_ok=True)
+        with open(self.get_path("downloads_test/old.jpg"), "wb") as f:
+            f.write(b"old")
+        async_to_sync(MediaDownloader.remove_files)(
+            ["downloads_test/old.jpg", "downloads_test/never_existed.jpg"]
+        )
+        assert not os.path.exists(self.get_path("downloads_test/old.jpg"))
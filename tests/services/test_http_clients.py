@@ -0,0 +1,33 @@
+"""Module for testing services.http_clients."""
+import asyncio
+
+from services.http_clients import HTTPClients
+
+
+class TestHTTPClients:
+    """Class for testing HTTPClients methods."""
+
+    def test_client(self) -> None:
+        """Test pooled client is shared in its loop and short-lived ones are used otherwise."""
+        http_clients = HTTPClients()
+
+        async def get_clients():
+            async with http_clients.client("zoho") as first, http_clients.client(
+                "zoho"
+            ) as second:
+                return first, second
+
+        first, second = asyncio.run(get_clients())
+        assert first is not second
+        assert first.is_closed
+
+        async def get_pooled_clients():
+            await http_clients.open()
+            clients = await get_clients()
+            await http_clients.close()
+            return clients
+
+        first, second = asyncio.run(get_pooled_clients())
+        assert first is second
+        assert first.is_closed
+        assert not http_clients.is_open
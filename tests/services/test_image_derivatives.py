@@ -0,0 +1,54 @@
+"""Module for testing services.image_derivatives."""
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from services.image_derivatives import build_derivatives, get_supported_formats
+
+
+class TestGetSupportedFormats:
+    """Class for testing get_supported_formats function."""
+
+    def test_get_supported_formats_webp(self) -> None:
+        """Test that WebP is always among supported formats."""
+        assert "WEBP" in get_supported_formats()
+
+
+class TestBuildDerivatives:
+    """Class for testing build_derivatives function."""
+
+    @staticmethod
+    def create_source(media_root: Path, width: int = 800, height: int = 600) -> str:
+        """Create source image inside the media root, return its relative path."""
+        os.makedirs(media_root / "products_base" / "rose", exist_ok=True)
+        Image.new("RGB", (width, height), "red").save(
+            media_root / "products_base" / "rose" / "rose.png"
+        )
+        return "products_base/rose/rose.png"
+
+    def test_build_derivatives(self, tmp_path: Path) -> None:
+        """Test derivatives widths, formats and content-hashed names."""
+        source = self.create_source(tmp_path)
+        result = build_derivatives(source, str(tmp_path), (320, 640, 1280), ("WEBP",))
+        assert [derivative["width"] for derivative in result] == [320, 640, 800]
+        for derivative in result:
+            assert derivative["format"] == "WEBP"
+            assert derivative["file"].endswith(f"-{derivative['width']}w.webp")
+            with Image.open(tmp_path / derivative["file"]) as image:
+                assert image.width == derivative["width"]
+                assert image.height == round(600 * derivative["width"] / 800)
+
+    def test_build_derivatives_same_content_same_names(self, tmp_path: Path) -> None:
+        """Test that identical sources share derivative files."""
+        first = build_derivatives(
+            self.create_source(tmp_path), str(tmp_path), (320,), ("WEBP",)
+        )
+        os.rename(
+            tmp_path / "products_base" / "rose" / "rose.png",
+            tmp_path / "products_base" / "rose" / "copy.png",
+        )
+        second = build_derivatives(
+            "products_base/rose/copy.png", str(tmp_path), (320,), ("WEBP",)
+        )
+        assert first == second
@@ -1,15 +1,55 @@
 """Module for testing services.image_handlers."""
-from collections import namedtuple
+import hashlib
+import os
 from typing import Dict, List, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from asgiref.sync import async_to_sync
-from faker import Faker
+from django.conf import settings
+from django.core.cache import cache
 
-from services.image_handlers import product_image_handler
+from products.models import MediaBlob, ZohoImage
+from services.image_handlers import product_image_handler, subcategory_image_handler
+from services.media_store import media_store
+from tests.products.factories import ZohoImageFactory, ZohoModuleRecordFactory
+from tests.services.conftest import Image
 
-Image = namedtuple("Image", ["id", "slug", "file_name"])
+
+def get_blob_name(file_name: str) -> str:
+    """Get media store name of the file written by 'fake_download'."""
+    return media_store.get_blob_name(
+        hashlib.sha256(file_name.encode()).hexdigest(), os.path.splitext(file_name)[1]
+    )
+
+
+async def fake_download(images_dict: Dict) -> List[str]:
+    """Write staging files with their Zoho file names as content, return their names."""
+    files_names = []
+    for image_id, image_data in images_dict.items():
+        file_name = media_store.get_staging_name(image_id, image_data.file_name)
+        os.makedirs(
+            os.path.dirname(os.path.join(settings.MEDIA_ROOT, file_name)), exist_ok=True
+        )
+        with open(os.path.join(settings.MEDIA_ROOT, file_name), "wb") as f:
+            f.write(image_data.file_name.encode())
+        files_names.append(file_name)
+    return files_names
+
+
+def sync_products_images(records: List[Dict]) -> Tuple[Dict, AsyncMock]:
+    """Synchronize products images with faked downloads, return index and download mock."""
+    with patch.object(
+        product_image_handler,
+        "download_images_and_get_files_names",
+        new_callable=AsyncMock,
+        side_effect=fake_download,
+    ) as mock_download, patch(
+        "services.image_handlers.image_derivatives_builder.build_for_images",
+        new_callable=AsyncMock,
+    ):
+        images_index = async_to_sync(product_image_handler.sync_products_images)(records)
+    return images_index, mock_download
 
 
 @pytest.mark.django_db
@@ -18,72 +58,99 @@ class TestEmbedProductsImage:
 
     pytestmark = pytest.mark.django_db
 
-    @patch(
-        "services.image_handlers.image_handlers.download_images_and_get_files_names",
-        new_callable=AsyncMock,
-    )
+    @pytest.fixture(autouse=True)
+    def synchronized_images(
+        self, get_fake_products_data_with_images: Tuple[List[Dict], List[Dict]]
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Synchronize fake products images, return products data."""
+        products, products_with_img = get_fake_products_data_with_images
+        cache.delete(product_image_handler.IMAGES_INDEX_CACHE_KEY)
+        sync_products_images(products_with_img)
+        yield products, products_with_img
+        cache.delete(product_image_handler.IMAGES_INDEX_CACHE_KEY)
+
     @patch("services.crm_interface.custom_record_operations.get_records")
     def test_embed_products_image(
         self,
-        mock_data_with_images: MagicMock,
-        mock_download_files: AsyncMock,
-        faker: Faker,
-        get_fake_products_data_with_images: Tuple[List[Dict], List[Dict]],
+        mock_get_records: MagicMock,
+        synchronized_images: Tuple[List[Dict], List[Dict]],
     ) -> None:
         """Test embed_products_image method."""
-        products, products_with_img = get_fake_products_data_with_images
-        file_names: List = []
-        for product in products_with_img:
-            for image in product["images"]:
-                file_names.append(image.get_file_name())
-
-        mock_data_with_images.return_value = products_with_img
-        mock_download_files.return_value = file_names
-
+        products, products_with_img = synchronized_images
         result = async_to_sync(product_image_handler.embed_products_image)(
             products, is_many=True
         )
+        mock_get_records.assert_not_called()
         for i, product in enumerate(products_with_img):
-            for key, value in product.items():
-                if key == "images":
-                    assert len(result[i]["images"]) == 3
-                    for j, image in enumerate(result[i]["images"]):
-                        assert value[j].get_file_name() == image.name
-                else:
-                    assert result[i][key] == value
-
-    @patch(
-        "services.image_handlers.image_handlers.download_images_and_get_files_names",
-        new_callable=AsyncMock,
-    )
-    @patch("services.crm_interface.custom_record_operations.get_records")
+            assert len(result[i]["images"]) == 3
+            for j, image in enumerate(result[i]["images"]):
+                assert get_blob_name(product["images"][j].get_file_name()) == image.name
+            assert result[i]["images_srcset"] == [{}, {}, {}]
+
     def test_embed_products_image_many_false(
-        self,
-        mock_data_with_images: MagicMock,
-        mock_download_files: AsyncMock,
-        faker: Faker,
-        get_fake_products_data_with_images: Tuple[List[Dict], List[Dict]],
+        self, synchronized_images: Tuple[List[Dict], List[Dict]]
     ) -> None:
         """Test embed_products_image method. Many is False."""
-        products, products_with_img = get_fake_products_data_with_images
-        file_names: List = []
-        for product in products_with_img:
-            for image in product["images"]:
-                file_names.append(image.get_file_name())
-                break
-
-        mock_data_with_images.return_value = products_with_img
-        mock_download_files.return_value = file_names
-
+        products, products_with_img = synchronized_images
+        result = async_to_sync(product_image_handler.embed_products_image)(
+            products, is_many=False
+        )
+        for i, product in enumerate(products_with_img):
+            assert (
+                get_blob_name(product["images"][0].get_file_name()) == result[i]["image"].name
+            )
+            assert result[i]["image_srcset"] == {}
+            assert "images" not in result[i]
+
+    def test_embed_products_image_without_cached_index(
+        self, synchronized_images: Tuple[List[Dict], List[Dict]]
+    ) -> None:
+        """Test embed_products_image method, index is rebuilt from the local db."""
+        products, products_with_img = synchronized_images
+        cache.delete(product_image_handler.IMAGES_INDEX_CACHE_KEY)
         result = async_to_sync(product_image_handler.embed_products_image)(
             products, is_many=False
         )
         for i, product in enumerate(products_with_img):
-            for key, value in product.items():
-                if key == "images":
-                    assert value[0].get_file_name() == result[i]["image"].name
-                else:
-                    assert result[i][key] == value
+            assert (
+                get_blob_name(product["images"][0].get_file_name()) == result[i]["image"].name
+            )
+
+    def test_sync_products_images_modified_product(
+        self, synchronized_images: Tuple[List[Dict], List[Dict]]
+    ) -> None:
+        """Test that only modified products are synchronized, outdated images removed."""
+        products, products_with_img = synchronized_images
+        modified_product = dict(products_with_img[0])
+        modified_product["images"] = list(reversed(modified_product["images"][1:]))
+        images_index, mock_download = sync_products_images([modified_product])
+        mock_download.assert_awaited_once_with({})
+        assert not ZohoImage.objects.filter(id=products_with_img[0]["images"][0].get_id())
+        assert [image["name"] for image in images_index[int(modified_product["id"])]] == [
+            get_blob_name(image.get_file_name()) for image in modified_product["images"]
+        ]
+        assert len(images_index) == len(products_with_img)
+
+    def test_sync_products_images_shared_files(
+        self, synchronized_images: Tuple[List[Dict], List[Dict]]
+    ) -> None:
+        """Test that images known by metadata aren't downloaded and are stored once."""
+        products, products_with_img = synchronized_images
+        shared = [Image(image_id, "shared.jpg", size=1024) for image_id in (101, 102, 103)]
+        records = [
+            {"id": "11", "slug": "rose-kyiv", "images": [shared[0]]},
+            {"id": "12", "slug": "rose-lviv", "images": [shared[1]]},
+        ]
+        images_index, mock_download = sync_products_images(records)
+        assert list(mock_download.await_args.args[0]) == [101]
+        assert images_index[11] == images_index[12]
+
+        images_index, mock_download = sync_products_images(
+            [{"id": "13", "slug": "rose-odesa", "images": [shared[2]]}]
+        )
+        mock_download.assert_awaited_once_with({})
+        assert images_index[13] == images_index[11]
+        assert MediaBlob.objects.filter(file=get_blob_name("shared.jpg")).count() == 1
 
 
 class TestCreateImagesDict:
@@ -119,3 +186,34 @@ class TestCreateImagesDict:
                 assert img.file_name == image.get_file_name()
                 break
         assert len(products_with_images) == len(result)
+
+
+@pytest.mark.django_db
+class TestSubcategoryImagesDerivatives:
+    """Class for testing derivatives of the subcategories images."""
+
+    @patch("services.image_handlers.image_derivatives_builder")
+    def test_get_images_srcsets(self, builder_mock: MagicMock) -> None:
+        """Test srcsets are only read, derivatives aren't built in the request."""
+        builder_mock.get_images_srcsets = AsyncMock(return_value={1: {"webp": "first 320w"}})
+        builder_mock.build_for_images = AsyncMock()
+
+        images_srcsets = async_to_sync(subcategory_image_handler.get_images_srcsets)(
+            {1: ZohoImage(id=1), 2: ZohoImage(id=2), 3: None}
+        )
+
+        builder_mock.get_images_srcsets.assert_awaited_once_with([1, 2])
+        builder_mock.build_for_images.assert_not_awaited()
+        assert images_srcsets == {1: {"webp": "first 320w"}}
+
+    @patch("services.image_handlers.image_derivatives_builder.build_for_images")
+    def test_build_missing_derivatives(self, build_for_images: AsyncMock) -> None:
+        """Test derivatives are built for the subcategories images only."""
+        subcategory_image = ZohoImageFactory(
+            zoho_record=ZohoModuleRecordFactory(module_name="subcategories")
+        )
+        ZohoImageFactory(zoho_record=ZohoModuleRecordFactory(module_name="products_base"))
+        build_for_images.return_value = ["webp", "avif"]
+
+        assert async_to_sync(subcategory_image_handler.build_missing_derivatives)() == 2
+        assert build_for_images.await_args.args == ([subcategory_image],)
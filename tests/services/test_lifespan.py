@@ -0,0 +1,33 @@
+"""Module for testing services.lifespan."""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from services.lifespan import lifespan_application
+
+
+class TestLifespanApplication:
+    """Class for testing lifespan_application wrapper."""
+
+    @patch("services.lifespan.shutdown", new_callable=AsyncMock)
+    @patch("services.lifespan.startup", new_callable=AsyncMock)
+    def test_lifespan(self, startup_mock: AsyncMock, shutdown_mock: AsyncMock) -> None:
+        """Test lifespan events are handled and HTTP requests are passed to the application."""
+        django_application = AsyncMock()
+        application = lifespan_application(django_application)
+        messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        asyncio.run(application({"type": "lifespan"}, receive, send))
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        startup_mock.assert_awaited_once()
+        shutdown_mock.assert_awaited_once()
+        django_application.assert_not_called()
+
+        asyncio.run(application({"type": "http"}, receive, send))
+        django_application.assert_awaited_once()
@@ -0,0 +1,55 @@
+"""Module for testing services.media_store."""
+import os
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.utils import timezone
+
+from products.models import MediaBlob
+from services.media_store import media_store
+from tests.products.factories import ZohoImageFactory
+
+
+def write_media_file(file_name: str, content: bytes) -> str:
+    """Write file into the media root, return its name."""
+    path = os.path.join(settings.MEDIA_ROOT, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    return file_name
+
+
+@pytest.mark.django_db
+class TestMediaStore:
+    """Class for testing MediaStore ingest and collect_garbage methods."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_ingest_same_content(self) -> None:
+        """Test that the same content is stored once."""
+        first = async_to_sync(media_store.ingest)(write_media_file("incoming/a.JPG", b"rose"))
+        second = async_to_sync(media_store.ingest)(write_media_file("incoming/b.png", b"rose"))
+        assert first == second
+        assert first.file.name.startswith(f"blobs/{first.sha256[:2]}/{first.sha256}")
+        assert first.file.name.endswith(".jpg")
+        assert first.size == 4
+        assert os.path.exists(os.path.join(settings.MEDIA_ROOT, first.file.name))
+        assert not os.path.exists(os.path.join(settings.MEDIA_ROOT, "incoming/b.png"))
+
+    def test_collect_garbage(self) -> None:
+        """Test that only unreferenced blobs older than the given time are deleted."""
+        referenced = async_to_sync(media_store.ingest)(write_media_file("in/1.jpg", b"tulip"))
+        unreferenced = async_to_sync(media_store.ingest)(write_media_file("in/2.jpg", b"lily"))
+        ZohoImageFactory(image=referenced.file.name, blob=referenced)
+
+        assert not async_to_sync(media_store.collect_garbage)(
+            timezone.now() - timedelta(hours=1)
+        )
+        removed_files = async_to_sync(media_store.collect_garbage)(
+            timezone.now() + timedelta(seconds=1)
+        )
+        assert removed_files == [unreferenced.file.name]
+        assert list(MediaBlob.objects.all()) == [referenced]
+        assert not os.path.exists(os.path.join(settings.MEDIA_ROOT, unreferenced.file.name))
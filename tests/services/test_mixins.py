@@ -1,13 +1,16 @@
 """Module for testing services mixins functionality."""
+import asyncio
 from typing import Dict, List, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from asgiref.sync import async_to_sync
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from django.views import View
 from faker import Faker
 
-from services.mixins import ApplicationMixin
+from services.mixins import ApplicationMixin, ConditionalGetMixin
 from services.utils import formatters
 from tests.mainpage.factories import CustomCategoriesFactory
 
@@ -91,6 +94,17 @@ class TestGetCommonContext:
                     assert category[key] == value
         assert result["cart_products_quantity"] == 0
 
+    @patch("services.mixins.ContextLoader.load", new_callable=AsyncMock)
+    def test_get_common_context_timeout(self, load_mock: AsyncMock) -> None:
+        """Test the notification page is rendered with 503, if context isn't loaded in time."""
+        load_mock.side_effect = asyncio.TimeoutError
+        application_mixin = ApplicationMixin()
+        application_mixin.request = RequestFactory().get("/kyiv/")
+        application_mixin.request.session = {}
+        result = async_to_sync(application_mixin.get_common_context)(region_slug="kyiv")
+        assert result.status_code == 503
+        assert b"loaded in time" in result.content
+
 
 @pytest.mark.django_db
 class TestGetSelectedRegion:
@@ -277,3 +291,81 @@ class TestGetCategories:
         for i, category in enumerate(result["custom_categories"]):
             assert category == custom_categories[i]
         assert len(result["custom_categories"]) == 6 - categories_number
+
+
+@pytest.mark.django_db
+class TestGetRequestRegionAndCurrency:
+    """Class for testing ApplicationMixin get_request_region_and_currency method."""
+
+    pytestmark = pytest.mark.django_db
+
+    @patch("services.data_getters.crm_data.get_location", new_callable=AsyncMock)
+    @patch("services.data_getters.crm_data.get_currency_list", new_callable=AsyncMock)
+    @patch("services.data_getters.crm_data.get_regions_list", new_callable=AsyncMock)
+    def test_get_request_region_and_currency(
+        self,
+        region_mock: AsyncMock,
+        currency_mock: AsyncMock,
+        location_mock: AsyncMock,
+        faker: Faker,
+        get_regions_data: Tuple[List[Dict], List[Dict]],
+        get_fake_currency_list: List[Dict[str, int]],
+    ) -> None:
+        """Test region is found by the client country and currency by the query parameter."""
+        input_list, regions = get_regions_data
+        region: Dict = faker.random_element(elements=regions)
+        selected_currency = faker.random_element(elements=get_fake_currency_list)
+        region_mock.return_value = regions
+        currency_mock.return_value = get_fake_currency_list
+        location_mock.return_value = {"country": region["country_code"].upper()}
+
+        application_mixin = ApplicationMixin()
+        application_mixin.request = HttpRequest()
+        application_mixin.request.GET = {"currency": selected_currency["Name"].lower()}
+        with patch("services.data_getters.cache.get", return_value=None):
+            result_region, currency = async_to_sync(
+                application_mixin.get_request_region_and_currency
+            )()
+        assert result_region["country_code"] == region["country_code"]
+        assert currency == selected_currency
+
+
+class ConditionalView(ConditionalGetMixin, ApplicationMixin, View):
+    """View for testing ConditionalGetMixin."""
+
+    async def get(self, request, *args, **kwargs):
+        """Return the page."""
+        return HttpResponse("page")
+
+
+class TestConditionalGetMixin:
+    """Class for testing ConditionalGetMixin dispatch method."""
+
+    @patch("services.mixins.page_cache.get_version", new_callable=AsyncMock)
+    @patch.object(ApplicationMixin, "get_request_region_and_currency", new_callable=AsyncMock)
+    def test_dispatch(
+        self, region_and_currency_mock: AsyncMock, version_mock: AsyncMock
+    ) -> None:
+        """Test 304 is returned for the actual ETag and ETag changes with the cart."""
+        region_and_currency_mock.return_value = ({"slug": "kyiv"}, {"Name": "UAH"})
+        version_mock.return_value = "1"
+        factory = RequestFactory()
+        view = ConditionalView.as_view()
+
+        request = factory.get("/kyiv/")
+        request.session = {}
+        response = async_to_sync(view)(request)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        request = factory.get("/kyiv/", HTTP_IF_NONE_MATCH=etag)
+        request.session = {}
+        response = async_to_sync(view)(request)
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        request = factory.get("/kyiv/", HTTP_IF_NONE_MATCH=etag)
+        request.session = {"cart": {"v": 2, "lines": {"1:": 1}, "quantity": 1}}
+        response = async_to_sync(view)(request)
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -0,0 +1,52 @@
+"""Module for testing services.page_cache."""
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from services.page_cache import page_cache
+
+
+class TestPageCache:
+    """Class for testing PageCache methods."""
+
+    def test_get_key(self, settings) -> None:
+        """Test key varies on the allowed query parameters, region, currency and cookies."""
+        settings.PAGE_CACHE_VARY_COOKIES = ("theme",)
+        factory = RequestFactory()
+        request = factory.get("/kyiv/", {"currency": "UAH", "utm_source": "ads"})
+        key = page_cache.get_key(request, ("currency",), "kyiv", "UAH", "1")
+
+        same_request = factory.get("/kyiv/", {"currency": "UAH", "utm_source": "mail"})
+        assert page_cache.get_key(same_request, ("currency",), "kyiv", "UAH", "1") == key
+        assert page_cache.get_key(request, ("currency",), "kyiv", "USD", "1") != key
+        assert page_cache.get_key(request, ("currency",), "lviv", "UAH", "1") != key
+        assert page_cache.get_key(request, ("currency",), "kyiv", "UAH", "2") != key
+        request.COOKIES["theme"] = "dark"
+        assert page_cache.get_key(request, ("currency",), "kyiv", "UAH", "1") != key
+
+    def test_set_and_fill(self) -> None:
+        """Test CSRF token isn't cached and holes are filled with the per-user parts."""
+        content = (
+            '<span>{}</span><div data-is-added="{}"></div><div data-is-added="{}"></div>'
+            '<input type="hidden" name="csrfmiddlewaretoken" value="token">'
+        ).format(
+            page_cache.hole("cart-quantity"),
+            page_cache.hole("in-cart", "1"),
+            page_cache.hole("in-cart", "2"),
+        )
+        page_cache.set("page_test", content)
+        cached_content = page_cache.get("page_test")
+        cache.delete("page_test")
+
+        assert 'value="token"' not in cached_content
+        assert page_cache.fill(
+            cached_content, {"cart-quantity": "3", "csrf-token": "new"}, {"2"}
+        ) == (
+            '<span>3</span><div data-is-added="False"></div><div data-is-added="True"></div>'
+            '<input type="hidden" name="csrfmiddlewaretoken" value="new">'
+        )
+
+    def test_invalidate(self) -> None:
+        """Test invalidation changes the generation included into the pages version."""
+        generation = cache.get(page_cache.generation_key, 0)
+        page_cache.invalidate()
+        assert cache.get(page_cache.generation_key) == generation + 1
@@ -0,0 +1,61 @@
+"""Module for testing services.request_timing."""
+import logging
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template import engines
+from django.template.response import SimpleTemplateResponse
+from django.test import RequestFactory
+
+from services.request_timing import (
+    RequestTimingMiddleware,
+    RequestTimings,
+    TimedCache,
+    request_timings,
+    timed,
+)
+
+
+class TestRequestTimingMiddleware:
+    """Class for testing RequestTimingMiddleware methods."""
+
+    def test_async_request(self, settings, caplog) -> None:
+        """Test phases of the request are sent in the header and the slow request is logged."""
+        settings.SERVER_TIMING_HEADER = True
+        settings.REQUEST_TIMING_LOG_THRESHOLD = 0
+        timed_cache = TimedCache(cache)
+
+        async def get_response(request):
+            with timed("coql"):
+                timed_cache.get("missing")
+            timed_cache.get("missing")
+            return HttpResponse()
+
+        middleware = RequestTimingMiddleware(get_response)
+        with caplog.at_level(logging.WARNING, logger="services.request_timing"):
+            response = async_to_sync(middleware)(RequestFactory().get("/kyiv/"))
+
+        header = response.headers["Server-Timing"]
+        assert "coql;dur=" in header and 'desc="1 calls"' in header
+        assert "cache;dur=" in header and 'desc="2 calls"' in header
+        assert "total;dur=" in header
+        assert caplog.records[0].request_timings["path"] == "/kyiv/"
+        assert caplog.records[0].request_timings["phases"]["cache"]["count"] == 2
+        assert request_timings.get() is None
+
+    def test_template_response(self, settings) -> None:
+        """Test rendering of the template response is timed, header isn't sent by default."""
+        del settings.SERVER_TIMING_HEADER
+        request = RequestFactory().get("/")
+        response = SimpleTemplateResponse(engines["django"].from_string("page"))
+        middleware = RequestTimingMiddleware(lambda request: response)
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            middleware.process_template_response(request, response).render()
+        finally:
+            request_timings.reset(token)
+
+        assert timings.phases["render"]["count"] == 1
+        assert "Server-Timing" not in middleware.process_timings(request, response, timings)
@@ -0,0 +1,70 @@
+"""Module for testing services.sessions."""
+import logging
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.sessions.models import Session
+
+from services.sessions import SessionStore, session_write_behind
+
+
+@pytest.mark.django_db
+class TestSessionStore:
+    """Class for testing SessionStore load and save methods."""
+
+    pytestmark = pytest.mark.django_db
+
+    @staticmethod
+    def create_session() -> SessionStore:
+        """Create saved session with a cart."""
+        session = SessionStore()
+        session["cart"] = {"quantity": 1}
+        session.save()
+        return session
+
+    def test_save_write_behind(self) -> None:
+        """Test changes are cached right away and written to the database by the worker."""
+        session = self.create_session()
+        session["cart"] = {"quantity": 2}
+        with mock.patch.object(session_write_behind, "schedule") as schedule:
+            session.save()
+        assert SessionStore(session.session_key).load()["cart"] == {"quantity": 2}
+        session_key, instance = schedule.call_args.args
+        session_write_behind._pending[session_key] = instance
+        session_write_behind.flush(session_key)
+        stored_data = Session.objects.get(session_key=session.session_key).get_decoded()
+        assert stored_data["cart"] == {"quantity": 2}
+
+    def test_save_unchanged(self) -> None:
+        """Test session isn't written again if its data didn't change."""
+        session = SessionStore(self.create_session().session_key)
+        session.load()
+        session.modified = True
+        with mock.patch.object(session_write_behind, "schedule") as schedule:
+            session.save()
+            async_to_sync(session.asave)()
+        schedule.assert_not_called()
+
+    def test_aload(self) -> None:
+        """Test session data is loaded asynchronously."""
+        session_key = self.create_session().session_key
+        session = SessionStore(session_key)
+        assert async_to_sync(session.aload)() == {"cart": {"quantity": 1}}
+        assert not session.accessed
+
+    def test_flush_failed_write(self, caplog) -> None:
+        """Test failed write is logged and retried once."""
+        instance = mock.MagicMock()
+        instance.save.side_effect = [RuntimeError("Connection lost"), None]
+        session_write_behind._pending["first"] = instance
+        with caplog.at_level(logging.ERROR, logger="services.sessions"):
+            session_write_behind.flush("first")
+        assert instance.save.call_count == 2
+        assert len(caplog.records) == 1
+
+        instance.save.side_effect = RuntimeError("Connection lost")
+        session_write_behind._pending["second"] = instance
+        session_write_behind.flush("second")
+        assert instance.save.call_count == 4
+        assert "changes are lost" in caplog.records[-1].message
@@ -0,0 +1,75 @@
+"""Module for testing services.static_files."""
+import gzip
+from pathlib import Path
+
+from django.test import RequestFactory, override_settings
+
+from services.static_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CompressedManifestStaticFilesStorage,
+    StaticFilesServer,
+)
+
+CSS_CONTENT = b"body { color: black; }\n" * 200
+
+
+class TestCompressedManifestStaticFilesStorage:
+    """Class for testing CompressedManifestStaticFilesStorage compress method."""
+
+    def test_compress(self, tmp_path: Path) -> None:
+        """Test gzip variant is written for the compressible file."""
+        (tmp_path / "common.css").write_bytes(CSS_CONTENT)
+        storage = CompressedManifestStaticFilesStorage(location=str(tmp_path))
+        assert "common.css.gz" in storage.compress("common.css")
+        assert gzip.decompress((tmp_path / "common.css.gz").read_bytes()) == CSS_CONTENT
+
+    def test_compress_incompressible(self, tmp_path: Path) -> None:
+        """Test variants aren't written when they aren't smaller."""
+        (tmp_path / "tiny.css").write_bytes(b"a{}")
+        storage = CompressedManifestStaticFilesStorage(location=str(tmp_path))
+        assert storage.compress("tiny.css") == []
+        assert not (tmp_path / "tiny.css.gz").exists()
+
+
+class TestStaticFilesServer:
+    """Class for testing StaticFilesServer get_response method."""
+
+    @staticmethod
+    def collect(static_root: Path) -> None:
+        """Write fingerprinted and plain files with gzip variants."""
+        (static_root / "styles").mkdir()
+        for name in ("common.0123456789ab.css", "common.css"):
+            (static_root / "styles" / name).write_bytes(CSS_CONTENT)
+            (static_root / "styles" / f"{name}.gz").write_bytes(gzip.compress(CSS_CONTENT))
+
+    def test_get_response_fingerprinted(self, tmp_path: Path) -> None:
+        """Test fingerprinted file is served compressed and immutable."""
+        self.collect(tmp_path)
+        request = RequestFactory().get(
+            "/static/styles/common.0123456789ab.css", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        with override_settings(STATIC_ROOT=str(tmp_path), STATIC_URL="static/", DEBUG=False):
+            response = StaticFilesServer().get_response(request)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(b"".join(response.streaming_content)) == CSS_CONTENT
+
+    def test_get_response_plain(self, tmp_path: Path) -> None:
+        """Test not fingerprinted file is revalidated and isn't compressed if not accepted."""
+        self.collect(tmp_path)
+        request = RequestFactory().get("/static/styles/common.css")
+        with override_settings(STATIC_ROOT=str(tmp_path), STATIC_URL="static/", DEBUG=False):
+            response = StaticFilesServer().get_response(request)
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+        assert b"".join(response.streaming_content) == CSS_CONTENT
+
+    def test_get_response_other_paths(self, tmp_path: Path) -> None:
+        """Test missing, outside of the static root and not static paths are skipped."""
+        self.collect(tmp_path)
+        server = StaticFilesServer()
+        with override_settings(STATIC_ROOT=str(tmp_path), STATIC_URL="static/", DEBUG=False):
+            for path in ("/static/styles/missing.css", "/static/../secret.py", "/cart/"):
+                assert server.get_response(RequestFactory().get(path)) is None
@@ -0,0 +1,43 @@
+"""Module for testing 'zoho_token' app utils."""
+from unittest.mock import patch
+
+import pytest
+
+from tests.zoho_token.factories import ZohoOAuthFactory
+from zoho_token.models import ZohoInitLock
+from zoho_token.utils import ZohoOAuthInitializer
+
+
+@pytest.mark.django_db
+class TestZohoOAuthInitializer:
+    """Class for testing ZohoOAuthInitializer lazy initialization."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_ensure_initialized(self, monkeypatch) -> None:
+        """Test SDK is initialized once with the stored tokens."""
+        oauth = ZohoOAuthFactory()
+        monkeypatch.setenv("GRANT_TOKEN", oauth.grant_token)
+        zoho_init = ZohoOAuthInitializer()
+        with patch.object(zoho_init, "initialize") as initialize_mock:
+            zoho_init.ensure_initialized()
+            zoho_init.ensure_initialized()
+        initialize_mock.assert_called_once_with(initialized=True)
+        assert ZohoInitLock.objects.filter(name=zoho_init.lock_name).exists()
+
+    def test_ensure_initialized_new_grant_token(self, monkeypatch) -> None:
+        """Test tokens are obtained if the grant token is changed."""
+        ZohoOAuthFactory()
+        monkeypatch.setenv("GRANT_TOKEN", "new grant token")
+        zoho_init = ZohoOAuthInitializer()
+        with patch.object(zoho_init, "initialize") as initialize_mock:
+            zoho_init.ensure_initialized()
+        initialize_mock.assert_called_once_with(initialized=False)
+
+    def test_ensure_initialized_without_grant_token(self, monkeypatch):
+        """Test error is raised if there are no tokens to initialize SDK with."""
+        monkeypatch.delenv("GRANT_TOKEN", raising=False)
+        zoho_init = ZohoOAuthInitializer()
+        with pytest.raises(RuntimeError):
+            zoho_init.ensure_initialized()
+        assert not zoho_init.is_initialized
@@ -2,7 +2,6 @@
 from abc import ABC
 from typing import Any, Dict
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.http import (
@@ -17,6 +16,7 @@ from django.views.generic import FormView
 from async_views.auth.mixins import AsyncUserPassesTestMixin
 from async_views.generic.base import AsyncTemplateView
 from async_views.generic.edit import AsyncFormView
+from services.db import db_pool
 from services.mixins import ApplicationMixin
 
 
@@ -38,7 +38,7 @@ class UserProfileTemplateView(
 
     async def test_func(self, **kwargs: Any) -> bool:
         """Test whether kwargs pk is equal user.zoho_id."""
-        user = await sync_to_async(get_user)(self.request)
+        user = await db_pool.run(get_user, self.request)
         if user.is_anonymous:
             return False
         return user.zoho_id == self.kwargs.get("pk")
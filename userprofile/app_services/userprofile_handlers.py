@@ -1,7 +1,6 @@
 """Module for userprofile additional functionality."""
 from typing import Set
 
-from asgiref.sync import sync_to_async
 from django.contrib.sessions.backends.base import SessionBase
 
 from services.data_getters import crm_data
@@ -20,7 +19,7 @@ class UserHandlers:
         :param customer: User User object in local db table.
         :param product_id: int Product id in Zoho CRM module.
         """
-        if not await sync_to_async(session.get)("viewed_products", []):
+        if not session.get("viewed_products", []):
             session["viewed_products"] = [
                 product_id,
             ]
@@ -28,7 +27,7 @@ class UserHandlers:
             product_id not in session.get("viewed_products", [])
         ):
             viewed_products.append(product_id)
-            await sync_to_async(session.save)()
+            session.modified = True
 
     async def get_and_refresh_viewed_customer_products(
         self,
@@ -45,7 +44,7 @@ class UserHandlers:
         Zoho CRM, return sorted product list by 'viewed_at' field.
         :param customer_id: int Customer id in local db.
         """
-        if viewed_products := await sync_to_async(session.get)("viewed_products", []):
+        if viewed_products := session.get("viewed_products", []):
             region_products = await crm_data.get_region_products(
                 region_slug=region_slug,
                 currency=currency,
@@ -54,6 +53,7 @@ class UserHandlers:
             for product_id in viewed_products:
                 if product_id not in [product["id"] for product in region_products]:
                     session["viewed_products"].remove(product_id)
+                    session.modified = True
             return [product for product in region_products if product["id"] in viewed_products]
         return []
 
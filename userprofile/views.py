@@ -1,13 +1,13 @@
 """Function and class views for 'userprofile' app."""
 from typing import Any
 
-from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user
 from django.http import HttpRequest, HttpResponseRedirect
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 
 from services.crm_interface import custom_record_operations
+from services.db import db_pool
 from userprofile.app_services.crm_utils import crm_formatters
 from userprofile.app_services.mixins import (
     AsyncUserProfileFormView,
@@ -299,7 +299,7 @@ class ContactView(UserProfileTemplateView):
         """Get context data for the view."""
         context = await super().get_context_data(**kwargs)
         context = await self.get_common_context(**context)
-        user = await sync_to_async(get_user)(self.request)
+        user = await db_pool.run(get_user, self.request)
         context["contacts"] = await crm_data.get_customer_contacts(user.zoho_id)
         return context
 
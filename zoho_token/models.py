@@ -32,3 +32,16 @@ class ZohoOAuth(models.Model):
 
     class Meta:
         verbose_name = "Zoho OAuth token"
+
+
+class ZohoInitLock(models.Model):
+    """Row locked while Zoho SDK is initialized, so the tokens are obtained once per cluster."""
+
+    name = models.CharField(max_length=50, unique=True, verbose_name="Name")
+
+    def __str__(self):
+        """Represent instances of the class in docs, admins, etc."""
+        return self.name
+
+    class Meta:
+        verbose_name = "Zoho SDK initialization lock"
@@ -2,8 +2,12 @@
 
 import concurrent.futures
 import os
-from typing import List, Optional
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, List, Optional
 
+from django.db import transaction
 from dotenv import load_dotenv
 from zcrmsdk.src.com.zoho.api.authenticator.oauth_token import OAuthToken
 from zcrmsdk.src.com.zoho.api.authenticator.store import TokenStore
@@ -13,9 +17,10 @@ from zcrmsdk.src.com.zoho.crm.api.exception import SDKException
 from zcrmsdk.src.com.zoho.crm.api.initializer import Initializer
 from zcrmsdk.src.com.zoho.crm.api.sdk_config import SDKConfig
 from zcrmsdk.src.com.zoho.crm.api.user_signature import UserSignature
+from zcrmsdk.src.com.zoho.crm.api.util import APIHTTPConnector
 
 from .exceptions import SDKTokenExpired
-from .models import ZohoOAuth
+from .models import ZohoInitLock, ZohoOAuth
 
 load_dotenv()
 
@@ -145,10 +150,74 @@ class ZohoOAuthInitializer:
     """
     Class responsible for initializing the Zoho SDK with necessary configurations and parameters.
     Stores access and refresh tokens into DB.
+
+    SDK is initialized lazily, on the first CRM use of the process, see 'ensure_initialized'.
     """
 
     instance = None
 
+    def __init__(self) -> None:
+        """Initialize not initialized SDK state."""
+        self.is_initialized = False
+        self._lock = threading.Lock()
+
+    lock_name = "sdk"
+
+    @contextmanager
+    def cluster_lock(self) -> Iterator[None]:
+        """
+        Lock the SDK initialization across the processes of all hosts.
+
+        The lock row is selected for update in the shared database, so the tokens
+        are generated by one worker, while others wait and initialize SDK with
+        the stored tokens. Tokens are saved in the locking transaction.
+        """
+        ZohoInitLock.objects.get_or_create(name=self.lock_name)
+        with transaction.atomic():
+            ZohoInitLock.objects.select_for_update().get(name=self.lock_name)
+            yield
+
+    @staticmethod
+    def are_tokens_stored() -> bool:
+        """
+        Check if the stored tokens are obtained by the current grant token.
+
+        Raises:
+            RuntimeError: If there are no stored tokens and grant token isn't specified.
+        """
+        grant_token = os.getenv("GRANT_TOKEN")
+        oauth = ZohoOAuth.objects.first()
+        if oauth is None:
+            if not grant_token:
+                raise RuntimeError("Specify GRANT TOKEN in the .env file")
+            return False
+        return not grant_token or oauth.grant_token == grant_token
+
+    def ensure_initialized(self) -> None:
+        """
+        Initialize the Zoho SDK once per process.
+
+        Blocking, runs DB queries and may request Zoho for the tokens,
+        so it's called from the worker threads of the async code.
+        """
+        if self.is_initialized:
+            return
+        with self._lock:
+            if self.is_initialized:
+                return
+            with self.cluster_lock():
+                self.initialize(initialized=self.are_tokens_stored())
+            self.is_initialized = True
+
+    def authenticate(self, connector: APIHTTPConnector) -> None:
+        """
+        Put the access token into the connector headers, initializing SDK if it's needed.
+
+        :param connector: APIHTTPConnector Connector of the request.
+        """
+        self.ensure_initialized()
+        Initializer.get_initializer().token.authenticate(connector)
+
     def initialize(self, initialized: bool = False) -> None:
         """
         Initializes the Zoho SDK with the necessary configurations and parameters.
@@ -224,3 +293,14 @@ class ZohoOAuthInitializer:
 
 
 zoho_init = ZohoOAuthInitializer()
+
+
+def requires_sdk(func: Callable) -> Callable:
+    """Decorate blocking function using the Zoho SDK to initialize SDK before the call."""
+
+    @wraps(func)
+    def wrap(*args, **kwargs):
+        zoho_init.ensure_initialized()
+        return func(*args, **kwargs)
+
+    return wrap